@@ -15,6 +15,7 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+from . import aio, cache
 from ._version import (  # noqa: F401
     __author__,
     __author_email__,
@@ -41,4 +42,6 @@ __all__ = [
     "eland_to_pandas",
     "csv_to_eland",
     "SortOrder",
+    "aio",
+    "cache",
 ]
@@ -0,0 +1,229 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Asyncio support for DataFrames and Series.
+
+Operations don't block the event loop: each one runs in the loop's default
+executor and, for DataFrames created with read_es(), sends its requests
+through the AsyncElasticsearch client on the event loop.
+"""
+
+import asyncio
+import functools
+import inspect
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from eland.common import AsyncClientAdapter
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+    import pyarrow as pa  # type: ignore
+    from elasticsearch import AsyncElasticsearch
+
+    from eland.dataframe import DataFrame
+    from eland.ndframe import NDFrame
+
+T = TypeVar("T")
+
+_END = object()
+
+
+async def read_es(
+    es_client: "AsyncElasticsearch",
+    es_index_pattern: str,
+    columns: Optional[List[str]] = None,
+    es_index_field: Optional[str] = None,
+) -> "DataFrame":
+    """
+    Create an eland.DataFrame that sends its requests through an
+    AsyncElasticsearch client.
+
+    Requests run on the current event loop so the DataFrame must be used
+    through its awaitable ``aio`` accessor, e.g. ``await df.aio.mean()``.
+    Calling a method that queries Elasticsearch directly from the event
+    loop raises a RuntimeError. This includes ``head()`` and ``tail()``,
+    which count the matching documents: ``await df.aio.head(10)`` returns
+    the DataFrame to use instead.
+
+    Parameters
+    ----------
+    es_client: elasticsearch.AsyncElasticsearch
+        Client created with the ``async`` extra (``aiohttp``) installed
+    es_index_pattern: str
+        Elasticsearch index pattern, e.g. 'flights' or 'filebeat-*'
+    columns: list of str, optional
+        List of DataFrame columns, a subset of the index's fields
+    es_index_field: str, optional
+        The Elasticsearch index field to use as the DataFrame index,
+        defaults to '_id'
+
+    Returns
+    -------
+    eland.DataFrame
+
+    Examples
+    --------
+    >>> from elasticsearch import AsyncElasticsearch
+    >>> async def mean_ticket_price():
+    ...     es = AsyncElasticsearch('http://localhost:9200')
+    ...     df = await ed.aio.read_es(es, 'flights', columns=['AvgTicketPrice'])
+    ...     return await df.aio.mean()
+    >>> asyncio.run(mean_ticket_price()) # doctest: +SKIP
+    AvgTicketPrice    628.253689
+    dtype: float64
+    """
+    from eland.dataframe import DataFrame
+    from eland.query_compiler import QueryCompiler
+
+    # The mappings are read when the QueryCompiler is created
+    query_compiler = await _run_in_executor(
+        QueryCompiler,
+        client=AsyncClientAdapter(es_client, asyncio.get_running_loop()),
+        index_pattern=es_index_pattern,
+        display_names=columns,
+        index_field=es_index_field,
+    )
+    return DataFrame(_query_compiler=query_compiler)
+
+
+class AsyncAccessor:
+    """
+    Awaitable versions of the methods and properties of a DataFrame or
+    Series, accessed with ``.aio``.
+
+    Each call runs in the event loop's default executor, so neither the
+    requests to Elasticsearch nor the conversion of the results to pandas
+    block the event loop. Methods returning an iterator, such as
+    ``iterrows()``, return an async iterator when awaited.
+
+    Examples
+    --------
+    >>> df = ed.DataFrame('http://localhost:9200', 'flights', columns=['AvgTicketPrice', 'Carrier'])
+    >>> async def summary():
+    ...     return await df.aio.agg(['min', 'max'], numeric_only=True)
+    >>> asyncio.run(summary()) # doctest: +SKIP
+         AvgTicketPrice
+    min      100.020531
+    max     1199.729004
+    """
+
+    def __init__(self, obj: "NDFrame") -> None:
+        self._obj = obj
+
+    def __getattr__(self, name: str) -> Any:
+        if isinstance(getattr(type(self._obj), name, None), property):
+            # Properties such as 'shape' are awaited directly
+            return _run_in_executor(getattr, self._obj, name)
+
+        method = getattr(self._obj, name)
+        if not callable(method):
+            raise AttributeError(f"{name!r} can't be awaited")
+
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            result = await _run_in_executor(method, *args, **kwargs)
+            if inspect.isgenerator(result):
+                return _iterate_in_executor(result)
+            return result
+
+        return call
+
+    async def iter_pandas(
+        self,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+    ) -> AsyncGenerator["pd.DataFrame", None]:
+        """
+        Iterate over the results one page at a time, as a pandas.DataFrame
+        (or pandas.Series for a Series) per page. See
+        :meth:`DataFrame.to_pandas` for the parameters.
+
+        Examples
+        --------
+        >>> df = ed.DataFrame('http://localhost:9200', 'flights', columns=['Carrier'])
+        >>> async def count_rows():
+        ...     return sum([len(page) async for page in df.aio.iter_pandas()])
+        >>> asyncio.run(count_rows()) # doctest: +SKIP
+        13059
+        """
+        from eland.series import Series
+
+        pages = self._obj._query_compiler.search_yield_pandas_dataframes(
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+        )
+        dfs = _iterate_in_executor(pages)
+        try:
+            async for df in dfs:
+                yield df[self._obj.name] if isinstance(self._obj, Series) else df
+        finally:
+            # Leaving 'async for' early doesn't close 'dfs'
+            await dfs.aclose()
+
+    async def iter_arrow_batches(
+        self, **kwargs: Any
+    ) -> AsyncGenerator["pa.RecordBatch", None]:
+        """
+        Iterate over the results as pyarrow.RecordBatch objects, one per page.
+        See :meth:`DataFrame.iter_arrow_batches` for the parameters.
+        """
+        batches = _iterate_in_executor(
+            await _run_in_executor(self._obj.iter_arrow_batches, **kwargs)  # type: ignore[attr-defined]
+        )
+        try:
+            async for batch in batches:
+                yield batch
+        finally:
+            await batches.aclose()
+
+
+async def _run_in_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def _iterate_in_executor(iterator: Iterator[T]) -> AsyncGenerator[T, None]:
+    """Yields the items of 'iterator', each fetched in the default executor"""
+    try:
+        while True:
+            item = await _run_in_executor(next, iterator, _END)
+            if item is _END:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            # Stops the scan and releases its point in time
+            await _run_in_executor(close)
@@ -0,0 +1,359 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Conversion of Elasticsearch search results to Apache Arrow.
+
+The Arrow schema is derived from FieldMappings so every RecordBatch of a
+scan has the same schema, regardless of which fields are present in a page.
+"""
+
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from eland.ml._optional import import_optional_dependency
+
+import_optional_dependency("pyarrow", extra="pyarrow is required for Arrow export.")
+
+import pyarrow as pa  # type: ignore # noqa: E402
+
+if TYPE_CHECKING:
+    import pyarrow.parquet as pq  # type: ignore
+
+    from eland.field_mappings import FieldMappings
+
+
+GEO_POINT_TYPE = pa.struct([("lat", pa.float64()), ("lon", pa.float64())])
+
+
+def arrow_type(es_dtype: str, pd_dtype: str) -> "pa.DataType":
+    """Returns the Arrow type for a field with the given Elasticsearch and pandas dtypes"""
+    if es_dtype == "geo_point":
+        return GEO_POINT_TYPE
+    if es_dtype == "binary":
+        return pa.string()
+    if pd_dtype == "int64":
+        return pa.int64()
+    if pd_dtype == "float64":
+        return pa.float64()
+    if pd_dtype == "bool":
+        return pa.bool_()
+    if pd_dtype == "datetime64[ns]":
+        return pa.timestamp("ns")
+    return pa.string()
+
+
+def arrow_schema(
+    mappings: "FieldMappings",
+    index_field: Optional[str] = None,
+    schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+) -> "pa.Schema":
+    """
+    Derives an Arrow schema from the mappings
+
+    Parameters
+    ----------
+    mappings: FieldMappings
+        Mappings of the fields to include, in display name order
+    index_field: str, optional
+        Name of the index field to prepend as a string column. Ignored if
+        the index field is already one of the fields.
+    schema_overrides: dict, optional
+        Arrow types by display name replacing the derived types, e.g.
+        ``{"sku": pyarrow.list_(pyarrow.string())}`` for a multi-valued field
+
+    Returns
+    -------
+    pyarrow.Schema
+    """
+    capabilities = mappings._mappings_capabilities
+    schema_overrides = schema_overrides or {}
+
+    unknown = set(schema_overrides) - set(capabilities.index)
+    if index_field is not None:
+        unknown.discard(index_field)
+    if unknown:
+        raise KeyError(
+            f"{sorted(unknown)} not in display names {mappings.display_names}"
+        )
+
+    fields = [
+        pa.field(
+            display_name,
+            schema_overrides.get(display_name) or arrow_type(es_dtype, pd_dtype),
+        )
+        for display_name, es_dtype, pd_dtype in zip(
+            capabilities.index, capabilities.es_dtype, capabilities.pd_dtype
+        )
+    ]
+    if index_field is not None and index_field not in capabilities.index:
+        fields.insert(
+            0, pa.field(index_field, schema_overrides.get(index_field) or pa.string())
+        )
+    return pa.schema(fields)
+
+
+def to_record_batch(
+    schema: "pa.Schema", columns: Dict[str, Any], num_rows: int
+) -> "pa.RecordBatch":
+    """
+    Builds a RecordBatch from decoded column values. Columns missing
+    from 'columns' (or set to None) are filled with nulls.
+    """
+    arrays = []
+    for field in schema:
+        values = columns.get(field.name)
+        if values is None:
+            arrays.append(pa.nulls(num_rows, type=field.type))
+        else:
+            arrays.append(to_arrow_array(field.name, values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def to_table(schema: "pa.Schema", batches: Iterable["pa.RecordBatch"]) -> "pa.Table":
+    """Concatenates RecordBatches into a Table, which is empty if there are none"""
+    return pa.Table.from_batches(list(batches), schema=schema)
+
+
+def rebatch(
+    batches: Iterable["pa.RecordBatch"], batch_size: int
+) -> Iterator["pa.RecordBatch"]:
+    """
+    Regroups RecordBatches into batches of 'batch_size' rows, the last of
+    which may be smaller. Rows are only copied when a batch spans pages.
+    """
+    pending: List["pa.RecordBatch"] = []
+    num_pending = 0
+    for batch in batches:
+        pending.append(batch)
+        num_pending += batch.num_rows
+        if num_pending < batch_size:
+            continue
+
+        table = pa.Table.from_batches(pending)
+        offset = 0
+        while num_pending - offset >= batch_size:
+            yield table.slice(offset, batch_size).combine_chunks().to_batches()[0]
+            offset += batch_size
+        pending = table.slice(offset).to_batches()
+        num_pending -= offset
+
+    if num_pending:
+        yield pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+
+
+def write_parquet(
+    batches: Iterable["pa.RecordBatch"],
+    schema: "pa.Schema",
+    path: Union[str, "os.PathLike[str]"],
+    compression: Optional[str] = "snappy",
+    row_group_size: Optional[int] = None,
+    max_file_size: Optional[int] = None,
+) -> None:
+    """
+    Writes RecordBatches to Parquet as they arrive so only one row group is
+    held in memory at a time. Each batch is written as a row group unless
+    'row_group_size' is given, in which case batches are regrouped into row
+    groups of that many rows.
+
+    If 'max_file_size' is given 'path' is a directory and a new file
+    'part-NNNNN.parquet' is started once the current one has reached
+    'max_file_size' bytes. Files only end on row group boundaries so
+    they can be larger than 'max_file_size'.
+    """
+    if row_group_size is not None and row_group_size < 1:
+        raise ValueError(f"row_group_size must be positive, got {row_group_size}")
+    if max_file_size is not None and max_file_size < 1:
+        raise ValueError(f"max_file_size must be positive, got {max_file_size}")
+
+    writer = _ParquetWriter(schema, path, compression, max_file_size)
+    try:
+        pending: List["pa.RecordBatch"] = []
+        num_pending = 0
+        for batch in batches:
+            pending.append(batch)
+            num_pending += batch.num_rows
+            if row_group_size is None:
+                writer.write(pa.Table.from_batches(pending, schema=schema))
+                pending, num_pending = [], 0
+                continue
+
+            while num_pending >= row_group_size:
+                table = pa.Table.from_batches(pending, schema=schema)
+                writer.write(table.slice(0, row_group_size))
+                rest = table.slice(row_group_size)
+                pending, num_pending = rest.to_batches(), rest.num_rows
+
+        if num_pending:
+            writer.write(pa.Table.from_batches(pending, schema=schema))
+    finally:
+        writer.close()
+
+
+class _ParquetWriter:
+    """
+    pyarrow.parquet.ParquetWriter that writes a table as a single row
+    group and optionally moves on to a new file once a size is reached.
+    """
+
+    def __init__(
+        self,
+        schema: "pa.Schema",
+        path: Union[str, "os.PathLike[str]"],
+        compression: Optional[str],
+        max_file_size: Optional[int],
+    ):
+        self._schema = schema
+        self._path = path
+        self._compression = compression
+        self._max_file_size = max_file_size
+        self._num_files = 0
+        self._sink: Optional["pa.NativeFile"] = None
+        self._writer: Optional["pq.ParquetWriter"] = None
+
+        if max_file_size is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def write(self, table: "pa.Table") -> None:
+        if table.num_rows == 0:
+            return
+        writer = self._writer if self._writer is not None else self._open()
+        writer.write_table(table, row_group_size=table.num_rows)
+
+        if (
+            self._max_file_size is not None
+            and self._sink is not None
+            and self._sink.tell() >= self._max_file_size
+        ):
+            self._close()
+
+    def close(self) -> None:
+        # An empty result still gets a file with the schema
+        if self._num_files == 0:
+            self._open()
+        self._close()
+
+    def _open(self) -> "pq.ParquetWriter":
+        import pyarrow.parquet as pq
+
+        if self._max_file_size is None:
+            where = self._path
+        else:
+            where = os.path.join(self._path, f"part-{self._num_files:05d}.parquet")
+            self._sink = pa.OSFile(where, "wb")
+        # Format version 2.6 stores nanosecond timestamps without coercion
+        self._writer = pq.ParquetWriter(
+            self._sink or where,
+            self._schema,
+            compression=self._compression,
+            version="2.6",
+        )
+        self._num_files += 1
+        return self._writer
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+
+def to_arrow_array(name: str, values: Any, type: "pa.DataType") -> "pa.Array":
+    if pa.types.is_list(type) or pa.types.is_large_list(type):
+        # Single values are stored as lists of one value
+        offsets = [0]
+        mask = []
+        flat_values: List[Any] = []
+        for value in values:
+            if isinstance(value, list):
+                flat_values.extend(value)
+            elif not _is_missing(value):
+                flat_values.append(value)
+            mask.append(_is_missing(value))
+            offsets.append(len(flat_values))
+
+        list_type = pa.LargeListArray if pa.types.is_large_list(type) else pa.ListArray
+        return list_type.from_arrays(
+            offsets,
+            to_arrow_array(name, flat_values, type.value_type),
+            mask=pa.array(mask, type=pa.bool_()),
+        )
+
+    if pa.types.is_timestamp(type):
+        _check_scalars(name, values, type)
+        # Dates are stored as UTC
+        dates = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+        if type.tz is None:
+            dates = dates.tz_convert(None)
+        return pa.array(dates, type=type, from_pandas=True)
+    if type == GEO_POINT_TYPE:
+        return pa.array(
+            [None if _is_missing(value) else _geo_point(value) for value in values],
+            type=type,
+        )
+
+    try:
+        return pa.array(values, type=type, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        _check_scalars(name, values, type)
+
+    # Elasticsearch accepts numbers and booleans as strings in _source
+    # and any scalar for keyword fields so go through strings.
+    return pa.array(
+        [None if _is_missing(value) else str(value) for value in values],
+        type=pa.string(),
+    ).cast(type)
+
+
+def _check_scalars(name: str, values: Any, type: "pa.DataType") -> None:
+    if isinstance(values, (pd.Series, pd.Index)) and values.dtype != object:
+        return
+    if any(isinstance(value, list) for value in values):
+        raise ValueError(
+            f"Field '{name}' has multiple values per document which can't be stored "
+            f"as {type}. Use schema_overrides={{'{name}': pyarrow.list_({type})}}"
+        )
+
+
+def _is_missing(value: Any) -> bool:
+    return (
+        value is None
+        or value is pd.NaT
+        or (isinstance(value, float) and np.isnan(value))
+    )
+
+
+def _geo_point(value: Any) -> Dict[str, float]:
+    # geo_point can be given as an object, a "lat,lon" string,
+    # a WKT POINT(lon lat) or an array [lon, lat]
+    if isinstance(value, dict):
+        return {"lat": float(value["lat"]), "lon": float(value["lon"])}
+    if isinstance(value, str):
+        if value.upper().startswith("POINT"):
+            lon, lat = value[value.index("(") + 1 : value.index(")")].split()
+            return {"lat": float(lat), "lon": float(lon)}
+        if "," in value:
+            lat, lon = value.split(",")
+            return {"lat": float(lat), "lon": float(lon)}
+    if isinstance(value, list) and len(value) == 2:
+        return {"lat": float(value[1]), "lon": float(value[0])}
+    raise ValueError(f"Can't convert geo_point value {value!r} to Arrow")
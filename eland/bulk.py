@@ -0,0 +1,364 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Bulk indexing of pandas DataFrames.
+
+Rows are serialized straight to NDJSON bytes, a column at a time, without
+building a dict per row. The documents are then grouped into bulk requests
+of about 'max_chunk_bytes' each and sent by a pool of worker threads, which
+back off when Elasticsearch rejects requests.
+"""
+
+import json
+import time
+from concurrent import futures
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+import numpy as np
+import pandas as pd  # type: ignore
+from elasticsearch import ApiError, Elasticsearch
+from elasticsearch.helpers import BulkIndexError
+from elasticsearch.serializer import JsonSerializer
+
+from eland.common import (
+    DEFAULT_BULK_INITIAL_BACKOFF,
+    DEFAULT_BULK_MAX_BACKOFF,
+    DEFAULT_BULK_MAX_RETRIES,
+    DEFAULT_PROGRESS_REPORTING_NUM_ROWS,
+)
+
+_NULL = b"null"
+
+# Index settings while loading with es_bulk_load=True
+BULK_LOAD_SETTINGS: Dict[str, Any] = {
+    "index.refresh_interval": "-1",
+    "index.number_of_replicas": 0,
+}
+
+# Types that neither orjson nor json handle, e.g. pandas.Timestamp
+_default = JsonSerializer().default
+
+_dumps: Callable[[Any], bytes]
+try:
+    import orjson
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default)
+
+except ImportError:
+
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(
+            value, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8", "surrogatepass")
+
+
+def iter_ndjson(
+    pd_df: pd.DataFrame,
+    es_dropna: bool,
+    use_pandas_index_for_es_ids: bool,
+    chunksize: int,
+) -> Iterator[bytes]:
+    """
+    Yields the bulk index action and source of each row of 'pd_df' as
+    NDJSON bytes. Rows are serialized 'chunksize' rows at a time.
+
+    Missing values are left out of the source if 'es_dropna' is True and
+    are null otherwise.
+    """
+    keys = [_dumps(str(column)) + b":" for column in pd_df.columns]
+    for start in range(0, len(pd_df), chunksize):
+        chunk = pd_df.iloc[start : start + chunksize]
+
+        notna = chunk.notna().to_numpy()
+        fields = [
+            _json_fields(key, values, notna[:, i], es_dropna)
+            for i, (key, (_, values)) in enumerate(zip(keys, chunk.items()))
+        ]
+        if fields:
+            if es_dropna and not notna.all():
+                sources = [
+                    b",".join(field for field in row if field is not None)
+                    for row in zip(*fields)
+                ]
+            else:
+                sources = [b",".join(row) for row in zip(*fields)]
+        else:
+            sources = [b""] * len(chunk)
+
+        if use_pandas_index_for_es_ids:
+            # Use index as _id
+            for id, source in zip(chunk.index.tolist(), sources):
+                yield b'{"index":{"_id":%s}}\n{%s}\n' % (_dumps(str(id)), source)
+        else:
+            for source in sources:
+                yield b'{"index":{}}\n{%s}\n' % source
+
+
+def _json_fields(
+    key: bytes, values: pd.Series, notna: "np.ndarray[Any, Any]", es_dropna: bool
+) -> List[Optional[bytes]]:
+    """
+    Returns '"key":value' for each value of a column, None for missing
+    values if they're dropped.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        # Numbers and booleans have no commas, so the JSON array of the
+        # column is split instead of serializing each value.
+        encoded = _dumps(values.tolist())[1:-1].split(b",")
+    elif dtype.kind == "M":
+        encoded = _dumps(_iso_dates(values))[1:-1].split(b",")
+    else:
+        encoded = [
+            _dumps(value) if present else _NULL
+            for value, present in zip(values.tolist(), notna)
+        ]
+
+    fields: List[Optional[bytes]] = [key + value for value in encoded]
+    missing = key + _NULL
+    for i in np.flatnonzero(~notna).tolist():
+        fields[i] = None if es_dropna else missing
+    return fields
+
+
+def _iso_dates(values: pd.Series) -> List[str]:
+    """ISO 8601 strings of a datetime column, in UTC for timezone aware columns"""
+    timezone: Literal["naive", "UTC"] = "naive"
+    if getattr(values.dtype, "tz", None) is not None:
+        values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        timezone = "UTC"
+    dates = values.to_numpy()
+    unit: Literal["us", "ns"] = "us"
+    if np.datetime_data(dates.dtype)[0] == "ns":
+        nanos = dates[~np.isnat(dates)].view("i8")
+        if (nanos % 1000).any():
+            unit = "ns"
+    iso_dates: List[str] = np.datetime_as_string(
+        dates, unit=unit, timezone=timezone
+    ).tolist()
+    return iso_dates
+
+
+class IngestReport(NamedTuple):
+    """Summary of a bulk load"""
+
+    num_docs: int  # Documents indexed
+    num_bytes: int  # Bytes sent, including retries
+    num_retries: int  # Documents sent again after being rejected
+    num_failures: int  # Documents that failed to index
+    seconds: float
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.num_docs / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"indexed {self.num_docs} docs ({self.num_bytes} bytes) in "
+            f"{self.seconds:.1f}s, {self.docs_per_second:.0f} docs/s, "
+            f"{self.num_retries} retries, {self.num_failures} failures"
+        )
+
+
+class _ChunkResult(NamedTuple):
+    num_docs: int
+    num_bytes: int
+    num_retries: int
+    errors: List[Any]
+    rejected: bool  # Whether Elasticsearch rejected any request (429)
+
+
+def iter_bulk_chunks(
+    docs: Iterable[bytes], max_chunk_bytes: int
+) -> Iterator[List[bytes]]:
+    """
+    Groups NDJSON documents into chunks of at most 'max_chunk_bytes' bytes,
+    each sent as one bulk request. Documents larger than that are sent alone.
+    """
+    chunk: List[bytes] = []
+    num_bytes = 0
+    for doc in docs:
+        if chunk and num_bytes + len(doc) > max_chunk_bytes:
+            yield chunk
+            chunk = []
+            num_bytes = 0
+        chunk.append(doc)
+        num_bytes += len(doc)
+    if chunk:
+        yield chunk
+
+
+def bulk_index(
+    es_client: Elasticsearch,
+    es_dest_index: str,
+    chunks: Iterable[List[bytes]],
+    thread_count: int,
+    max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+    initial_backoff: float = DEFAULT_BULK_INITIAL_BACKOFF,
+    max_backoff: float = DEFAULT_BULK_MAX_BACKOFF,
+    show_progress: bool = False,
+) -> IngestReport:
+    """
+    Sends each chunk of documents to 'es_dest_index' as a bulk request
+    from a pool of 'thread_count' threads.
+
+    Documents rejected with a 429 status, because the cluster's write
+    queue is full, are sent again after an exponential backoff, up to
+    'max_retries' times. The number of requests in flight follows an
+    additive increase/multiplicative decrease: it halves when a request
+    was rejected and grows by one per round of requests that weren't,
+    up to 'thread_count'.
+
+    Raises
+    ------
+    elasticsearch.helpers.BulkIndexError
+        If any document failed to index. The IngestReport of the documents
+        that were indexed and failed is its 'report' attribute.
+    """
+
+    def send(docs: List[bytes]) -> _ChunkResult:
+        num_docs = num_bytes = num_retries = 0
+        errors: List[Any] = []
+        rejected = False
+        for attempt in range(max_retries + 1):
+            body = b"".join(docs)
+            num_bytes += len(body)
+            retry: List[bytes] = []
+            try:
+                response = es_client.bulk(
+                    index=es_dest_index,
+                    operations=body,  # type: ignore[arg-type]
+                    filter_path="errors,items.*._id,items.*.status,items.*.error",
+                )
+            except ApiError as e:
+                if e.status_code != 429 or attempt == max_retries:
+                    raise
+                retry = docs
+            else:
+                for doc, item in zip(docs, response.get("items", ())):
+                    result = next(iter(item.values()))
+                    if result["status"] == 429 and attempt < max_retries:
+                        retry.append(doc)
+                    elif "error" in result:
+                        errors.append(item)
+                    else:
+                        num_docs += 1
+
+            if not retry:
+                break
+            rejected = True
+            num_retries += len(retry)
+            docs = retry
+            time.sleep(min(max_backoff, initial_backoff * 2**attempt))
+
+        return _ChunkResult(num_docs, num_bytes, num_retries, errors, rejected)
+
+    start = time.monotonic()
+    num_docs = num_bytes = num_retries = 0
+    errors: List[Any] = []
+    limit = float(thread_count)
+    pending: Set["Future[_ChunkResult]"] = set()
+
+    def wait() -> None:
+        nonlocal num_docs, num_bytes, num_retries, limit
+        done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            result = future.result()
+            if show_progress and (
+                (num_docs + result.num_docs) // DEFAULT_PROGRESS_REPORTING_NUM_ROWS
+                > num_docs // DEFAULT_PROGRESS_REPORTING_NUM_ROWS
+            ):
+                print(f"{datetime.now()}: indexed {num_docs + result.num_docs} rows")
+            num_docs += result.num_docs
+            num_bytes += result.num_bytes
+            num_retries += result.num_retries
+            errors.extend(result.errors)
+            if result.rejected:
+                limit = max(1.0, limit / 2)
+            else:
+                limit = min(float(thread_count), limit + 1 / limit)
+
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        try:
+            for docs in chunks:
+                while len(pending) >= int(limit):
+                    wait()
+                pending.add(executor.submit(send, docs))
+            while pending:
+                wait()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    report = IngestReport(
+        num_docs, num_bytes, num_retries, len(errors), time.monotonic() - start
+    )
+    if show_progress:
+        print(f"{datetime.now()}: {report}")
+    if errors:
+        error = BulkIndexError(f"{len(errors)} document(s) failed to index.", errors)
+        error.report = report  # type: ignore[attr-defined]
+        raise error
+    return report
+
+
+@contextmanager
+def bulk_load_settings(
+    es_client: Elasticsearch, es_dest_index: str, translog_async: bool = False
+) -> Iterator[None]:
+    """
+    Applies BULK_LOAD_SETTINGS, and asynchronous translog durability if
+    'translog_async' is True, to 'es_dest_index' while in the context.
+    The previous settings are restored on exit, even on failure; settings
+    that weren't set are reset to their defaults.
+    """
+    settings = dict(BULK_LOAD_SETTINGS)
+    if translog_async:
+        settings["index.translog.durability"] = "async"
+
+    # 'es_dest_index' may be an alias, keep the settings of each index
+    response = es_client.indices.get_settings(
+        index=es_dest_index, name=list(settings), flat_settings=True
+    )
+    previous = {
+        index: {name: body["settings"].get(name) for name in settings}
+        for index, body in response.items()
+    }
+
+    es_client.indices.put_settings(index=es_dest_index, settings=settings)
+    try:
+        yield
+    finally:
+        for index, index_settings in previous.items():
+            es_client.indices.put_settings(index=index, settings=index_settings)
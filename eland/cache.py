@@ -0,0 +1,180 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Opt-in cache for the results of aggregations and counts.
+
+Repeated calls such as ``df.mean()``, ``len(df)`` or ``df.describe()`` on
+unchanged data send the same requests to Elasticsearch. With the cache
+enabled each response is kept for ``ttl`` seconds, keyed by a hash of the
+request, and reused by identical requests. Searches returning documents
+(e.g. ``to_pandas()`` or displaying a DataFrame) are never cached.
+
+The cache is cleared whenever eland writes to an index, e.g. with
+:func:`eland.pandas_to_eland`. Changes made by other clients are only
+seen once the cached results expire.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from eland.common import DEFAULT_RESULT_CACHE_MAX_BYTES, DEFAULT_RESULT_CACHE_TTL
+
+__all__ = ["enable", "disable", "clear"]
+
+
+class _Entry(NamedTuple):
+    client: Any  # Keeps id(client) in the key unique while cached
+    response: Any
+    expires: float
+    num_bytes: int
+
+
+class _ResultCache:
+    """LRU cache of responses that expire 'ttl' seconds after being stored"""
+
+    def __init__(self, ttl: float, max_bytes: int) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[int, str], _Entry]" = OrderedDict()
+        self._num_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[int, str]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry.response
+
+    def put(self, key: Tuple[int, str], client: Any, response: Any) -> None:
+        body = _body(response)
+        if any("error" in resp for resp in body.get("responses", ())):
+            # Failed searches of a multi search are retried
+            return
+        num_bytes = len(_canonical_json(body))
+        if num_bytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(
+                client, response, time.monotonic() + self.ttl, num_bytes
+            )
+            self._num_bytes += num_bytes
+            # Evict the least recently used entries
+            while self._num_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+
+    def _remove(self, key: Tuple[int, str]) -> None:
+        self._num_bytes -= self._entries.pop(key).num_bytes
+
+
+_cache: Optional[_ResultCache] = None
+
+
+def enable(
+    ttl: float = DEFAULT_RESULT_CACHE_TTL,
+    max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES,
+) -> None:
+    """
+    Cache the results of aggregations and counts for all DataFrames and
+    Series. Enabling the cache again replaces it with an empty one.
+
+    Parameters
+    ----------
+    ttl: float, default 60
+        Number of seconds a result is reused for
+    max_bytes: int, default 64 MiB
+        Approximate size of the cached results, the least recently used
+        results are evicted beyond it
+
+    Examples
+    --------
+    >>> ed.cache.enable(ttl=30)
+    >>> df = ed.DataFrame('http://localhost:9200', 'flights', columns=['AvgTicketPrice'])
+    >>> df.mean() # doctest: +SKIP
+    AvgTicketPrice    628.253689
+    dtype: float64
+    >>> df.mean()  # Doesn't query Elasticsearch again  # doctest: +SKIP
+    AvgTicketPrice    628.253689
+    dtype: float64
+    >>> ed.cache.disable()
+    """
+    if ttl <= 0:
+        raise ValueError(f"ttl must be a positive number, got {ttl}")
+    if max_bytes < 1:
+        raise ValueError(f"max_bytes must be a positive integer, got {max_bytes}")
+
+    global _cache
+    _cache = _ResultCache(ttl=ttl, max_bytes=max_bytes)
+
+
+def disable() -> None:
+    """Stop caching results and drop those already cached"""
+    global _cache
+    _cache = None
+
+
+def clear() -> None:
+    """Drop the cached results, e.g. after the index was changed by another client"""
+    cache = _cache
+    if cache is not None:
+        cache.clear()
+
+
+def cached_request(client: Any, endpoint: str, **kwargs: Any) -> Any:
+    """
+    Sends the request to the 'endpoint' method (e.g. 'search') of 'client',
+    or returns the cached response of the same request.
+    """
+    cache = _cache
+    if cache is None:
+        return getattr(client, endpoint)(**kwargs)
+
+    digest = hashlib.sha256(
+        _canonical_json({"endpoint": endpoint, "request": kwargs}).encode("utf-8")
+    ).hexdigest()
+    key = (id(client), digest)
+    response = cache.get(key)
+    if response is None:
+        response = getattr(client, endpoint)(**kwargs)
+        cache.put(key, client, response)
+    return response
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _body(response: Any) -> Dict[str, Any]:
+    # ObjectApiResponse wraps the decoded body
+    body: Dict[str, Any] = getattr(response, "body", response)
+    return body
@@ -15,13 +15,17 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import asyncio
+import inspect
 import re
+import threading
 import warnings
 from enum import Enum
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Coroutine,
     Dict,
     List,
     Optional,
@@ -31,7 +35,7 @@ from typing import (
 )
 
 import pandas as pd  # type: ignore
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch
 
 from ._version import __version__ as _eland_version
 
@@ -41,17 +45,40 @@ if TYPE_CHECKING:
 # Default number of rows displayed (different to pandas where ALL could be displayed)
 DEFAULT_NUM_ROWS_DISPLAYED = 60
 DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_BULK_MAX_BYTES = 10 * 1024 * 1024  # for bulk requests of pandas_to_eland
+DEFAULT_BULK_MAX_RETRIES = 5  # for documents rejected with a 429 status
+DEFAULT_BULK_INITIAL_BACKOFF = 2.0  # seconds, doubled on every retry
+DEFAULT_BULK_MAX_BACKOFF = 60.0  # seconds
 DEFAULT_CSV_BATCH_OUTPUT_SIZE = 10000
 DEFAULT_PROGRESS_REPORTING_NUM_ROWS = 10000
 DEFAULT_SEARCH_SIZE = 5000
 DEFAULT_PIT_KEEP_ALIVE = "3m"
+DEFAULT_PREFETCH_MAX_BYTES = 64 * 1024 * 1024  # for prefetched search pages
+DEFAULT_MAX_RESULT_WINDOW = 10000  # index.max_result_window default
 DEFAULT_PAGINATION_SIZE = 5000  # for composite aggregations
+DEFAULT_COUNT_FIELDS_PER_SEARCH = 500  # field count aggregations per search
+DEFAULT_RESULT_CACHE_TTL = 60.0  # seconds, for eland.cache
+DEFAULT_RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # for eland.cache
+DEFAULT_SAMPLE_MIN_CANDIDATES = 1000  # docs ranked by sample() beyond 2 * n
+DEFAULT_SAMPLE_MAX_SLICES = 1024  # index.max_slices_per_scroll default
 PANDAS_VERSION: Tuple[int, ...] = tuple(
     int(part) for part in pd.__version__.split(".") if part.isdigit()
 )[:2]
 
 _ELAND_MAJOR_VERSION = int(_eland_version.split(".")[0])
 
+# Client options for each 'profile' of ensure_es_client()
+ES_CLIENT_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    # Compressed requests/responses and a larger connection pool per node
+    # for concurrent scans and bulk requests. JSON uses orjson if installed.
+    "throughput": {"http_compress": True, "connections_per_node": 32},
+}
+
+# Clients created by ensure_es_client() by (hosts, profile)
+_ES_CLIENTS: Dict[Tuple[Any, ...], Elasticsearch] = {}
+_ES_CLIENTS_LOCK = threading.Lock()
+
 
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
@@ -301,18 +328,210 @@ def elasticsearch_date_to_pandas_date(
             f"Using pandas.to_datetime(value) to parse value",
             Warning,
         )
-        # TODO investigate how we could generate this just once for a bulk read.
+        # Bulk reads go through elasticsearch_dates_to_pandas_dates()
+        # so this is only emitted once per column per page.
         return pd.to_datetime(value)
 
 
+def elasticsearch_dates_to_pandas_dates(
+    values: List[Any], date_format: Optional[str]
+) -> Union[pd.Index, List[Any]]:
+    """
+    Vectorized version of elasticsearch_date_to_pandas_date() used when decoding
+    a page of hits. All values of a column are converted with a single call
+    to pd.to_datetime() using the format derived from the Elasticsearch date format.
+
+    Parameters
+    ----------
+    values: List[Any]
+        Raw date values of a column (strings or epoch numbers). Missing values
+        are NaN and are returned as NaT.
+    date_format: str
+        The Elasticsearch date format (ex. 'epoch_millis', 'epoch_second', etc.)
+
+    Returns
+    -------
+    datetimes: pd.Index or list
+        Converted values in the same order as 'values'
+    """
+    has_numeric = False
+    has_non_numeric = False
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # NaN is a missing value, not an epoch
+            if value == value:
+                has_numeric = True
+        elif value is not None:
+            has_non_numeric = True
+
+    if has_numeric and has_non_numeric:
+        # Mixed epochs and formatted strings, convert each value
+        return [
+            elasticsearch_date_to_pandas_date(value, date_format)
+            if value == value and value is not None
+            else pd.NaT
+            for value in values
+        ]
+
+    if has_numeric:
+        # Numeric values are always epochs regardless of the format
+        try:
+            return pd.to_datetime(
+                values, unit="s" if date_format == "epoch_second" else "ms"
+            )
+        except ValueError:
+            return pd.to_datetime(values)
+
+    dates = pd.Index(elasticsearch_date_to_pandas_date(values, date_format))  # type: ignore[arg-type]
+    if dates.dtype == object:
+        # Values with different UTC offsets don't fit in one datetime64 dtype
+        # and come back as datetime.datetime objects, convert each value.
+        # Any warning about the format has been emitted for the column.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return [
+                elasticsearch_date_to_pandas_date(value, date_format)
+                if value == value and value is not None
+                else pd.NaT
+                for value in values
+            ]
+    return dates
+
+
 def ensure_es_client(
-    es_client: Union[str, List[str], Tuple[str, ...], Elasticsearch]
+    es_client: Union[str, List[str], Tuple[str, ...], Elasticsearch],
+    profile: str = "default",
 ) -> Elasticsearch:
-    if isinstance(es_client, tuple):
-        es_client = list(es_client)
-    if not isinstance(es_client, Elasticsearch):
-        es_client = Elasticsearch(es_client)
-    return es_client
+    """
+    Returns 'es_client' if it's a client, otherwise a client for the given
+    host(s). Clients are created once per hosts and profile and then reused,
+    so they share a connection pool.
+
+    Parameters
+    ----------
+    es_client: str, list of str or elasticsearch.Elasticsearch
+        Client or host(s) to connect to, e.g. 'http://localhost:9200'
+    profile: str, default 'default'
+        Options for clients created from host(s), see ES_CLIENT_PROFILES.
+        'throughput' compresses requests and responses, keeps up to 32
+        connections per node and uses orjson for JSON if it is installed.
+
+    Examples
+    --------
+    >>> es = ensure_es_client('http://localhost:9200', profile='throughput') # doctest: +SKIP
+    >>> df = ed.DataFrame(es, 'flights') # doctest: +SKIP
+    """
+    if profile not in ES_CLIENT_PROFILES:
+        raise ValueError(
+            f"profile must be one of {sorted(ES_CLIENT_PROFILES)}, got {profile!r}"
+        )
+    if isinstance(es_client, AsyncElasticsearch):
+        raise ValueError(
+            "AsyncElasticsearch clients must be used with eland.aio.read_es()"
+        )
+    if isinstance(es_client, Elasticsearch):
+        return es_client
+
+    hosts = [es_client] if isinstance(es_client, str) else list(es_client)
+    try:
+        key = (tuple(hosts), profile)
+        hash(key)
+    except TypeError:
+        # Hosts given as dicts can't be keys, don't reuse their client
+        return _new_es_client(hosts, profile)
+
+    with _ES_CLIENTS_LOCK:
+        client = _ES_CLIENTS.get(key)
+        if client is None:
+            client = _ES_CLIENTS[key] = _new_es_client(hosts, profile)
+    return client
+
+
+def _new_es_client(hosts: List[Any], profile: str) -> Elasticsearch:
+    options = dict(ES_CLIENT_PROFILES[profile])
+    if profile == "throughput":
+        options["serializers"] = _orjson_serializers()
+    return Elasticsearch(hosts, **options)
+
+
+def _orjson_serializers() -> Dict[str, Any]:
+    """Serializers using orjson for JSON and NDJSON (bulk) bodies if available"""
+    try:
+        from elasticsearch.serializer import (
+            NdjsonSerializer,
+            OrjsonSerializer,
+        )
+    except ImportError:
+        return {}
+
+    class OrjsonNdjsonSerializer(OrjsonSerializer, NdjsonSerializer):
+        mimetype = "application/x-ndjson"
+
+    return {
+        OrjsonSerializer.mimetype: OrjsonSerializer(),
+        OrjsonNdjsonSerializer.mimetype: OrjsonNdjsonSerializer(),
+    }
+
+
+class AsyncClientAdapter:
+    """
+    Exposes an AsyncElasticsearch client through the synchronous API used
+    by eland. Each request is run as a coroutine on 'loop' and the calling
+    thread waits for the response, so calls must be made from a thread
+    other than the one running 'loop'.
+
+    The client and its namespaces (e.g. 'indices') are wrapped by duck
+    typing, so it is used in place of an Elasticsearch client by the
+    QueryCompiler of a DataFrame created with eland.aio.read_es().
+    """
+
+    def __init__(self, client: Any, loop: asyncio.AbstractEventLoop) -> None:
+        self._client = client
+        self._loop = loop
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if _is_async_client(attr):
+            return AsyncClientAdapter(attr, self._loop)
+        if not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            if self._in_loop():
+                # Waiting here would block the loop the request runs on
+                raise RuntimeError(
+                    "Elasticsearch requests can't be sent from the event loop's "
+                    "thread, use the awaitable methods of the 'aio' accessor"
+                )
+            result = attr(*args, **kwargs)
+            if _is_async_client(result):
+                # e.g. client.options(...)
+                return AsyncClientAdapter(result, self._loop)
+            if asyncio.iscoroutine(result):
+                return self.run(result)
+            return result
+
+        return call
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Runs 'coro' on the event loop and waits for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def __repr__(self) -> str:
+        return f"AsyncClientAdapter({self._client!r})"
+
+
+def _is_async_client(obj: Any) -> bool:
+    """Whether 'obj' is an AsyncElasticsearch client or one of its namespaces"""
+    return not callable(obj) and inspect.iscoroutinefunction(
+        getattr(obj, "perform_request", None)
+    )
 
 
 def es_version(es_client: Elasticsearch) -> Tuple[int, int, int]:
@@ -15,11 +15,23 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import os
 import re
 import sys
 import warnings
 from io import StringIO
-from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import pandas as pd  # type: ignore
@@ -42,8 +54,10 @@ from eland.series import Series
 from eland.utils import is_valid_attr_name
 
 if TYPE_CHECKING:
+    import pyarrow as pa  # type: ignore
     from elasticsearch import Elasticsearch
 
+    from .bulk import IngestReport
     from .query_compiler import QueryCompiler
 
 
@@ -153,6 +167,27 @@ class DataFrame(NDFrame):
             es_index_field=es_index_field,
             _query_compiler=_query_compiler,
         )
+        self._ingest_report: Optional["IngestReport"] = None
+
+    @property
+    def ingest_report(self) -> Optional["IngestReport"]:
+        """
+        Summary of the bulk load that created this DataFrame with
+        :func:`eland.pandas_to_eland` or :func:`eland.csv_to_eland`,
+        None otherwise.
+
+        Returns
+        -------
+        eland.bulk.IngestReport or None
+            Number of documents and bytes indexed, retries, failures and time taken
+
+        Examples
+        --------
+        >>> ed_df = ed.pandas_to_eland(pd_df, 'http://localhost:9200', 'pandas_to_eland', es_if_exists="replace") # doctest: +SKIP
+        >>> ed_df.ingest_report.num_docs # doctest: +SKIP
+        3
+        """
+        return self._ingest_report
 
     @property
     def columns(self) -> pd.Index:
@@ -307,6 +342,15 @@ class DataFrame(NDFrame):
         eland.DataFrame:
             eland DataFrame filtered containing n rows randomly sampled
 
+        Notes
+        -----
+        Rows are ranked by a random score seeded with ``random_state``. On
+        large indices only a partition of the documents, chosen by the hash
+        of their ``_id`` and ``random_state``, is scored and ranked. Selecting
+        the partition still reads and hashes the ``_id`` of every matching
+        document so the cost of the sample grows with the size of the index,
+        but less scoring and ranking work is done.
+
         See Also
         --------
         :pandas_api_docs:`pandas.DataFrame.sample`
@@ -491,9 +535,6 @@ class DataFrame(NDFrame):
         max_cols = pd.get_option("display.max_columns")
         min_rows = pd.get_option("display.min_rows")
 
-        if max_rows and len(self) > max_rows:
-            max_rows = min_rows
-
         show_dimensions = pd.get_option("display.show_dimensions")
         if pd.get_option("display.expand_frame_repr"):
             width, _ = console.get_console_size()
@@ -506,6 +547,7 @@ class DataFrame(NDFrame):
             max_cols=max_cols,
             line_width=width,
             show_dimensions=show_dimensions,
+            min_rows=min_rows,
         )
 
         return buf.getvalue()
@@ -537,14 +579,12 @@ class DataFrame(NDFrame):
             min_rows = pd.get_option("display.min_rows")
             show_dimensions = pd.get_option("display.show_dimensions")
 
-            if max_rows and len(self) > max_rows:
-                max_rows = min_rows
-
             return self.to_html(
                 max_rows=max_rows,
                 max_cols=max_cols,
                 show_dimensions=show_dimensions,
                 notebook=True,
+                min_rows=min_rows,
             )  # set for consistency with pandas output
         else:
             return None
@@ -1013,6 +1053,7 @@ class DataFrame(NDFrame):
         border=None,
         table_id=None,
         render_links=False,
+        min_rows=None,
     ) -> Any:
         """
         Render a Elasticsearch data as an HTML table.
@@ -1024,9 +1065,23 @@ class DataFrame(NDFrame):
         --------
         :pandas_api_docs:`pandas.DataFrame.to_html`
         """
+        # Fetch the number of rows and enough rows for any of the limits below
+        repr_rows = self._fetch_repr(
+            max(
+                DEFAULT_NUM_ROWS_DISPLAYED if max_rows is None else max_rows,
+                min_rows or 0,
+                1,
+            )
+            + 1
+        )
+
+        # Like pandas, show min_rows rows if there are more than max_rows
+        num_rows = repr_rows.count
+        if min_rows is not None and max_rows and num_rows > max_rows:
+            max_rows = min_rows
+
         # In pandas calling 'to_string' without max_rows set, will dump ALL rows - we avoid this
         # by limiting rows by default.
-        num_rows = len(self)  # avoid multiple calls
         if num_rows <= DEFAULT_NUM_ROWS_DISPLAYED:
             if max_rows is None:
                 max_rows = num_rows
@@ -1048,7 +1103,7 @@ class DataFrame(NDFrame):
             max_rows = 1
 
         # Create a slightly bigger dataframe than display
-        df = self._build_repr(max_rows + 1)
+        df = repr_rows.build(max_rows + 1)
 
         if buf is not None:
             _buf = _expand_user(stringify_path(buf))
@@ -1085,7 +1140,7 @@ class DataFrame(NDFrame):
         if show_dimensions:
             # TODO - this results in different output to pandas
             # TODO - the 'x' character is different and this gets added after the </div>
-            _buf.write(f"\n<p>{len(self.index)} rows × {len(self.columns)} columns</p>")
+            _buf.write(f"\n<p>{num_rows} rows × {len(self.columns)} columns</p>")
 
         if buf is None:
             result = _buf.getvalue()
@@ -1110,6 +1165,7 @@ class DataFrame(NDFrame):
         show_dimensions=False,
         decimal=".",
         line_width=None,
+        min_rows=None,
     ):
         """
         Render a DataFrame to a console-friendly tabular output.
@@ -1121,9 +1177,23 @@ class DataFrame(NDFrame):
         --------
         :pandas_api_docs:`pandas.DataFrame.to_string`
         """
+        # Fetch the number of rows and enough rows for any of the limits below
+        repr_rows = self._fetch_repr(
+            max(
+                DEFAULT_NUM_ROWS_DISPLAYED if max_rows is None else max_rows,
+                min_rows or 0,
+                1,
+            )
+            + 1
+        )
+
+        # Like pandas, show min_rows rows if there are more than max_rows
+        num_rows = repr_rows.count
+        if min_rows is not None and max_rows and num_rows > max_rows:
+            max_rows = min_rows
+
         # In pandas calling 'to_string' without max_rows set, will dump ALL rows - we avoid this
         # by limiting rows by default.
-        num_rows = len(self)  # avoid multiple calls
         if num_rows <= DEFAULT_NUM_ROWS_DISPLAYED:
             if max_rows is None:
                 max_rows = num_rows
@@ -1145,7 +1215,7 @@ class DataFrame(NDFrame):
             max_rows = 1
 
         # Create a slightly bigger dataframe than display
-        df = self._build_repr(max_rows + 1)
+        df = repr_rows.build(max_rows + 1)
 
         if buf is not None:
             _buf = _expand_user(stringify_path(buf))
@@ -1174,7 +1244,7 @@ class DataFrame(NDFrame):
         # Our fake dataframe has incorrect number of rows (max_rows*2+1) - write out
         # the correct number of rows
         if show_dimensions:
-            _buf.write(f"\n\n[{len(self.index)} rows x {len(self.columns)} columns]")
+            _buf.write(f"\n\n[{num_rows} rows x {len(self.columns)} columns]")
 
         if buf is None:
             result = _buf.getvalue()
@@ -1309,10 +1379,21 @@ class DataFrame(NDFrame):
         doublequote=True,
         escapechar=None,
         decimal=".",
+        checkpoint=None,
     ) -> Optional[str]:
         """
         Write Elasticsearch data to a comma-separated values (csv) file.
 
+        Results are written one page at a time so the DataFrame is never
+        held in memory as a whole.
+
+        If ``checkpoint`` is the path of a file, the position of the scan
+        is saved to it after every page is written. When the export is
+        interrupted, calling ``to_csv`` again with the same arguments appends
+        the remaining rows to ``path_or_buf``, each row is written once. If
+        the point in time has expired a new one is opened, so documents
+        changed in the meantime may be missed or repeated.
+
         See Also
         --------
         :pandas_api_docs:`pandas.DataFrame.to_csv`
@@ -1337,18 +1418,345 @@ class DataFrame(NDFrame):
             "doublequote": doublequote,
             "escapechar": escapechar,
             "decimal": decimal,
+            "checkpoint": checkpoint,
         }
         return self._query_compiler.to_csv(**kwargs)
 
-    def to_pandas(self, show_progress: bool = False) -> pd.DataFrame:
+    def to_pandas(
+        self,
+        show_progress: bool = False,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        compact_dtypes: bool = False,
+        preallocate: bool = False,
+    ) -> pd.DataFrame:
         """
         Utility method to convert eland.Dataframe to pandas.Dataframe
 
+        Parameters
+        ----------
+        show_progress: bool, default False
+            Output progress of option to stdout
+        parallel: int, optional
+            Number of point in time slices to search concurrently. Rows are
+            returned in index order if the DataFrame is sorted (e.g. head/tail),
+            otherwise in the order the slices return them.
+        prefetch: int, optional
+            Number of result pages to fetch in the background while the
+            current page is being converted. Has no effect with ``parallel``
+            as sliced searches are always fetched in the background.
+        prefetch_max_bytes: int, optional
+            Maximum number of response bytes held by ``prefetch``,
+            defaults to 64MB.
+        target_page_bytes: int, optional
+            Adapt the number of documents per search so that responses are
+            about this many bytes: more documents per page for small
+            documents and fewer for large ones. Pages never exceed the
+            index's ``index.max_result_window``.
+        target_page_latency: float, optional
+            Adapt the number of documents per search so that each search
+            takes about this many seconds. Can be combined with
+            ``target_page_bytes``, the smaller page size wins.
+        doc_values: bool, default False
+            Read keyword, integer, double, boolean and date fields from doc
+            values instead of ``_source``. This avoids loading and parsing
+            ``_source`` on the cluster, but values are returned as indexed:
+            keyword normalizers and ``ignore_above`` apply, multi-valued fields
+            are sorted and deduplicated and dates are returned in UTC.
+        compact_dtypes: bool, default False
+            Use narrower dtypes to reduce memory: keyword fields become
+            ``category`` and byte, short, integer and float fields become
+            ``int8``, ``int16``, ``int32`` and ``float32``. Integer fields with
+            missing values stay ``float64`` and keyword fields with multiple
+            values per document stay ``object``.
+        preallocate: bool, default False
+            Count the hits first and write each page into columns allocated
+            for that many rows, rather than concatenating the pages at the
+            end. This avoids briefly needing twice the memory of the result,
+            at the cost of an extra count request.
+
         Returns
         -------
         pandas.DataFrame
         """
-        return self._query_compiler.to_pandas(show_progress=show_progress)
+        return self._query_compiler.to_pandas(
+            show_progress=show_progress,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+            compact_dtypes=compact_dtypes,
+            preallocate=preallocate,
+        )
+
+    def to_arrow(
+        self,
+        index: bool = True,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+    ) -> "pa.Table":
+        """
+        Utility method to convert eland.DataFrame to a pyarrow.Table without
+        going through pandas. Requires pyarrow to be installed.
+
+        The Arrow schema is derived from the Elasticsearch mappings: keyword and
+        text fields are strings, numeric and boolean fields keep their type,
+        dates are timezone naive UTC timestamps and geo_points are
+        ``struct<lat, lon>``. Missing values are nulls.
+
+        Parameters
+        ----------
+        index: bool, default True
+            Include the index (e.g. ``_id``) as the first column
+        schema_overrides: dict, optional
+            Arrow types by column name replacing the derived types. Fields with
+            multiple values per document must be given a list type, e.g.
+            ``{"sku": pyarrow.list_(pyarrow.string())}``
+        parallel: int, optional
+            See :meth:`DataFrame.to_pandas`
+        prefetch: int, optional
+            See :meth:`DataFrame.to_pandas`
+        prefetch_max_bytes: int, optional
+            See :meth:`DataFrame.to_pandas`
+        target_page_bytes: int, optional
+            See :meth:`DataFrame.to_pandas`
+        target_page_latency: float, optional
+            See :meth:`DataFrame.to_pandas`
+        doc_values: bool, default False
+            See :meth:`DataFrame.to_pandas`
+
+        Returns
+        -------
+        pyarrow.Table
+
+        See Also
+        --------
+        iter_arrow_batches
+
+        Examples
+        --------
+        >>> df = ed.DataFrame('http://localhost:9200', 'flights', columns=['Carrier', 'dayOfWeek'])
+        >>> df.head(3).to_arrow(index=False) # doctest: +SKIP
+        pyarrow.Table
+        Carrier: string
+        dayOfWeek: int64
+        ----
+        Carrier: [["Kibana Airlines","Logstash Airways","Logstash Airways"]]
+        dayOfWeek: [[0,0,0]]
+        """
+        return self._query_compiler.to_arrow(
+            index=index,
+            schema_overrides=schema_overrides,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+        )
+
+    def to_parquet(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        compression: Optional[str] = "snappy",
+        index: bool = True,
+        row_group_size: Optional[int] = None,
+        max_file_size: Optional[int] = None,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+    ) -> None:
+        """
+        Write Elasticsearch data to a Parquet file. Requires pyarrow to be
+        installed.
+
+        Pages of search results are written as they arrive, so memory use
+        does not grow with the size of the index. The schema is the one
+        :meth:`DataFrame.to_arrow` returns and is the same for every row
+        group, even if a column is missing from a page.
+
+        Parameters
+        ----------
+        path: str or path object
+            File to write, or a directory if ``max_file_size`` is given
+        compression: str or None, default 'snappy'
+            Name of the compression to use, ``None`` for no compression
+        index: bool, default True
+            Include the index (e.g. ``_id``) as the first column
+        row_group_size: int, optional
+            Number of rows per row group. By default each page of search
+            results is written as one row group.
+        max_file_size: int, optional
+            Split the output into files ``part-00000.parquet``,
+            ``part-00001.parquet``, ... in the directory ``path``, starting
+            a new file once the current one reaches this many bytes. Files
+            end on row group boundaries so can be larger than this.
+        schema_overrides: dict, optional
+            See :meth:`DataFrame.to_arrow`
+        parallel: int, optional
+            See :meth:`DataFrame.to_pandas`
+        prefetch: int, optional
+            See :meth:`DataFrame.to_pandas`
+        prefetch_max_bytes: int, optional
+            See :meth:`DataFrame.to_pandas`
+        target_page_bytes: int, optional
+            See :meth:`DataFrame.to_pandas`
+        target_page_latency: float, optional
+            See :meth:`DataFrame.to_pandas`
+        doc_values: bool, default False
+            See :meth:`DataFrame.to_pandas`
+
+        See Also
+        --------
+        :pandas_api_docs:`pandas.DataFrame.to_parquet`
+
+        Examples
+        --------
+        >>> df = ed.DataFrame('http://localhost:9200', 'flights')
+        >>> df.to_parquet('flights.parquet', row_group_size=10000) # doctest: +SKIP
+        >>> df.to_parquet('flights', max_file_size=64 * 1024 * 1024) # doctest: +SKIP
+        """
+        self._query_compiler.to_parquet(
+            path,
+            compression=compression,
+            index=index,
+            row_group_size=row_group_size,
+            max_file_size=max_file_size,
+            schema_overrides=schema_overrides,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+        )
+
+    def iter_arrow_batches(
+        self,
+        index: bool = True,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        checkpoint: Optional[str] = None,
+    ) -> Iterator["pa.RecordBatch"]:
+        """
+        Iterate over the DataFrame as pyarrow.RecordBatch objects, one per
+        page of search results. Every batch has the same schema, see
+        :meth:`DataFrame.to_arrow` for the other parameters.
+
+        Parameters
+        ----------
+        checkpoint: str, optional
+            Path of a file the position of the scan is saved to once each
+            batch is taken, i.e. the next batch is requested or iteration is
+            closed. If the file exists iteration carries on after the last
+            batch that was taken, so no batch is seen twice.
+
+        Returns
+        -------
+        iterator of pyarrow.RecordBatch
+
+        Examples
+        --------
+        >>> df = ed.DataFrame('http://localhost:9200', 'flights', columns=['Carrier', 'dayOfWeek'])
+        >>> sum(batch.num_rows for batch in df.iter_arrow_batches()) # doctest: +SKIP
+        13059
+        """
+        return self._query_compiler.search_yield_arrow_batches(
+            index=index,
+            schema_overrides=schema_overrides,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+            checkpoint=checkpoint,
+        )
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        columns: Optional[List[str]] = None,
+        as_: str = "pandas",
+        shuffle_seed: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        doc_values: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Iterate over the DataFrame in batches of ``batch_size`` rows,
+        whatever the size of the pages of search results. Only the last
+        batch may be smaller.
+
+        Inside a PyTorch ``DataLoader`` worker each worker scans its own
+        slice of the results, so the DataFrame can back an
+        ``IterableDataset`` with any number of workers.
+
+        Parameters
+        ----------
+        batch_size: int
+            Number of rows per batch
+        columns: list of str, optional
+            Columns to include in the batches, defaults to all columns
+        as_: {'pandas', 'numpy', 'arrow'}, default 'pandas'
+            Type of the batches: pandas.DataFrame, a 2D numpy.ndarray with
+            a column per DataFrame column, or pyarrow.RecordBatch. NumPy
+            and Arrow batches don't include the index.
+        shuffle_seed: int, optional
+            Return the rows in a random order, which is the same for the
+            same seed. Change the seed each epoch for a different order.
+        prefetch: int, optional
+            Number of pages of results to fetch in the background, see
+            :meth:`DataFrame.to_pandas`
+        doc_values: bool, default False
+            Read the values from doc values rather than _source, see
+            :meth:`DataFrame.to_pandas`
+
+        Returns
+        -------
+        iterator of pandas.DataFrame, numpy.ndarray or pyarrow.RecordBatch
+
+        Examples
+        --------
+        >>> df = ed.DataFrame('http://localhost:9200', 'flights', columns=['AvgTicketPrice', 'DistanceKilometers'])
+        >>> [len(batch) for batch in df.iter_batches(5000)] # doctest: +SKIP
+        [5000, 5000, 3059]
+
+        >>> import torch # doctest: +SKIP
+        >>> class Flights(torch.utils.data.IterableDataset): # doctest: +SKIP
+        ...     def __init__(self, epoch):
+        ...         self.epoch = epoch
+        ...     def __iter__(self):
+        ...         return df.iter_batches(256, as_='numpy', shuffle_seed=self.epoch)
+        >>> loader = torch.utils.data.DataLoader(Flights(0), batch_size=None, num_workers=4) # doctest: +SKIP
+        """
+        df = self if columns is None else self[columns]
+        return df._query_compiler.iter_batches(
+            batch_size=batch_size,
+            as_=as_,
+            shuffle_seed=shuffle_seed,
+            prefetch=prefetch,
+            doc_values=doc_values,
+        )
 
     def _empty_pd_df(self) -> pd.DataFrame:
         return self._query_compiler._empty_pd_ef()
@@ -16,15 +16,40 @@
 #  under the License.
 
 import csv
-from collections import deque
-from typing import Any, Dict, Generator, List, Mapping, Optional, Tuple, Union
+import itertools
+import queue
+import threading
+from contextlib import nullcontext
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import pandas as pd  # type: ignore
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import parallel_bulk
 
-from eland import DataFrame
-from eland.common import DEFAULT_CHUNK_SIZE, PANDAS_VERSION, ensure_es_client
+from eland import DataFrame, cache
+from eland.bulk import (
+    IngestReport,
+    bulk_index,
+    bulk_load_settings,
+    iter_bulk_chunks,
+    iter_ndjson,
+)
+from eland.common import (
+    DEFAULT_BULK_MAX_BYTES,
+    DEFAULT_BULK_MAX_RETRIES,
+    DEFAULT_CHUNK_SIZE,
+    PANDAS_VERSION,
+    ensure_es_client,
+)
 from eland.field_mappings import FieldMappings, verify_mapping_compatibility
 
 try:
@@ -34,6 +59,8 @@ except ImportError:
 
 _DEFAULT_LOW_MEMORY: bool = _c_parser_defaults["low_memory"]
 
+_READ_AHEAD_DONE = object()
+
 
 def pandas_to_eland(
     pd_df: pd.DataFrame,
@@ -47,6 +74,12 @@ def pandas_to_eland(
     thread_count: int = 4,
     chunksize: Optional[int] = None,
     use_pandas_index_for_es_ids: bool = True,
+    max_chunk_bytes: Optional[int] = None,
+    es_bulk_load: bool = False,
+    es_translog_async: bool = False,
+    es_force_merge: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    show_progress: bool = False,
 ) -> DataFrame:
     """
     Append a pandas DataFrame to an Elasticsearch index.
@@ -70,7 +103,7 @@ def pandas_to_eland(
         Refresh es_dest_index after bulk index
     es_dropna: bool, default 'False'
         * True: Remove missing values (see pandas.Series.dropna)
-        * False: Include missing values - may cause bulk to fail
+        * False: Include missing values as null
     es_type_overrides: dict, default None
         Dict of field_name: es_data_type that overrides default es data types
     es_verify_mapping_compatibility: bool, default 'True'
@@ -79,15 +112,39 @@ def pandas_to_eland(
     thread_count: int
         number of the threads to use for the bulk requests
     chunksize: int, default None
-        Number of pandas.DataFrame rows to read before bulk index into Elasticsearch
+        Number of pandas.DataFrame rows serialized at a time
     use_pandas_index_for_es_ids: bool, default 'True'
         * True: pandas.DataFrame.index fields will be used to populate Elasticsearch '_id' fields.
         * False: Ignore pandas.DataFrame.index when indexing into Elasticsearch
+    max_chunk_bytes: int, default None
+        Maximum size of a bulk request in bytes, defaults to 10 MiB
+    es_bulk_load: bool, default 'False'
+        * True: Disable refreshes and replicas of es_dest_index while loading,
+          restore its settings and refresh it afterwards
+        * False: Keep the index settings
+    es_translog_async: bool, default 'False'
+        Use asynchronous translog durability while loading with es_bulk_load,
+        documents may be lost if a node fails during the load
+    es_force_merge: int, default None
+        Force merge es_dest_index down to this number of segments after loading
+    max_retries: int, default None
+        Number of times documents rejected by Elasticsearch with a 429 status
+        are sent again, with an exponential backoff, defaults to 5. Fewer
+        requests are sent concurrently while documents are being rejected.
+    show_progress: bool, default 'False'
+        Output the number of indexed rows and a summary of the load to stdout
 
     Returns
     -------
     eland.Dataframe
-        eland.DataFrame referencing data in destination_index
+        eland.DataFrame referencing data in destination_index, with the
+        summary of the load in :attr:`eland.DataFrame.ingest_report`
+
+    Raises
+    ------
+    elasticsearch.helpers.BulkIndexError
+        If any document failed to index, with the summary of the load as its
+        ``report`` attribute
 
     Examples
     --------
@@ -158,9 +215,52 @@ def pandas_to_eland(
     """
     if chunksize is None:
         chunksize = DEFAULT_CHUNK_SIZE
+    if max_chunk_bytes is None:
+        max_chunk_bytes = DEFAULT_BULK_MAX_BYTES
+    if max_retries is None:
+        max_retries = DEFAULT_BULK_MAX_RETRIES
 
-    mapping = FieldMappings._generate_es_mappings(pd_df, es_type_overrides)
     es_client = ensure_es_client(es_client)
+    _create_or_verify_index(
+        es_client,
+        pd_df,
+        es_dest_index,
+        es_if_exists,
+        es_type_overrides,
+        es_verify_mapping_compatibility,
+    )
+    report = _load(
+        es_client,
+        es_dest_index,
+        [pd_df],
+        es_refresh=es_refresh,
+        es_dropna=es_dropna,
+        use_pandas_index_for_es_ids=use_pandas_index_for_es_ids,
+        thread_count=thread_count,
+        chunksize=chunksize,
+        max_chunk_bytes=max_chunk_bytes,
+        max_retries=max_retries,
+        es_bulk_load=es_bulk_load,
+        es_translog_async=es_translog_async,
+        es_force_merge=es_force_merge,
+        show_progress=show_progress,
+    )
+
+    ed_df = DataFrame(es_client, es_dest_index)
+    ed_df._ingest_report = report
+    return ed_df
+
+
+def _create_or_verify_index(
+    es_client: Elasticsearch,
+    pd_df: pd.DataFrame,
+    es_dest_index: str,
+    es_if_exists: str,
+    es_type_overrides: Optional[Mapping[str, str]],
+    es_verify_mapping_compatibility: bool,
+) -> None:
+    """Creates 'es_dest_index' for 'pd_df', or checks it, depending on 'es_if_exists'"""
+    mapping = FieldMappings._generate_es_mappings(pd_df, es_type_overrides)
 
     # If table exists, check if_exists parameter
     if es_client.indices.exists(index=es_dest_index):
@@ -188,46 +288,114 @@ def pandas_to_eland(
     else:
         es_client.indices.create(index=es_dest_index, mappings=mapping["mappings"])
 
-    def action_generator(
-        pd_df: pd.DataFrame,
-        es_dropna: bool,
-        use_pandas_index_for_es_ids: bool,
-        es_dest_index: str,
-    ) -> Generator[Dict[str, Any], None, None]:
-        for row in pd_df.iterrows():
-            if es_dropna:
-                values = row[1].dropna().to_dict()
-            else:
-                values = row[1].to_dict()
-
-            if use_pandas_index_for_es_ids:
-                # Use index as _id
-                id = row[0]
-
-                action = {"_index": es_dest_index, "_source": values, "_id": str(id)}
-            else:
-                action = {"_index": es_dest_index, "_source": values}
-
-            yield action
-
-    # parallel_bulk is lazy generator so use deque to consume them immediately
-    # maxlen = 0 because don't need results of parallel_bulk
-    deque(
-        parallel_bulk(
-            client=es_client,
-            actions=action_generator(
-                pd_df, es_dropna, use_pandas_index_for_es_ids, es_dest_index
-            ),
-            thread_count=thread_count,
-            chunk_size=int(chunksize / thread_count),
-        ),
-        maxlen=0,
+
+def _load(
+    es_client: Elasticsearch,
+    es_dest_index: str,
+    pd_dfs: Iterable[pd.DataFrame],
+    es_refresh: bool,
+    es_dropna: bool,
+    use_pandas_index_for_es_ids: bool,
+    thread_count: int,
+    chunksize: int,
+    max_chunk_bytes: int,
+    max_retries: int,
+    es_bulk_load: bool,
+    es_translog_async: bool,
+    es_force_merge: Optional[int],
+    show_progress: bool,
+) -> IngestReport:
+    """Bulk indexes the rows of each DataFrame with one pool of threads"""
+    bulk_load = (
+        bulk_load_settings(es_client, es_dest_index, es_translog_async)
+        if es_bulk_load
+        else nullcontext()
     )
+    try:
+        with bulk_load:
+            docs = (
+                doc
+                for pd_df in pd_dfs
+                for doc in iter_ndjson(
+                    pd_df, es_dropna, use_pandas_index_for_es_ids, chunksize
+                )
+            )
+            report = bulk_index(
+                es_client,
+                es_dest_index,
+                iter_bulk_chunks(docs, max_chunk_bytes),
+                thread_count=thread_count,
+                max_retries=max_retries,
+                show_progress=show_progress,
+            )
+            _finish_load(
+                es_client, es_dest_index, es_refresh, es_bulk_load, es_force_merge
+            )
+    finally:
+        # Cached results may include the index, e.g. through an alias
+        cache.clear()
+    return report
+
 
-    if es_refresh:
+def _finish_load(
+    es_client: Elasticsearch,
+    es_dest_index: str,
+    es_refresh: bool,
+    es_bulk_load: bool,
+    es_force_merge: Optional[int],
+) -> None:
+    # Runs before bulk load settings are restored, so replicas
+    # are recovered from the merged segments of the primaries
+    if es_refresh or es_bulk_load or es_force_merge is not None:
         es_client.indices.refresh(index=es_dest_index)
+    if es_force_merge is not None:
+        # Merging can take much longer than the default request timeout
+        es_client.options(request_timeout=None).indices.forcemerge(
+            index=es_dest_index, max_num_segments=es_force_merge
+        )
 
-    return DataFrame(es_client, es_dest_index)
+
+def _read_ahead(
+    chunks: Iterable[pd.DataFrame], depth: int
+) -> Generator[pd.DataFrame, None, None]:
+    """
+    Yields the chunks of 'chunks', read in a background thread at most
+    'depth' chunks ahead of the consumer.
+    """
+    out: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read() -> None:
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+            put(_READ_AHEAD_DONE)
+        except BaseException as e:
+            put(e)
+
+    thread = threading.Thread(target=read, name="eland-read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = out.get()
+            if item is _READ_AHEAD_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
 
 
 def eland_to_pandas(ed_df: DataFrame, show_progress: bool = False) -> pd.DataFrame:
@@ -357,6 +525,14 @@ def csv_to_eland(  # type: ignore
     low_memory: bool = _DEFAULT_LOW_MEMORY,
     memory_map=False,
     float_precision=None,
+    # Elasticsearch
+    es_bulk_load: bool = False,
+    es_translog_async: bool = False,
+    es_force_merge: Optional[int] = None,
+    thread_count: int = 4,
+    max_chunk_bytes: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    show_progress: bool = False,
 ) -> "DataFrame":
     """
     Read a comma-separated values (csv) file into eland.DataFrame (i.e. an Elasticsearch index).
@@ -380,11 +556,39 @@ def csv_to_eland(  # type: ignore
         - append: Insert new values to the existing index. Create if does not exist.
     es_dropna: bool, default 'False'
         * True: Remove missing values (see pandas.Series.dropna)
-        * False: Include missing values - may cause bulk to fail
+        * False: Include missing values as null
     es_type_overrides: dict, default None
         Dict of columns: es_type to override default es datatype mappings
     chunksize
         number of csv rows to read before bulk index into Elasticsearch
+    es_bulk_load: bool, default 'False'
+        Disable refreshes and replicas of es_dest_index while loading,
+        see :func:`eland.pandas_to_eland`
+    es_translog_async: bool, default 'False'
+        Use asynchronous translog durability while loading with es_bulk_load
+    es_force_merge: int, default None
+        Force merge es_dest_index down to this number of segments after loading
+    thread_count: int
+        number of the threads to use for the bulk requests
+    max_chunk_bytes: int, default None
+        Maximum size of a bulk request in bytes, defaults to 10 MiB
+    max_retries: int, default None
+        Number of times documents rejected by Elasticsearch with a 429 status
+        are sent again, see :func:`eland.pandas_to_eland`
+    show_progress: bool, default 'False'
+        Output the number of indexed rows and a summary of the load to stdout
+
+    Returns
+    -------
+    eland.Dataframe
+        eland.DataFrame referencing data in es_dest_index, with the summary
+        of the load in :attr:`eland.DataFrame.ingest_report`
+
+    Raises
+    ------
+    elasticsearch.helpers.BulkIndexError
+        If any document failed to index, with the summary of the load as its
+        ``report`` attribute
 
     Other Parameters
     ----------------
@@ -501,6 +705,10 @@ def csv_to_eland(  # type: ignore
 
     if chunksize is None:
         kwargs["chunksize"] = DEFAULT_CHUNK_SIZE
+    if max_chunk_bytes is None:
+        max_chunk_bytes = DEFAULT_BULK_MAX_BYTES
+    if max_retries is None:
+        max_retries = DEFAULT_BULK_MAX_RETRIES
 
     if PANDAS_VERSION >= (1, 3):
         # Bug in Pandas v1.3.0
@@ -525,23 +733,46 @@ def csv_to_eland(  # type: ignore
 
         kwargs.pop("on_bad_lines")
 
-    # read csv in chunks to pandas DataFrame and dump to eland DataFrame (and Elasticsearch)
-    reader = pd.read_csv(filepath_or_buffer, **kwargs)
-
-    first_write = True
-    for chunk in reader:
-        pandas_to_eland(
-            chunk,
-            es_client,
-            es_dest_index,
-            chunksize=chunksize,
-            es_refresh=es_refresh,
-            es_dropna=es_dropna,
-            es_type_overrides=es_type_overrides,
-            # es_if_exists should be 'append' except on the first call to pandas_to_eland()
-            es_if_exists=(es_if_exists if first_write else "append"),
-        )
-        first_write = False
+    # Every chunk is written with the same client
+    es_client = ensure_es_client(es_client)
+
+    # Chunks of the csv are parsed in a background thread while the previous
+    # chunks are serialized and sent by the bulk threads
+    report = None
+    with pd.read_csv(filepath_or_buffer, **kwargs) as reader:
+        chunks = _read_ahead(reader, depth=2)
+        try:
+            first_chunk = next(chunks, None)
+            if first_chunk is not None:
+                # The index is created from the first chunk
+                _create_or_verify_index(
+                    es_client,
+                    first_chunk,
+                    es_dest_index,
+                    es_if_exists,
+                    es_type_overrides,
+                    es_verify_mapping_compatibility=True,
+                )
+                report = _load(
+                    es_client,
+                    es_dest_index,
+                    itertools.chain([first_chunk], chunks),
+                    es_refresh=es_refresh,
+                    es_dropna=es_dropna,
+                    use_pandas_index_for_es_ids=True,
+                    thread_count=thread_count,
+                    chunksize=kwargs["chunksize"],
+                    max_chunk_bytes=max_chunk_bytes,
+                    max_retries=max_retries,
+                    es_bulk_load=es_bulk_load,
+                    es_translog_async=es_translog_async,
+                    es_force_merge=es_force_merge,
+                    show_progress=show_progress,
+                )
+        finally:
+            chunks.close()
 
     # Now create an eland.DataFrame that references the new index
-    return DataFrame(es_client, es_index_pattern=es_dest_index)
+    ed_df = DataFrame(es_client, es_index_pattern=es_dest_index)
+    ed_df._ingest_report = report
+    return ed_df
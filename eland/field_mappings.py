@@ -172,6 +172,31 @@ class FieldMappings:
         "boolean": "bool",
     }
 
+    # Elasticsearch datatypes whose doc values hold the same value as _source.
+    # Float types are excluded as their doc values have reduced precision.
+    ES_DOC_VALUE_DTYPES: Set[str] = {
+        "keyword",
+        "long",
+        "integer",
+        "short",
+        "byte",
+        "double",
+        "boolean",
+        "date",
+        "date_nanos",
+    }
+
+    # Narrower pandas dtypes used by to_pandas(compact_dtypes=True)
+    ES_DTYPE_TO_COMPACT_PD_DTYPE: Dict[str, str] = {
+        "keyword": "category",
+        "constant_keyword": "category",
+        "integer": "int32",
+        "short": "int16",
+        "byte": "int8",
+        "float": "float32",
+        "half_float": "float32",
+    }
+
     # the labels for each column (display_name is index)
     column_labels: List[str] = [
         "es_field_name",
@@ -812,6 +837,45 @@ class FieldMappings:
             self._mappings_capabilities.is_scripted == False
         ].es_field_name.to_list()
 
+    def doc_value_field_names(self) -> List[str]:
+        """
+        Returns
+        -------
+        es_field_names: list of str
+            List of non-scripted source fields that can be read from doc values
+            (docvalue_fields) instead of _source
+        """
+        capabilities = self._mappings_capabilities
+        return [
+            es_field_name
+            for es_field_name, es_dtype, is_source, is_aggregatable, is_scripted in zip(
+                capabilities.es_field_name,
+                capabilities.es_dtype,
+                capabilities.is_source,
+                capabilities.is_aggregatable,
+                capabilities.is_scripted,
+            )
+            if es_dtype in self.ES_DOC_VALUE_DTYPES
+            and is_source
+            and is_aggregatable
+            and not is_scripted
+        ]
+
+    def compact_pd_dtypes(self) -> Dict[str, str]:
+        """
+        Returns
+        -------
+        compact_pd_dtypes: dict
+            Narrower pandas dtype by display_name for fields that have one
+            (e.g. 'category' for keyword or 'int8' for byte fields)
+        """
+        capabilities = self._mappings_capabilities
+        return {
+            display_name: self.ES_DTYPE_TO_COMPACT_PD_DTYPE[es_dtype]
+            for display_name, es_dtype in zip(capabilities.index, capabilities.es_dtype)
+            if es_dtype in self.ES_DTYPE_TO_COMPACT_PD_DTYPE
+        }
+
     def _get_display_names(self):
         return self._mappings_capabilities.index.to_list()
 
@@ -31,7 +31,7 @@ if TYPE_CHECKING:
 # The license for this library can be found NOTICE.txt and the code can be
 # https://raw.githubusercontent.com/pandas-dev/pandas/v1.0.1/pandas/compat/_optional.py
 
-VERSIONS = {"xgboost": "0.90", "sklearn": "1.3"}
+VERSIONS = {"xgboost": "0.90", "sklearn": "1.3", "pyarrow": "10.0"}
 
 # Update install.rst when updating versions!
 
@@ -21,6 +21,7 @@ from typing import TYPE_CHECKING, List, Optional, TextIO, Tuple, Union
 
 import pandas as pd  # type: ignore
 
+from eland.aio import AsyncAccessor
 from eland.query_compiler import QueryCompiler
 
 if TYPE_CHECKING:
@@ -54,6 +55,36 @@ only Elasticsearch aggregatable fields can be aggregated or grouped.
 """
 
 
+class _ReprRows:
+    """
+    The number of rows of a DataFrame or Series with its first and last
+    rows, enough to display it with up to the number of rows fetched.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        head: Union[pd.DataFrame, pd.Series],
+        tail: Union[pd.DataFrame, pd.Series],
+    ) -> None:
+        self.count = count
+        self._head = head
+        self._tail = tail
+
+    def build(self, num_rows: int) -> Union[pd.DataFrame, pd.Series]:
+        if self.count <= num_rows:
+            return self._head
+
+        head_rows = int(num_rows / 2) + num_rows % 2
+        tail_rows = num_rows - head_rows
+        return pd.concat(
+            [
+                self._head.iloc[:head_rows],
+                self._tail.iloc[len(self._tail) - tail_rows :],
+            ]
+        )
+
+
 class NDFrame(ABC):
     def __init__(
         self,
@@ -159,20 +190,28 @@ class NDFrame(ABC):
         """
         return self._query_compiler.es_dtypes
 
-    def _build_repr(self, num_rows: int) -> pd.DataFrame:
-        # self could be Series or DataFrame
-        if len(self.index) <= num_rows:
-            return self.to_pandas()
-
-        num_rows = num_rows
-
-        head_rows = int(num_rows / 2) + num_rows % 2
-        tail_rows = num_rows - head_rows
-
-        head = self.head(head_rows).to_pandas()
-        tail = self.tail(tail_rows).to_pandas()
+    def _fetch_repr(self, num_rows: int) -> "_ReprRows":
+        """
+        Fetches the number of rows and enough rows to display self with up
+        to 'num_rows' rows. The count, head and tail are fetched with a
+        single multi search where possible rather than a round trip each.
+        """
+        fetched = self._query_compiler.search_repr(num_rows)
+        if fetched is not None:
+            count, head, tail = fetched
+            if self.ndim == 1:
+                head, tail = head.iloc[:, 0], tail.iloc[:, 0]
+            return _ReprRows(count, head, tail)
 
-        return pd.concat([head, tail])
+        # self could be Series or DataFrame
+        count = len(self.index)
+        if count <= num_rows:
+            head = tail = self.to_pandas()
+        else:
+            head_rows = int(num_rows / 2) + num_rows % 2
+            head = self.head(head_rows).to_pandas()
+            tail = self.tail(num_rows - head_rows).to_pandas()
+        return _ReprRows(count, head, tail)
 
     def __sizeof__(self) -> int:
         # Don't default to pandas, just return approximation TODO - make this more accurate
@@ -643,7 +682,18 @@ class NDFrame(ABC):
         return self._query_compiler.describe()
 
     @abstractmethod
-    def to_pandas(self, show_progress: bool = False) -> pd.DataFrame:
+    def to_pandas(
+        self,
+        show_progress: bool = False,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        compact_dtypes: bool = False,
+        preallocate: bool = False,
+    ) -> pd.DataFrame:
         raise NotImplementedError
 
     @abstractmethod
@@ -667,6 +717,10 @@ class NDFrame(ABC):
     def shape(self) -> Tuple[int, ...]:
         raise NotImplementedError
 
+    @property
+    def ndim(self) -> int:
+        raise NotImplementedError
+
     @property
     def size(self) -> int:
         """
@@ -687,3 +741,27 @@ class NDFrame(ABC):
         for dim in self.shape:
             product = (product or 1) * dim
         return product
+
+    @property
+    def aio(self) -> AsyncAccessor:
+        """
+        Awaitable versions of the methods and properties, for use with asyncio.
+
+        Returns
+        -------
+        eland.aio.AsyncAccessor
+
+        See Also
+        --------
+        :func:`eland.aio.read_es`
+
+        Examples
+        --------
+        >>> df = ed.DataFrame('http://localhost:9200', 'flights', columns=['AvgTicketPrice'])
+        >>> async def mean_ticket_price():
+        ...     return await df.aio.mean()
+        >>> asyncio.run(mean_ticket_price()) # doctest: +SKIP
+        AvgTicketPrice    628.253689
+        dtype: float64
+        """
+        return AsyncAccessor(self)
@@ -16,14 +16,27 @@
 #  under the License.
 
 import copy
+import heapq
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
 import warnings
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from io import StringIO
 from typing import (
     TYPE_CHECKING,
     Any,
+    Deque,
     Dict,
     Generator,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Sequence,
@@ -34,11 +47,23 @@ from typing import (
 
 import numpy as np
 import pandas as pd  # type: ignore
-
-from eland.actions import PostProcessingAction
+from elasticsearch import NotFoundError
+from pandas.core.dtypes.cast import find_common_type  # type: ignore
+from pandas.io.common import get_handle, infer_compression  # type: ignore
+
+from eland.actions import (
+    HeadAction,
+    PostProcessingAction,
+    SortIndexAction,
+    TailAction,
+)
+from eland.cache import cached_request
 from eland.common import (
+    DEFAULT_COUNT_FIELDS_PER_SEARCH,
+    DEFAULT_MAX_RESULT_WINDOW,
     DEFAULT_PAGINATION_SIZE,
     DEFAULT_PIT_KEEP_ALIVE,
+    DEFAULT_PREFETCH_MAX_BYTES,
     DEFAULT_PROGRESS_REPORTING_NUM_ROWS,
     DEFAULT_SEARCH_SIZE,
     SortOrder,
@@ -60,12 +85,13 @@ from eland.tasks import (
 )
 
 if TYPE_CHECKING:
+    import pyarrow as pa  # type: ignore
     from numpy.typing import DTypeLike
 
     from eland.arithmetics import ArithmeticSeries
     from eland.field_mappings import Field
     from eland.filter import BooleanFilter
-    from eland.query_compiler import QueryCompiler
+    from eland.query_compiler import HitDecoder, QueryCompiler
     from eland.tasks import Task
 
 
@@ -77,6 +103,7 @@ class QueryParams:
         self.size: Optional[int] = None
         self.fields: Optional[List[str]] = None
         self.script_fields: Optional[Dict[str, Dict[str, Any]]] = None
+        self.slice: Optional[Dict[str, Any]] = None
 
 
 class Operations:
@@ -164,15 +191,54 @@ class Operations:
         # Only return requested field_names
         fields = query_compiler.get_field_names(include_scripted_fields=False)
 
-        counts = {}
-        for field in fields:
+        # Count every field with an 'exists' filter agg rather than a _count
+        # request each. Very wide DataFrames are split over a multi search.
+        searches = []
+        for start in range(0, len(fields), DEFAULT_COUNT_FIELDS_PER_SEARCH):
             body = Query(query_params.query)
-            body.exists(field, must=True)
+            for i in range(
+                start, min(start + DEFAULT_COUNT_FIELDS_PER_SEARCH, len(fields))
+            ):
+                # Field names can contain characters agg names can't
+                body.exists_agg(str(i), fields[i])
+            searches.append(dict(body.to_search_body(), size=0, track_total_hits=False))
+
+        client = query_compiler._client
+
+        def search(body: Dict[str, Any]) -> Dict[str, Any]:
+            resp: Dict[str, Any] = cached_request(
+                client,
+                "search",
+                index=query_compiler._index_pattern,
+                filter_path="aggregations.*.doc_count",
+                **body,
+            )
+            return resp
+
+        if len(searches) > 1:
+            responses = cached_request(
+                client,
+                "msearch",
+                index=query_compiler._index_pattern,
+                searches=[part for body in searches for part in ({}, body)],
+                filter_path=[
+                    "responses.status",
+                    "responses.error",
+                    "responses.aggregations.*.doc_count",
+                ],
+            )["responses"]
+            # Send a failed search alone so the error is raised
+            responses = [
+                search(body) if "error" in resp else resp
+                for body, resp in zip(searches, responses)
+            ]
+        else:
+            responses = [search(body) for body in searches]
 
-            field_exists_count = query_compiler._client.count(
-                index=query_compiler._index_pattern, **body.to_count_body()
-            )["count"]
-            counts[field] = field_exists_count
+        counts = {}
+        for resp in responses:
+            for name, agg in resp.get("aggregations", {}).items():
+                counts[fields[int(name)]] = agg["doc_count"]
 
         return build_pd_series(data=counts, index=fields)
 
@@ -235,8 +301,17 @@ class Operations:
             )
 
         # Fetch Response
-        response = query_compiler._client.search(
-            index=query_compiler._index_pattern, size=0, **body.to_search_body()
+        response = cached_request(
+            query_compiler._client,
+            "search",
+            index=query_compiler._index_pattern,
+            size=0,
+            filter_path=[
+                "aggregations.*.hits.total.value",
+                "aggregations.*.hits.hits._id",
+                "aggregations.*.hits.hits._source",
+            ],
+            **body.to_search_body(),
         )
         response = response["aggregations"]
 
@@ -398,8 +473,13 @@ class Operations:
                         field=field.aggregatable_es_field_name,
                     )
 
-        response = query_compiler._client.search(
-            index=query_compiler._index_pattern, size=0, **body.to_search_body()
+        response = cached_request(
+            query_compiler._client,
+            "search",
+            index=query_compiler._index_pattern,
+            size=0,
+            filter_path="aggregations",
+            **body.to_search_body(),
         )
 
         """
@@ -450,8 +530,13 @@ class Operations:
         for field in aggregatable_field_names.keys():
             body.terms_aggs(field, func, field, es_size=es_size)
 
-        response = query_compiler._client.search(
-            index=query_compiler._index_pattern, size=0, body=body.to_search_body()
+        response = cached_request(
+            query_compiler._client,
+            "search",
+            index=query_compiler._index_pattern,
+            size=0,
+            filter_path="aggregations",
+            body=body.to_search_body(),
         )
 
         results = {}
@@ -496,8 +581,13 @@ class Operations:
         for field in numeric_source_fields:
             body.hist_aggs(field, field, min_aggs[field], max_aggs[field], num_bins)
 
-        response = query_compiler._client.search(
-            index=query_compiler._index_pattern, size=0, body=body.to_search_body()
+        response = cached_request(
+            query_compiler._client,
+            "search",
+            index=query_compiler._index_pattern,
+            size=0,
+            filter_path="aggregations",
+            body=body.to_search_body(),
         )
         # results are like
         # "aggregations" : {
@@ -1032,9 +1122,15 @@ class Operations:
 
         """
         while True:
-            res = query_compiler._client.search(
+            res = cached_request(
+                query_compiler._client,
+                "search",
                 index=query_compiler._index_pattern,
                 size=0,
+                filter_path=[
+                    f"aggregations.{agg_name}.buckets",
+                    f"aggregations.{agg_name}.after_key",
+                ],
                 body=body.to_search_body(),
             )
 
@@ -1219,65 +1315,573 @@ class Operations:
         )
 
     def to_pandas(
-        self, query_compiler: "QueryCompiler", show_progress: bool = False
+        self,
+        query_compiler: "QueryCompiler",
+        show_progress: bool = False,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        compact_dtypes: bool = False,
+        preallocate: bool = False,
     ) -> pd.DataFrame:
+        compact = query_compiler._mappings.compact_pd_dtypes() if compact_dtypes else {}
+        assembler = (
+            _FrameAssembler(self._hit_count(query_compiler)) if preallocate else None
+        )
+
         df_list: List[pd.DataFrame] = []
         i = 0
-        for df in self.search_yield_pandas_dataframes(query_compiler=query_compiler):
+        for df in self.search_yield_pandas_dataframes(
+            query_compiler=query_compiler,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+        ):
             if show_progress:
                 i = i + df.shape[0]
                 if i % DEFAULT_PROGRESS_REPORTING_NUM_ROWS == 0:
                     print(f"{datetime.now()}: read {i} rows")
-            df_list.append(df)
+            # Convert each page as it arrives so the wide dtypes
+            # are never held for the whole result
+            if compact:
+                df = _compact_dtypes(df, compact)
+            if assembler is not None:
+                assembler.append(df)
+            else:
+                df_list.append(df)
 
         if show_progress:
             print(f"{datetime.now()}: read {i} rows")
 
+        if assembler is not None and assembler.num_rows:
+            return assembler.to_pandas()
+
         # pd.concat() can't handle an empty list
         # because there aren't defined columns.
         if not df_list:
-            return query_compiler._empty_pd_ef()
+            return _compact_dtypes(query_compiler._empty_pd_ef(), compact)
+        if compact:
+            df_list = _union_categories(df_list)
         return pd.concat(df_list)
 
+    def _hit_count(self, query_compiler: "QueryCompiler") -> int:
+        """Returns the number of hits a scan of the query_compiler is expected to return"""
+        query_params, post_processing = self._resolve_tasks(query_compiler)
+
+        body = Query(query_params.query)
+        count: int = cached_request(
+            query_compiler._client,
+            "count",
+            index=query_compiler._index_pattern,
+            **(body.to_count_body() or {}),
+        )["count"]
+
+        size = self._size(query_params, post_processing)
+        return count if size is None else min(size, count)
+
     def to_csv(
         self,
         query_compiler: "QueryCompiler",
         show_progress: bool = False,
-        **kwargs: Union[bool, str],
+        **kwargs: Any,
     ) -> Optional[str]:
-        return self.to_pandas(  # type: ignore[no-any-return]
-            query_compiler=query_compiler, show_progress=show_progress
-        ).to_csv(**kwargs)
+        # Each page of results is appended to the output as it arrives
+        # so memory is bounded by the page size, not the index size.
+        path_or_buf = kwargs.pop("path_or_buf", None)
+        mode = kwargs.pop("mode", "w")
+        encoding = kwargs.pop("encoding", None)
+        compression = kwargs.pop("compression", "infer")
+        header = kwargs.pop("header", True)
+        checkpoint = kwargs.pop("checkpoint", None)
+
+        state: Optional[_ScanCheckpoint] = None
+        # Size of an uncompressed output file, to cut off a partly written page
+        output_path: Optional[str] = None
+        if checkpoint is not None:
+            if path_or_buf is None:
+                raise ValueError("checkpoint requires a path_or_buf")
+            if isinstance(path_or_buf, (str, os.PathLike)) and (
+                infer_compression(path_or_buf, compression) is None
+            ):
+                output_path = os.fspath(path_or_buf)
+            # Pages are saved once they're written, not when they're taken
+            state = _ScanCheckpoint(checkpoint, auto_save=False)
+            if state.exists:
+                # Resuming so append the remaining rows to the earlier output
+                mode = "a"
+                header = False
+                if (
+                    output_path is not None
+                    and state.output is not None
+                    and not state.complete
+                    and os.path.exists(output_path)
+                    and os.path.getsize(output_path) > state.output
+                ):
+                    os.truncate(output_path, state.output)
+
+        buf = StringIO() if path_or_buf is None else path_or_buf
+
+        i = 0
+        with get_handle(
+            buf, mode, encoding=encoding, compression=compression
+        ) as handles:
+            for df in self.search_yield_pandas_dataframes(
+                query_compiler=query_compiler, checkpoint=state
+            ):
+                # Only the first page gets the header
+                df.to_csv(handles.handle, header=header if i == 0 else False, **kwargs)
+                if state is not None:
+                    handles.handle.flush()
+                    state.save(
+                        output=(
+                            None
+                            if output_path is None
+                            else os.path.getsize(output_path)
+                        )
+                    )
+                i = i + df.shape[0]
+                if show_progress and i % DEFAULT_PROGRESS_REPORTING_NUM_ROWS == 0:
+                    print(f"{datetime.now()}: read {i} rows")
+
+            if i == 0:
+                query_compiler._empty_pd_ef().to_csv(
+                    handles.handle, header=header, **kwargs
+                )
+
+        if show_progress:
+            print(f"{datetime.now()}: read {i} rows")
+
+        if path_or_buf is None:
+            return buf.getvalue()
+        return None
 
     def search_yield_pandas_dataframes(
-        self, query_compiler: "QueryCompiler"
+        self,
+        query_compiler: "QueryCompiler",
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        checkpoint: Union[str, "_ScanCheckpoint", None] = None,
+        shuffle_seed: Optional[int] = None,
+        shard: Optional[Tuple[int, int]] = None,
     ) -> Generator["pd.DataFrame", None, None]:
+        pages, decoder, post_processing = self._scan(
+            query_compiler=query_compiler,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+            checkpoint=checkpoint,
+            shuffle_seed=shuffle_seed,
+            shard=shard,
+        )
+        yield from self._post_processed_dataframes(
+            query_compiler, pages, decoder, post_processing
+        )
+
+    def _post_processed_dataframes(
+        self,
+        query_compiler: "QueryCompiler",
+        pages: Iterable[List[Dict[str, Any]]],
+        decoder: "HitDecoder",
+        post_processing: List["PostProcessingAction"],
+    ) -> Generator["pd.DataFrame", None, None]:
+        """
+        Decodes each page of hits and applies the post-processing actions.
+
+        Head can be applied page by page. A leading tail only keeps its last
+        rows as pages arrive. Index sorting needs all hits, so the pages are
+        combined once and briefly held twice while they're concatenated.
+        These results are bounded by the search size or the requested ids.
+        """
+        if all(isinstance(action, HeadAction) for action in post_processing):
+            for hits in pages:
+                df = query_compiler._es_results_to_pandas(hits, decoder=decoder)
+                yield self._apply_df_post_processing(df, post_processing)
+            return
+
+        tail = (
+            post_processing[0] if isinstance(post_processing[0], TailAction) else None
+        )
+        df_list: List[pd.DataFrame] = []
+        for hits in pages:
+            df_list.append(query_compiler._es_results_to_pandas(hits, decoder=decoder))
+            if tail is not None and len(df_list) > 1:
+                df_list = [tail.resolve_action(pd.concat(df_list))]
+        if df_list:
+            df = df_list[0] if len(df_list) == 1 else pd.concat(df_list)
+            del df_list
+            yield self._apply_df_post_processing(df, post_processing)
+
+    def to_arrow(
+        self,
+        query_compiler: "QueryCompiler",
+        index: bool = True,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+    ) -> "pa.Table":
+        from eland.arrow import arrow_schema, to_table
+
+        schema = arrow_schema(
+            query_compiler._mappings,
+            index_field=query_compiler.index.es_index_field if index else None,
+            schema_overrides=schema_overrides,
+        )
+        batches = self.search_yield_arrow_batches(
+            query_compiler=query_compiler,
+            index=index,
+            schema_overrides=schema_overrides,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+        )
+        return to_table(schema, batches)
+
+    def to_parquet(
+        self,
+        query_compiler: "QueryCompiler",
+        path: Union[str, "os.PathLike[str]"],
+        compression: Optional[str] = "snappy",
+        index: bool = True,
+        row_group_size: Optional[int] = None,
+        max_file_size: Optional[int] = None,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+    ) -> None:
+        from eland.arrow import arrow_schema, write_parquet
+
+        schema = arrow_schema(
+            query_compiler._mappings,
+            index_field=query_compiler.index.es_index_field if index else None,
+            schema_overrides=schema_overrides,
+        )
+        batches = self.search_yield_arrow_batches(
+            query_compiler=query_compiler,
+            index=index,
+            schema_overrides=schema_overrides,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+        )
+        write_parquet(
+            batches,
+            schema,
+            path,
+            compression=compression,
+            row_group_size=row_group_size,
+            max_file_size=max_file_size,
+        )
+
+    def search_yield_arrow_batches(
+        self,
+        query_compiler: "QueryCompiler",
+        index: bool = True,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        checkpoint: Union[str, "_ScanCheckpoint", None] = None,
+        shuffle_seed: Optional[int] = None,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> Generator["pa.RecordBatch", None, None]:
+        from eland.arrow import arrow_schema, to_record_batch
+
+        index_field = query_compiler.index.es_index_field
+        schema = arrow_schema(
+            query_compiler._mappings,
+            index_field=index_field if index else None,
+            schema_overrides=schema_overrides,
+        )
+
+        pages, decoder, post_processing = self._scan(
+            query_compiler=query_compiler,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+            checkpoint=checkpoint,
+            shuffle_seed=shuffle_seed,
+            shard=shard,
+        )
+        if not post_processing:
+            for hits in pages:
+                yield decoder.decode_arrow(hits, schema)
+            return
+
+        # Post processing (e.g. head, tail and sorting) works on DataFrames
+        for df in self._post_processed_dataframes(
+            query_compiler, pages, decoder, post_processing
+        ):
+            columns = {name: df[name] for name in df.columns}
+            columns.setdefault(index_field, df.index)
+            yield to_record_batch(schema, columns, len(df))
+
+    def iter_batches(
+        self,
+        query_compiler: "QueryCompiler",
+        batch_size: int,
+        as_: str = "pandas",
+        shuffle_seed: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        doc_values: bool = False,
+    ) -> Generator[Any, None, None]:
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        if as_ not in ("pandas", "numpy", "arrow"):
+            raise ValueError(
+                f"as_ must be one of 'pandas', 'numpy' or 'arrow', got {as_!r}"
+            )
+
+        scan_kwargs: Dict[str, Any] = dict(
+            query_compiler=query_compiler,
+            prefetch=prefetch,
+            doc_values=doc_values,
+            shuffle_seed=shuffle_seed,
+            shard=_torch_worker_shard(),
+        )
+        if as_ == "arrow":
+            from eland.arrow import rebatch
+
+            yield from rebatch(
+                self.search_yield_arrow_batches(index=False, **scan_kwargs),
+                batch_size,
+            )
+        elif as_ == "numpy":
+            yield from _rebatch_numpy(
+                self.search_yield_pandas_dataframes(**scan_kwargs), batch_size
+            )
+        else:
+            yield from _rebatch_pandas(
+                self.search_yield_pandas_dataframes(**scan_kwargs), batch_size
+            )
+
+    def _scan(
+        self,
+        query_compiler: "QueryCompiler",
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        checkpoint: Union[str, "_ScanCheckpoint", None] = None,
+        shuffle_seed: Optional[int] = None,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[
+        Generator[List[Dict[str, Any]], None, None],
+        "HitDecoder",
+        List["PostProcessingAction"],
+    ]:
+        """
+        Builds the search for the current tasks and returns the generator
+        of hits, the decoder for those hits and the post-processing actions
+        to apply to each decoded page.
+
+        If 'shuffle_seed' is given hits are returned in a random order,
+        the same for the same seed. 'shard' is the (id, max) of the
+        point in time slice to scan, e.g. for one of several workers.
+        """
         query_params, post_processing = self._resolve_tasks(query_compiler)
 
+        if shuffle_seed is not None and (
+            post_processing
+            or query_params.size is not None
+            or query_params.sort_field is not None
+        ):
+            # Shuffling would change which rows are selected
+            raise ValueError(
+                "shuffle_seed can't be used after head(), tail() or sample()"
+            )
+        if shard is not None and parallel is not None and parallel > 1:
+            raise ValueError("shard can't be used with parallel")
+
+        if checkpoint is not None and not all(
+            isinstance(action, HeadAction) for action in post_processing
+        ):
+            # Tail and index sorting need all hits before yielding any
+            raise ValueError("checkpoint can't be used after tail() or sort_index()")
+
         result_size, sort_params = Operations._query_params_to_size_and_sort(
             query_params
         )
 
-        script_fields = query_params.script_fields
         query = Query(query_params.query)
+        if shuffle_seed is not None:
+            query.random_score(shuffle_seed)
+            sort_params = {"_score": "desc"}
+
+        body, decoder = self._search_body(
+            query_compiler, query, query_params.script_fields, doc_values
+        )
+        if sort_params:
+            body["sort"] = [sort_params]
+        if query_params.slice is not None:
+            if shard is not None and shard[1] > 1:
+                raise NotImplementedError("sample() results can't be split into slices")
+            body["slice"] = query_params.slice
+            # The sample is bounded by its size, scan it as a single slice
+            parallel = None
+        elif shard is not None and shard[1] > 1:
+            body["slice"] = {"id": shard[0], "max": shard[1]}
+
+        # Only return the parts of each hit that are decoded, 'sort'
+        # and 'pit_id' are needed for the next page
+        filter_path = [
+            "pit_id",
+            "hits.hits._source",
+            "hits.hits.fields",
+            "hits.hits.sort",
+        ]
+        if not query_compiler.index.is_source_field:
+            filter_path.append(f"hits.hits.{query_compiler.index.es_index_field}")
+        body["filter_path"] = filter_path
 
+        pages = _search_yield_hits(
+            query_compiler=query_compiler,
+            body=body,
+            max_number_of_hits=result_size,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            checkpoint=checkpoint,
+        )
+        return pages, decoder, post_processing
+
+    @staticmethod
+    def _search_body(
+        query_compiler: "QueryCompiler",
+        query: Query,
+        script_fields: Optional[Dict[str, Dict[str, Any]]],
+        doc_values: bool = False,
+    ) -> Tuple[Dict[str, Any], "HitDecoder"]:
+        """
+        Returns the search body selecting the fields of 'query_compiler'
+        that match 'query', and the decoder for its hits.
+        """
         body = query.to_search_body()
         if script_fields is not None:
             body["script_fields"] = script_fields
 
         # Only return requested field_names and add them to body
         _source = query_compiler.get_field_names(include_scripted_fields=False)
+
+        doc_value_fields: Optional[List[str]] = None
+        if doc_values:
+            # Read what we can from doc values and only load _source for the
+            # remaining fields. Values are formatted with the mapping's format.
+            # The index value is always read from _source.
+            doc_value_fields = [
+                field
+                for field in query_compiler._mappings.doc_value_field_names()
+                if field != query_compiler.index.es_index_field
+            ]
+            if doc_value_fields:
+                body["docvalue_fields"] = doc_value_fields
+                _source = [field for field in _source if field not in doc_value_fields]
+
         body["_source"] = _source if _source else False
 
-        if sort_params:
-            body["sort"] = [sort_params]
+        # Compile the flattening plan once and reuse it for every page
+        return body, query_compiler._hit_decoder(doc_value_fields)
 
-        for hits in _search_yield_hits(
-            query_compiler=query_compiler, body=body, max_number_of_hits=result_size
+    def search_repr(
+        self, query_compiler: "QueryCompiler", num_rows: int
+    ) -> Optional[Tuple[int, pd.DataFrame, pd.DataFrame]]:
+        """
+        Returns the number of rows, the first 'num_rows' rows and the last
+        'num_rows // 2' rows, fetched with a single multi search to display
+        the DataFrame. Returns None if the tasks already sort or limit the
+        rows, these are displayed with head() and tail() instead.
+        """
+        query_params, post_processing = self._resolve_tasks(query_compiler)
+        if (
+            post_processing
+            or query_params.size is not None
+            or query_params.sort_field is not None
+            or num_rows > DEFAULT_MAX_RESULT_WINDOW
         ):
-            df = query_compiler._es_results_to_pandas(hits)
-            df = self._apply_df_post_processing(df, post_processing)
-            yield df
+            return None
+
+        index = query_compiler.index
+        count_query = Query(query_params.query)
+        count_query.exists(index.es_index_field, must=True)
+        body, decoder = self._search_body(
+            query_compiler, Query(query_params.query), query_params.script_fields
+        )
+
+        # Same searches as len(), head() and tail()
+        searches: List[Dict[str, Any]] = [
+            {},
+            dict(count_query.to_search_body(), size=0, track_total_hits=True),
+            {},
+            dict(body, size=num_rows, sort=[{index.sort_field: "asc"}]),
+            {},
+            dict(body, size=num_rows // 2, sort=[{index.sort_field: "desc"}]),
+        ]
+        # 'status' keeps a response even if nothing else of it is returned
+        filter_path = [
+            "responses.status",
+            "responses.error",
+            "responses.hits.total.value",
+            "responses.hits.hits._source",
+            "responses.hits.hits.fields",
+        ]
+        if not index.is_source_field:
+            filter_path.append(f"responses.hits.hits.{index.es_index_field}")
+
+        # Documents are never cached so the repr always shows the current data
+        responses = query_compiler._client.msearch(
+            index=query_compiler._index_pattern,
+            searches=searches,
+            filter_path=filter_path,
+        )["responses"]
+        if any("error" in resp for resp in responses):
+            # Let the separate requests raise the error
+            return None
+
+        count: int = responses[0]["hits"]["total"]["value"]
+        head, tail = (
+            query_compiler._es_results_to_pandas(hits, decoder=decoder)
+            if hits
+            else query_compiler._empty_pd_ef()
+            for hits in (resp.get("hits", {}).get("hits", []) for resp in responses[1:])
+        )
+        tail = self._apply_df_post_processing(tail, [SortIndexAction()])
+        return count, head, tail
 
     def index_count(self, query_compiler: "QueryCompiler", field: str) -> int:
         # field is the index field so count values
@@ -1293,8 +1897,11 @@ class Operations:
         body = Query(query_params.query)
         body.exists(field, must=True)
 
-        count: int = query_compiler._client.count(
-            index=query_compiler._index_pattern, **body.to_count_body()
+        count: int = cached_request(
+            query_compiler._client,
+            "count",
+            index=query_compiler._index_pattern,
+            **body.to_count_body(),
         )["count"]
         return count
 
@@ -1331,8 +1938,11 @@ class Operations:
         else:
             body.terms(field, items, must=True)
 
-        count: int = query_compiler._client.count(
-            index=query_compiler._index_pattern, **body.to_count_body()
+        count: int = cached_request(
+            query_compiler._client,
+            "count",
+            index=query_compiler._index_pattern,
+            **body.to_count_body(),
         )["count"]
         return count
 
@@ -1484,6 +2094,12 @@ def _search_yield_hits(
     query_compiler: "QueryCompiler",
     body: Dict[str, Any],
     max_number_of_hits: Optional[int],
+    parallel: Optional[int] = None,
+    prefetch: Optional[int] = None,
+    prefetch_max_bytes: Optional[int] = None,
+    target_page_bytes: Optional[int] = None,
+    target_page_latency: Optional[float] = None,
+    checkpoint: Union[str, "_ScanCheckpoint", None] = None,
 ) -> Generator[List[Dict[str, Any]], None, None]:
     """
     This is a generator used to initialize point in time API and query the
@@ -1500,6 +2116,26 @@ def _search_yield_hits(
     max_number_of_hits: Optional[int]
         Maximum number of documents to yield, set to 'None' to
         yield all documents.
+    parallel: Optional[int]
+        Number of point in time slices to search concurrently. If a sort
+        was requested in 'body' the slices are merged in sort order,
+        otherwise batches are yielded as soon as any slice returns them.
+    prefetch: Optional[int]
+        Number of pages to fetch in a background thread ahead of the
+        consumer so that the next search is in flight while the current
+        batch is being processed. Sliced searches always prefetch.
+    prefetch_max_bytes: Optional[int]
+        Upper bound on the response bytes buffered by 'prefetch',
+        defaults to DEFAULT_PREFETCH_MAX_BYTES.
+    target_page_bytes: Optional[int]
+        Adapt the 'size' of each search so responses are about this many
+        bytes, bounded by the index's max_result_window.
+    target_page_latency: Optional[float]
+        Adapt the 'size' of each search so it takes about this many seconds.
+    checkpoint: Union[str, _ScanCheckpoint, None]
+        Path of a file the position of the scan is saved to after every
+        batch the consumer has taken. If the file exists the scan carries
+        on after the last saved batch, see _ScanCheckpoint.
 
     Examples
     --------
@@ -1511,8 +2147,22 @@ def _search_yield_hits(
     if max_number_of_hits == 0:
         return
 
+    if parallel is not None and parallel < 1:
+        raise ValueError(f"parallel must be a positive integer, got {parallel}")
+    if prefetch is not None and prefetch < 0:
+        raise ValueError(f"prefetch must be a non-negative integer, got {prefetch}")
+    if target_page_bytes is not None and target_page_bytes < 1:
+        raise ValueError(
+            f"target_page_bytes must be a positive integer, got {target_page_bytes}"
+        )
+    if target_page_latency is not None and target_page_latency <= 0:
+        raise ValueError(
+            f"target_page_latency must be a positive number, got {target_page_latency}"
+        )
+
     # Make a copy of 'body' to avoid mutating it outside this function.
     body = body.copy()
+    is_sorted = "sort" in body
 
     # Use the default search size
     body.setdefault("size", DEFAULT_SEARCH_SIZE)
@@ -1521,6 +2171,14 @@ def _search_yield_hits(
     hits_yielded = 0  # Track the total number of hits yielded.
     pit_id: Optional[str] = None
 
+    sizer: Optional[_PageSizer] = None
+    if target_page_bytes is not None or target_page_latency is not None:
+        sizer = _PageSizer(
+            max_size=_max_result_window(client, query_compiler._index_pattern),
+            target_bytes=target_page_bytes,
+            target_latency=target_page_latency,
+        )
+
     # Pagination with 'search_after' must have a 'sort' setting.
     # Using '_doc:asc' is the most efficient as reads documents
     # in the order that they're written on disk in Lucene.
@@ -1530,46 +2188,924 @@ def _search_yield_hits(
     # care about the hit itself for these queries.
     body.setdefault("track_total_hits", False)
 
+    state: Optional[_ScanCheckpoint] = None
+    if checkpoint is not None:
+        if is_sorted and parallel is not None and parallel > 1:
+            raise ValueError("checkpoint can't be used with a sorted parallel scan")
+        # '_doc' values are only valid within a point in time whereas
+        # '_shard_doc' values can carry on in a new one if the old expired
+        body["sort"] = [
+            {
+                ("_shard_doc" if key == "_doc" else key): order
+                for key, order in s.items()
+            }
+            if isinstance(s, dict)
+            else s
+            for s in body["sort"]
+        ]
+        state = (
+            checkpoint
+            if isinstance(checkpoint, _ScanCheckpoint)
+            else _ScanCheckpoint(checkpoint)
+        )
+        state.start(
+            scan={
+                "index": query_compiler._index_pattern,
+                "body": {k: v for k, v in body.items() if k != "size"},
+                "slices": parallel or 1,
+            }
+        )
+        hits_yielded = state.hits_yielded
+        if state.complete or (
+            max_number_of_hits is not None and hits_yielded >= max_number_of_hits
+        ):
+            return
+
+    remaining_hits = (
+        None if max_number_of_hits is None else max_number_of_hits - hits_yielded
+    )
+    completed = False
+
     try:
-        pit_id = client.open_point_in_time(
-            index=query_compiler._index_pattern, keep_alive=DEFAULT_PIT_KEEP_ALIVE
-        )["id"]
+        if (
+            state is not None
+            and state.pit_id is not None
+            and _pit_is_alive(client, state.pit_id)
+        ):
+            pit_id = state.pit_id
+        else:
+            pit_id = client.open_point_in_time(
+                index=query_compiler._index_pattern, keep_alive=DEFAULT_PIT_KEEP_ALIVE
+            )["id"]
 
         # Modify the search with the new point in time ID and keep-alive time.
         body["pit"] = {"id": pit_id, "keep_alive": DEFAULT_PIT_KEEP_ALIVE}
 
-        while max_number_of_hits is None or hits_yielded < max_number_of_hits:
-            resp = client.search(**body)
-            hits: List[Dict[str, Any]] = resp["hits"]["hits"]
-
-            # The point in time ID can change between searches so we
-            # need to keep the next search up-to-date
-            pit_id = resp.get("pit_id", pit_id)
-            body["pit"]["id"] = pit_id
-
-            # If we didn't receive any hits it means we've reached the end.
-            if not hits:
-                break
+        if parallel is not None and parallel > 1:
+            slices = _SlicedSearch(
+                client=client,
+                body=body,
+                num_slices=parallel,
+                max_number_of_hits=remaining_hits,
+                sizer=sizer,
+                search_after=state.search_after if state is not None else None,
+            )
+            try:
+                for slice_id, hits in slices.yield_hits(ordered=is_sorted):
+                    if state is not None and slice_id is not None:
+                        state.update(slice_id, hits, slices.pit_id)
+                    try:
+                        yield hits
+                    finally:
+                        # The consumer has taken the page, whether it asks
+                        # for the next one or stops here
+                        if state is not None:
+                            state.taken()
+                completed = True
+            finally:
+                pit_id = slices.close()
+            return
 
-            # Calculate which hits should be yielded from this batch
-            if max_number_of_hits is None:
-                hits_to_yield = len(hits)
-            else:
-                hits_to_yield = min(len(hits), max_number_of_hits - hits_yielded)
+        if state is not None and 0 in state.search_after:
+            body["search_after"] = state.search_after[0]
 
-            # Yield the hits we need to and then track the total number.
-            # Never yield an empty list as that makes things simpler for
-            # downstream consumers.
-            if hits and hits_to_yield > 0:
-                yield hits[:hits_to_yield]
-                hits_yielded += hits_to_yield
+        pages: Generator[Tuple[List[Dict[str, Any]], int], None, None]
+        pages = _search_pages(
+            client=client,
+            body=body,
+            max_number_of_hits=remaining_hits,
+            sizer=sizer,
+        )
+        prefetcher = None
+        if prefetch:
+            prefetcher = _Prefetcher(
+                pages=pages,
+                depth=prefetch,
+                max_bytes=(
+                    DEFAULT_PREFETCH_MAX_BYTES
+                    if prefetch_max_bytes is None
+                    else prefetch_max_bytes
+                ),
+            )
+            pages = prefetcher.pages()
 
-            # Set the 'search_after' for the next request
-            # to be the last sort value for this set of hits.
-            body["search_after"] = hits[-1]["sort"]
+        try:
+            for hits, _ in pages:
+                # Calculate which hits should be yielded from this batch
+                if max_number_of_hits is not None:
+                    hits = hits[: max_number_of_hits - hits_yielded]
+
+                # Yield the hits we need to and then track the total number.
+                # Never yield an empty list as that makes things simpler for
+                # downstream consumers.
+                if hits:
+                    hits_yielded += len(hits)
+                    if state is not None:
+                        state.update(0, hits, body["pit"]["id"])
+                    try:
+                        yield hits
+                    finally:
+                        # The consumer has taken the page, whether it asks
+                        # for the next one or stops here
+                        if state is not None:
+                            state.taken()
+
+                if (
+                    max_number_of_hits is not None
+                    and hits_yielded >= max_number_of_hits
+                ):
+                    break
+            completed = True
+        finally:
+            if prefetcher is not None:
+                prefetcher.close()
+            # The point in time ID can change between searches,
+            # '_search_pages' keeps the latest one in the body.
+            pit_id = body["pit"]["id"]
 
     finally:
+        if state is not None:
+            state.finish(pit_id, completed)
         # We want to cleanup the point in time if we allocated one
-        # to keep our memory footprint low.
-        if pit_id is not None:
+        # to keep our memory footprint low. An interrupted checkpointed
+        # scan keeps it so that it can be resumed in the same one.
+        if pit_id is not None and (state is None or completed):
             client.options(ignore_status=404).close_point_in_time(id=pit_id)
+
+
+def _search_pages(
+    client: Any,
+    body: Dict[str, Any],
+    max_number_of_hits: Optional[int],
+    sizer: Optional["_PageSizer"] = None,
+) -> Generator[Tuple[List[Dict[str, Any]], int], None, None]:
+    """
+    Pages through a point in time search with 'search_after' and yields
+    each non-empty page of hits along with the size of the response in
+    bytes (0 if unknown). 'body' is updated in place with the latest
+    point in time ID and 'search_after' value.
+
+    If a 'sizer' is given it sets the 'size' of every search.
+    """
+    hits_fetched = 0
+    while max_number_of_hits is None or hits_fetched < max_number_of_hits:
+        if sizer is not None:
+            body["size"] = sizer.size
+            if max_number_of_hits is not None:
+                body["size"] = min(body["size"], max_number_of_hits - hits_fetched)
+
+        start = time.perf_counter()
+        resp = client.search(**body)
+        latency = time.perf_counter() - start
+        # With a 'filter_path' there's no 'hits' when no hits are returned
+        hits: List[Dict[str, Any]] = resp.get("hits", {}).get("hits", [])
+
+        # The point in time ID can change between searches so we
+        # need to keep the next search up-to-date
+        body["pit"]["id"] = resp.get("pit_id", body["pit"]["id"])
+
+        # If we didn't receive any hits it means we've reached the end.
+        if not hits:
+            break
+
+        # Set the 'search_after' for the next request
+        # to be the last sort value for this set of hits.
+        body["search_after"] = hits[-1]["sort"]
+        hits_fetched += len(hits)
+
+        response_size = _response_size(resp)
+        if sizer is not None:
+            sizer.update(len(hits), response_size, latency)
+
+        yield hits, response_size
+
+
+def _pit_is_alive(client: Any, pit_id: str) -> bool:
+    """Returns whether the point in time can still be searched"""
+    try:
+        client.search(
+            pit={"id": pit_id, "keep_alive": DEFAULT_PIT_KEEP_ALIVE},
+            size=0,
+            track_total_hits=False,
+            filter_path="pit_id",
+        )
+    except NotFoundError:
+        return False
+    return True
+
+
+class _ScanCheckpoint:
+    """
+    Position of a scan, saved as JSON to 'path' so an interrupted scan can
+    carry on where it stopped.
+
+    The file holds the point in time ID, the 'search_after' values of the
+    last batch of each slice, the number of hits yielded and whether the
+    scan completed. 'scan' (the index pattern, search body and number of
+    slices) is saved too so a checkpoint isn't resumed by a different scan.
+
+    If 'auto_save' is True the position is saved once the consumer has
+    taken a batch, i.e. asked for the next one or closed the scan. Otherwise
+    the consumer calls save() once it has processed a batch, e.g. written
+    it to a file, along with the size of its 'output'.
+
+    A resumed scan reuses the point in time if it hasn't expired, otherwise
+    it opens a new one and carries on from the '_shard_doc' sort values. In
+    a new point in time documents changed since the checkpoint may be
+    missed or returned twice.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str, auto_save: bool = True) -> None:
+        self.path = path
+        self.auto_save = auto_save
+        self.pit_id: Optional[str] = None
+        self.search_after: Dict[int, List[Any]] = {}
+        self.hits_yielded = 0
+        self.complete = False
+        # Size in bytes of the consumer's output up to the saved position
+        self.output: Optional[int] = None
+        self._scan: Optional[Dict[str, Any]] = None
+        self._saved_scan: Optional[Dict[str, Any]] = None
+
+        self.exists = os.path.exists(path)
+        if self.exists:
+            with open(path) as f:
+                state = json.load(f)
+            if state.get("version") != self.VERSION:
+                raise ValueError(
+                    f"Checkpoint {path!r} was saved by a different scan, "
+                    f"remove it to start a new one"
+                )
+            self._saved_scan = state["scan"]
+            self.pit_id = state["pit_id"]
+            self.search_after = {
+                int(slice_id): search_after
+                for slice_id, search_after in state["search_after"].items()
+            }
+            self.hits_yielded = state["hits_yielded"]
+            self.complete = state["complete"]
+            self.output = state.get("output")
+
+    def start(self, scan: Dict[str, Any]) -> None:
+        # Compare in the form it is read back
+        self._scan = json.loads(json.dumps(scan))
+        if self.exists and self._saved_scan != self._scan:
+            raise ValueError(
+                f"Checkpoint {self.path!r} was saved by a different scan, "
+                f"remove it to start a new one"
+            )
+
+    def update(self, slice_id: int, hits: List[Dict[str, Any]], pit_id: str) -> None:
+        self.pit_id = pit_id
+        self.search_after[slice_id] = hits[-1]["sort"]
+        self.hits_yielded += len(hits)
+
+    def taken(self) -> None:
+        if self.auto_save:
+            self.save()
+
+    def finish(self, pit_id: Optional[str], complete: bool) -> None:
+        self.pit_id = pit_id
+        self.complete = complete
+        # The consumer saves its own progress until the scan completes
+        if self.auto_save or complete:
+            self.save()
+
+    def save(self, output: Optional[int] = None) -> None:
+        if output is not None:
+            self.output = output
+        state = {
+            "version": self.VERSION,
+            "scan": self._scan,
+            "pit_id": self.pit_id,
+            "search_after": {
+                str(slice_id): search_after
+                for slice_id, search_after in self.search_after.items()
+            },
+            "hits_yielded": self.hits_yielded,
+            "complete": self.complete,
+            "output": self.output,
+        }
+        # Write and rename so a crash never leaves a partial checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+def _torch_worker_shard() -> Optional[Tuple[int, int]]:
+    """
+    Returns the (id, num_workers) of the current PyTorch DataLoader worker
+    so each worker scans its own slice, or None outside of a worker.
+    """
+    # Only look for workers if PyTorch is in use, importing it is slow
+    if "torch" not in sys.modules:
+        return None
+    worker_info = sys.modules["torch"].utils.data.get_worker_info()
+    if worker_info is None:
+        return None
+    return int(worker_info.id), int(worker_info.num_workers)
+
+
+def _rebatch_pandas(
+    dfs: Iterable[pd.DataFrame], batch_size: int
+) -> Generator[pd.DataFrame, None, None]:
+    """Regroups DataFrames into DataFrames of 'batch_size' rows"""
+    pending: List[pd.DataFrame] = []
+    num_pending = 0
+    for df in dfs:
+        pending.append(df)
+        num_pending += len(df)
+        if num_pending < batch_size:
+            continue
+
+        df = pd.concat(pending) if len(pending) > 1 else pending[0]
+        offset = 0
+        while num_pending - offset >= batch_size:
+            yield df.iloc[offset : offset + batch_size]
+            offset += batch_size
+        pending = [df.iloc[offset:]]
+        num_pending -= offset
+
+    if num_pending:
+        yield pd.concat(pending) if len(pending) > 1 else pending[0]
+
+
+def _rebatch_numpy(
+    dfs: Iterable[pd.DataFrame], batch_size: int
+) -> Generator["np.ndarray[Any, Any]", None, None]:
+    """
+    Regroups DataFrames into 2D arrays of 'batch_size' rows.
+
+    Each batch is allocated once and filled column by column from the
+    pages, rather than concatenating pages and converting the result.
+    A new array is allocated for each batch because consumers such as
+    PyTorch's DataLoader may still hold the previous one.
+    """
+    buf: Optional["np.ndarray[Any, Any]"] = None
+    num_rows = 0
+    for df in dfs:
+        columns = [df[name].to_numpy() for name in df.columns]
+        dtype = _result_type([values.dtype for values in columns])
+        offset = 0
+        while offset < len(df):
+            if buf is None:
+                buf = np.empty((batch_size, len(columns)), dtype=dtype)
+            elif _result_type([buf.dtype, dtype]) != buf.dtype:
+                # e.g. a later page has missing values in an integer column
+                buf = buf.astype(_result_type([buf.dtype, dtype]))
+
+            n = min(batch_size - num_rows, len(df) - offset)
+            for i, values in enumerate(columns):
+                buf[num_rows : num_rows + n, i] = values[offset : offset + n]
+            num_rows += n
+            offset += n
+            if num_rows == batch_size:
+                yield buf
+                buf = None
+                num_rows = 0
+
+    if buf is not None and num_rows:
+        yield buf[:num_rows]
+
+
+def _result_type(dtypes: List["np.dtype[Any]"]) -> "np.dtype[Any]":
+    try:
+        return np.result_type(*dtypes) if dtypes else np.dtype(np.float64)
+    except TypeError:
+        # e.g. datetimes mixed with numbers
+        return np.dtype(object)
+
+
+def _max_result_window(client: Any, index_pattern: str) -> int:
+    """
+    Returns the smallest 'index.max_result_window' of the indices matching
+    'index_pattern', or the Elasticsearch default if it can't be read.
+    """
+    resp = client.options(ignore_status=(403, 404)).indices.get_settings(
+        index=index_pattern,
+        name="index.max_result_window",
+        include_defaults=True,
+        flat_settings=True,
+    )
+    windows = []
+    for settings in resp.values():
+        if not isinstance(settings, dict):
+            continue
+        window = settings.get("settings", {}).get(
+            "index.max_result_window",
+            settings.get("defaults", {}).get("index.max_result_window"),
+        )
+        if window is not None:
+            windows.append(int(window))
+    return min(windows, default=DEFAULT_MAX_RESULT_WINDOW)
+
+
+class _PageSizer:
+    """
+    Chooses the 'size' of successive searches from the responses so far.
+
+    After each page the size is set so the next response is about
+    'target_bytes' long and takes about 'target_latency' seconds, based on
+    the bytes and time per hit of the last page. The size at most doubles
+    from one page to the next and stays within [1, max_size]. Scans start
+    with a small page so wide documents don't cause a large first response.
+    """
+
+    INITIAL_SIZE = 100
+    MAX_GROWTH = 2
+
+    def __init__(
+        self,
+        max_size: int,
+        target_bytes: Optional[int] = None,
+        target_latency: Optional[float] = None,
+    ) -> None:
+        self._max_size = max_size
+        self._target_bytes = target_bytes
+        self._target_latency = target_latency
+        self.size = min(self.INITIAL_SIZE, max_size)
+
+    def update(self, num_hits: int, num_bytes: int, latency: float) -> None:
+        if num_hits == 0:
+            return
+
+        sizes = [float(self.size * self.MAX_GROWTH)]
+        # The response size is unknown (0) if the response was chunked
+        if self._target_bytes is not None and num_bytes > 0:
+            sizes.append(self._target_bytes * num_hits / num_bytes)
+        if self._target_latency is not None and latency > 0:
+            sizes.append(self._target_latency * num_hits / latency)
+
+        self.size = max(1, min(self._max_size, int(min(sizes))))
+
+
+def _compact_dtypes(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    """
+    Converts the columns of a page to the compact dtypes in 'dtypes' where
+    the values allow it. Integer columns with missing values (which pandas
+    stores as float64) and keyword columns with multiple values per
+    document (lists, which can't be categories) are left unchanged.
+    """
+    converted = {}
+    for column, dtype in dtypes.items():
+        if column not in df:
+            continue
+        values = df[column]
+        kind = values.dtype.kind
+        if dtype == "category":
+            if kind != "O":
+                continue
+            try:
+                converted[column] = values.astype(dtype)
+            except TypeError:
+                # Unhashable values e.g. lists
+                pass
+        elif (dtype.startswith("int") and kind in "iu") or (
+            dtype.startswith("float") and kind in "iuf"
+        ):
+            converted[column] = values.astype(dtype)
+
+    return df.assign(**converted) if converted else df
+
+
+def _union_categories(df_list: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """
+    Gives categorical columns the same categories in every page. pd.concat()
+    only keeps a categorical dtype if the categories of all pages are equal.
+    """
+    dtypes = {}
+    for column in df_list[0].columns:
+        dtype = _union_categorical_dtype([df[column] for df in df_list])
+        if dtype is not None:
+            dtypes[column] = dtype
+
+    if not dtypes:
+        return df_list
+    return [df.astype(dtypes) for df in df_list]
+
+
+def _union_categorical_dtype(pages: List[pd.Series]) -> Optional[pd.CategoricalDtype]:
+    """
+    Returns the categorical dtype with the categories of all pages
+    or None if any of the pages isn't categorical.
+    """
+    if not all(isinstance(page.dtype, pd.CategoricalDtype) for page in pages):
+        return None
+
+    categories = list(
+        dict.fromkeys(
+            itertools.chain.from_iterable(page.cat.categories for page in pages)
+        )
+    )
+    try:
+        categories.sort()
+    except TypeError:
+        # Mixed types e.g. strings and numbers
+        pass
+    return pd.CategoricalDtype(categories)
+
+
+class _FrameAssembler:
+    """
+    Assembles the pages of a scan into one DataFrame without a final
+    pd.concat() copy. Column values are written into arrays preallocated
+    for the expected number of rows (grown if more rows arrive), which
+    become the columns of the DataFrame.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._num_rows = 0
+        self._columns: Optional[pd.Index] = None
+        self._buffers: List[_ColumnBuffer] = []
+        self._index = _ColumnBuffer(capacity)
+        self._index_name: Any = None
+
+    def append(self, df: pd.DataFrame) -> None:
+        if self._columns is None:
+            self._columns = df.columns
+            self._buffers = [_ColumnBuffer(self._capacity) for _ in df.columns]
+            self._index_name = df.index.name
+
+        # Columns by position as display names aren't necessarily unique
+        for buffer, (_, values) in zip(self._buffers, df.items()):
+            buffer.append(values, self._num_rows)
+        self._index.append(df.index.to_series(), self._num_rows)
+        self._num_rows += len(df)
+
+    @property
+    def num_rows(self) -> int:
+        return self._num_rows
+
+    def to_pandas(self) -> pd.DataFrame:
+        num_rows = self._num_rows
+        df = pd.DataFrame(
+            {i: buffer.values(num_rows) for i, buffer in enumerate(self._buffers)},
+            index=pd.Index(self._index.values(num_rows), name=self._index_name),
+            copy=False,
+        )
+        df.columns = self._columns
+        return df
+
+
+class _ColumnBuffer:
+    """
+    Values of one column of a _FrameAssembler. Values with a numpy dtype are
+    copied into a preallocated array, widened to the common dtype of the pages
+    (as pd.concat() would) when a page has a different dtype. Values with
+    extension dtypes (e.g. category or timezone aware datetimes) are kept per
+    page and concatenated at the end.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._array: Optional["np.ndarray[Any, Any]"] = None
+        self._pages: Optional[List[pd.Series]] = None
+
+    def append(self, values: pd.Series, start: int) -> None:
+        end = start + len(values)
+
+        if self._pages is None and isinstance(values.dtype, np.dtype):
+            array = self._array
+            if array is None:
+                array = np.empty(max(self._capacity, end), dtype=values.dtype)
+            elif array.dtype != values.dtype:
+                dtype = find_common_type([array.dtype, values.dtype])
+                if dtype != array.dtype:
+                    array = self._resize(array, len(array), start, dtype)
+                values = values.astype(dtype)
+            if end > len(array):
+                array = self._resize(
+                    array, max(end, len(array) + len(array) // 2), start, array.dtype
+                )
+            array[start:end] = values.to_numpy()
+            self._array = array
+        else:
+            if self._pages is None:
+                self._pages = []
+                if self._array is not None:
+                    self._pages.append(pd.Series(self._array[:start]))
+                    self._array = None
+            self._pages.append(values)
+
+    def values(self, num_rows: int) -> Any:
+        if self._pages is not None:
+            dtype = _union_categorical_dtype(self._pages)
+            pages = (
+                self._pages
+                if dtype is None
+                else [page.astype(dtype) for page in self._pages]
+            )
+            return pd.concat(pages, ignore_index=True).array
+        if self._array is None:
+            return np.empty(0, dtype=object)
+        if len(self._array) == num_rows:
+            return self._array
+        # Fewer rows than expected, don't hold on to the unused rows
+        return self._array[:num_rows].copy()
+
+    @staticmethod
+    def _resize(
+        array: "np.ndarray[Any, Any]",
+        length: int,
+        num_rows: int,
+        dtype: "np.dtype[Any]",
+    ) -> "np.ndarray[Any, Any]":
+        resized = np.empty(length, dtype=dtype)
+        # Via pandas so datetimes widened to object become Timestamps
+        resized[:num_rows] = pd.Series(array[:num_rows], copy=False).astype(dtype)
+        return resized
+
+
+def _response_size(resp: Any) -> int:
+    """Returns the Content-Length of a client response or 0 if it isn't known"""
+    try:
+        return int(resp.meta.headers.get("content-length", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+class _Prefetcher:
+    """
+    Drains a page generator in a background thread so that the next
+    search is in flight while the consumer processes the current page.
+
+    At most 'depth' pages and 'max_bytes' response bytes are buffered,
+    although a single page is always accepted so that a page larger
+    than 'max_bytes' can't stall the scan.
+    """
+
+    def __init__(
+        self,
+        pages: Generator[Tuple[List[Dict[str, Any]], int], None, None],
+        depth: int,
+        max_bytes: int,
+    ) -> None:
+        self._pages = pages
+        self._depth = depth
+        self._max_bytes = max_bytes
+        self._buffer: Deque[Tuple[List[Dict[str, Any]], int]] = deque()
+        self._buffered_bytes = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._stop = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def pages(self) -> Generator[Tuple[List[Dict[str, Any]], int], None, None]:
+        self._thread = threading.Thread(
+            target=self._fetch, name="eland-prefetch", daemon=True
+        )
+        self._thread.start()
+
+        while True:
+            with self._cond:
+                while not self._buffer and not self._done:
+                    self._cond.wait()
+                if not self._buffer:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                page = self._buffer.popleft()
+                self._buffered_bytes -= page[1]
+                self._cond.notify_all()
+            yield page
+
+    def close(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _fetch(self) -> None:
+        try:
+            for page in self._pages:
+                with self._cond:
+                    while (
+                        not self._stop
+                        and self._buffer
+                        and (
+                            len(self._buffer) >= self._depth
+                            or self._buffered_bytes + page[1] > self._max_bytes
+                        )
+                    ):
+                        self._cond.wait()
+                    if self._stop:
+                        break
+                    self._buffer.append(page)
+                    self._buffered_bytes += page[1]
+                    self._cond.notify_all()
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._pages.close()
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+
+def _sort_directions(sort: Any) -> List[bool]:
+    """Whether each key of a search's 'sort' is in descending order"""
+    descending = []
+    for key in sort if isinstance(sort, list) else [sort]:
+        if isinstance(key, dict):
+            field, order = next(iter(key.items()))
+            if isinstance(order, dict):
+                order = order.get("order")
+        else:
+            field, order = key, None
+        # '_score' is the only key sorted in descending order by default
+        descending.append(order == "desc" or (order is None and field == "_score"))
+    return descending
+
+
+class _Descending:
+    """Sort value that compares in reverse order"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return bool(other.value < self.value)
+
+
+class _SlicedSearch:
+    """
+    Runs a sliced point in time search with one thread per slice.
+
+    Each slice pages through its share of the documents with 'search_after'
+    and hands batches of hits to the consuming generator through a bounded
+    queue so that at most a couple of batches per slice are held in memory.
+    """
+
+    _DONE = object()
+    _QUEUE_TIMEOUT = 0.1
+
+    def __init__(
+        self,
+        client: Any,
+        body: Dict[str, Any],
+        num_slices: int,
+        max_number_of_hits: Optional[int],
+        sizer: Optional[_PageSizer] = None,
+        search_after: Optional[Dict[int, List[Any]]] = None,
+    ) -> None:
+        self._client = client
+        self._body = body
+        self._num_slices = num_slices
+        self._max_number_of_hits = max_number_of_hits
+        self._sizer = sizer
+        self._search_after = search_after or {}
+        self._pit_id: str = body["pit"]["id"]
+        # Slices update the point in time ID concurrently
+        self._pit_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def yield_hits(
+        self, ordered: bool
+    ) -> Generator[Tuple[Optional[int], List[Dict[str, Any]]], None, None]:
+        """
+        Yields batches of hits along with the ID of the slice they came
+        from, or None if 'ordered' as batches then mix slices.
+        """
+        queues: List["queue.Queue[Any]"]
+        if ordered:
+            queues = [queue.Queue(maxsize=2) for _ in range(self._num_slices)]
+        else:
+            shared_queue: "queue.Queue[Any]" = queue.Queue(maxsize=2 * self._num_slices)
+            queues = [shared_queue] * self._num_slices
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._num_slices, thread_name_prefix="eland-slice"
+        )
+        for slice_id, slice_queue in enumerate(queues):
+            self._executor.submit(self._search_slice, slice_id, slice_queue)
+
+        batches: Iterator[Tuple[Optional[int], List[Dict[str, Any]]]]
+        if ordered:
+            batches = ((None, batch) for batch in self._merge_ordered(queues))
+        else:
+            batches = self._drain(queues[0])
+
+        hits_yielded = 0
+        for batch_slice_id, hits in batches:
+            if self._max_number_of_hits is not None:
+                hits = hits[: self._max_number_of_hits - hits_yielded]
+            if hits:
+                yield batch_slice_id, hits
+                hits_yielded += len(hits)
+            if (
+                self._max_number_of_hits is not None
+                and hits_yielded >= self._max_number_of_hits
+            ):
+                break
+
+    def close(self) -> str:
+        """Stops all slices and returns the latest point in time ID"""
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        return self.pit_id
+
+    @property
+    def pit_id(self) -> str:
+        """The latest point in time ID"""
+        with self._pit_lock:
+            return self._pit_id
+
+    def _set_pit_id(self, pit_id: str) -> None:
+        with self._pit_lock:
+            self._pit_id = pit_id
+
+    def _search_slice(self, slice_id: int, out: "queue.Queue[Any]") -> None:
+        body = self._body.copy()
+        body["pit"] = body["pit"].copy()
+        body["slice"] = {"id": slice_id, "max": self._num_slices}
+        if slice_id in self._search_after:
+            body["search_after"] = self._search_after[slice_id]
+        if self._max_number_of_hits is not None:
+            body["size"] = min(body["size"], self._max_number_of_hits)
+
+        # Each slice adapts its own page size
+        sizer = copy.copy(self._sizer)
+
+        try:
+            if not self._stop.is_set():
+                for hits, _ in _search_pages(
+                    client=self._client,
+                    body=body,
+                    max_number_of_hits=self._max_number_of_hits,
+                    sizer=sizer,
+                ):
+                    self._set_pit_id(body["pit"]["id"])
+                    self._put(out, (slice_id, hits))
+                    if self._stop.is_set():
+                        break
+            self._set_pit_id(body["pit"]["id"])
+        except BaseException as e:
+            self._put(out, e)
+        finally:
+            self._put(out, self._DONE)
+
+    def _put(self, out: "queue.Queue[Any]", item: Any) -> None:
+        # Don't block forever if the consumer has gone away
+        while not self._stop.is_set():
+            try:
+                out.put(item, timeout=self._QUEUE_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def _drain(
+        self, out: "queue.Queue[Any]", num_producers: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        remaining = self._num_slices if num_producers is None else num_producers
+        while remaining:
+            item = out.get()
+            if item is self._DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+
+    def _merge_ordered(
+        self, queues: List["queue.Queue[Any]"]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # Each slice is sorted so a k-way merge on the
+        # 'sort' values keeps the requested global order.
+        descending = _sort_directions(self._body["sort"])
+
+        def sort_key(hit: Dict[str, Any]) -> Tuple[Any, ...]:
+            # Values past the requested sort, e.g. the '_shard_doc'
+            # tiebreaker added to point in time searches, are ascending
+            return tuple(
+                _Descending(value) if i < len(descending) and descending[i] else value
+                for i, value in enumerate(hit["sort"])
+            )
+
+        def slice_hits(out: "queue.Queue[Any]") -> Iterator[Dict[str, Any]]:
+            for _, batch in self._drain(out, num_producers=1):
+                yield from batch
+
+        merged = heapq.merge(*(slice_hits(out) for out in queues), key=sort_key)
+
+        batch_size: int = self._body["size"]
+        batch: List[Dict[str, Any]] = []
+        for hit in merged:
+            batch.append(hit)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -145,6 +145,22 @@ class Query:
         agg = {func: {"field": field}}
         self._aggs[name] = agg
 
+    def exists_agg(self, name: str, field: str) -> None:
+        """
+        Add filter agg counting the documents where the field exists e.g
+
+        "aggs": {
+            "name": {
+                "filter": {
+                    "exists": {
+                        "field": "AvgTicketPrice"
+                    }
+                }
+            }
+        }
+        """
+        self._aggs[name] = {"filter": {"exists": {"field": field}}}
+
     def percentile_agg(self, name: str, field: str, percents: List[float]) -> None:
         """
 
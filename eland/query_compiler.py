@@ -16,6 +16,7 @@
 #  under the License.
 
 import copy
+import os
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -24,6 +25,7 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     TextIO,
     Tuple,
     Union,
@@ -32,13 +34,19 @@ from typing import (
 import numpy as np
 import pandas as pd  # type: ignore
 
-from eland.common import elasticsearch_date_to_pandas_date, ensure_es_client
+from eland.common import (
+    AsyncClientAdapter,
+    elasticsearch_date_to_pandas_date,
+    elasticsearch_dates_to_pandas_dates,
+    ensure_es_client,
+)
 from eland.field_mappings import FieldMappings
 from eland.filter import BooleanFilter, QueryFilter
 from eland.index import Index
 from eland.operations import Operations
 
 if TYPE_CHECKING:
+    import pyarrow as pa  # type: ignore
     from elasticsearch import Elasticsearch
 
     from eland.arithmetics import ArithmeticSeries
@@ -78,7 +86,7 @@ class QueryCompiler:
     def __init__(
         self,
         client: Optional[
-            Union[str, List[str], Tuple[str, ...], "Elasticsearch"]
+            Union[str, List[str], Tuple[str, ...], "Elasticsearch", AsyncClientAdapter]
         ] = None,
         index_pattern: Optional[str] = None,
         display_names=None,
@@ -93,7 +101,12 @@ class QueryCompiler:
             self._operations: "Operations" = copy.deepcopy(to_copy._operations)
             self._mappings: FieldMappings = copy.deepcopy(to_copy._mappings)
         else:
-            self._client = ensure_es_client(client)
+            # DataFrames created with eland.aio.read_es() use an AsyncClientAdapter
+            self._client = (
+                client
+                if isinstance(client, AsyncClientAdapter)
+                else ensure_es_client(client)
+            )
             self._index_pattern = index_pattern
             # Get and persist mappings, this allows us to correctly
             # map returned types from Elasticsearch to pandas datatypes
@@ -144,12 +157,16 @@ class QueryCompiler:
     def _es_results_to_pandas(
         self,
         results: List[Dict[str, Any]],
+        decoder: Optional["HitDecoder"] = None,
     ) -> "pd.Dataframe":
         """
         Parameters
         ----------
         results: List[Dict[str, Any]]
             Elasticsearch results from self.client.search
+        decoder: HitDecoder, optional
+            Decoder compiled from the current mappings. Pass the same decoder
+            for every page of a scan to avoid recompiling the flattening plan.
 
         Returns
         -------
@@ -236,118 +253,17 @@ class QueryCompiler:
         if not results:
             return self._empty_pd_ef()
 
-        # This is one of the most performance critical areas of eland, and it repeatedly calls
-        # self._mappings.field_name_pd_dtype and self._mappings.date_field_format
-        # therefore create a simple cache for this data
-        field_mapping_cache = FieldMappingCache(self._mappings)
-
-        rows = []
-        index = []
-
-        i = 0
-        for i, hit in enumerate(results, 1):
-            if "_source" in hit:
-                row = hit["_source"]
-            else:
-                row = {}
-
-            # script_fields appear in 'fields'
-            if "fields" in hit:
-                fields = hit["fields"]
-                for key, value in fields.items():
-                    row[key] = value
-
-            # get index value - can be _id or can be field value in source
-            if self._index.is_source_field:
-                index_field = row[self._index.es_index_field]
-            else:
-                index_field = hit[self._index.es_index_field]
-            index.append(index_field)
-
-            # flatten row to map correctly to 2D DataFrame
-            rows.append(self._flatten_dict(row, field_mapping_cache))
-
-        # Create pandas DataFrame
-        df = pd.DataFrame(data=rows, index=index)
-
-        # _source may not contain all field_names in the mapping
-        # therefore, fill in missing field_names
-        # (note this returns self.field_names NOT IN df.columns)
-        missing_field_names = list(
-            set(self.get_field_names(include_scripted_fields=True)) - set(df.columns)
-        )
-
-        for missing in missing_field_names:
-            pd_dtype = self._mappings.field_name_pd_dtype(missing)
-            df[missing] = pd.Series(dtype=pd_dtype)
-
-        # Rename columns
-        df.rename(columns=self._mappings.get_renames(), inplace=True)
-
-        # Sort columns in mapping order
-        if len(self.columns) > 1:
-            df = df[self.columns]
-
-        return df
-
-    def _flatten_dict(self, y, field_mapping_cache: "FieldMappingCache"):
-        out = {}
-
-        def flatten(x, name=""):
-            # We flatten into source fields e.g. if type=geo_point
-            # location: {lat=52.38, lon=4.90}
-            if name == "":
-                is_source_field = False
-                pd_dtype = "object"
-            else:
-                try:
-                    pd_dtype = field_mapping_cache.field_name_pd_dtype(name[:-1])
-                    is_source_field = True
-                except KeyError:
-                    is_source_field = False
-                    pd_dtype = "object"
-
-            if not is_source_field and isinstance(x, dict):
-                for a in x:
-                    flatten(x[a], name + a + ".")
-            elif not is_source_field and isinstance(x, list):
-                for a in x:
-                    flatten(a, name)
-            elif is_source_field:  # only print source fields from mappings
-                # (TODO - not so efficient for large number of fields and filtered mapping)
-                field_name = name[:-1]
-
-                # Coerce types - for now just datetime
-                if pd_dtype == "datetime64[ns]":
-                    x = elasticsearch_date_to_pandas_date(
-                        x, field_mapping_cache.date_field_format(field_name)
-                    )
-
-                # Elasticsearch can have multiple values for a field. These are represented as lists, so
-                # create lists for this pivot (see notes above)
-                if field_name in out:
-                    if not isinstance(out[field_name], list):
-                        field_as_list = [out[field_name]]
-                        out[field_name] = field_as_list
-                    out[field_name].append(x)
-                else:
-                    out[field_name] = x
-            else:
-                # Script fields end up here
-
-                # Elasticsearch returns 'Infinity' as a string for np.inf values.
-                # Map this to a numeric value to avoid this whole Series being classed as an object
-                # TODO - create a lookup for script fields and dtypes to only map 'Infinity'
-                #        if the field is numeric. This implementation will currently map
-                #        any script field with "Infinity" as a string to np.inf
-                if x == "Infinity":
-                    out[name[:-1]] = np.inf
-                else:
-                    out[name[:-1]] = x
+        # This is one of the most performance critical areas of eland so the
+        # flattening plan is compiled once per scan and reused for every page.
+        if decoder is None:
+            decoder = self._hit_decoder()
 
-        flatten(y)
+        return decoder.decode(results)
 
-        return out
+    def _hit_decoder(
+        self, doc_value_fields: Optional[List[str]] = None
+    ) -> "HitDecoder":
+        return HitDecoder(self._mappings, self._index, doc_value_fields)
 
     def _index_count(self) -> int:
         """
@@ -388,6 +304,11 @@ class QueryCompiler:
             result._mappings.rename(renames)
             return result
 
+    def search_repr(
+        self, num_rows: int
+    ) -> Optional[Tuple[int, pd.DataFrame, pd.DataFrame]]:
+        return self._operations.search_repr(self, num_rows)
+
     def head(self, n: int) -> "QueryCompiler":
         result = self.copy()
 
@@ -497,13 +418,35 @@ class QueryCompiler:
         return self._update_query(QueryFilter(query))
 
     # To/From Pandas
-    def to_pandas(self, show_progress: bool = False):
+    def to_pandas(
+        self,
+        show_progress: bool = False,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        compact_dtypes: bool = False,
+        preallocate: bool = False,
+    ):
         """Converts Eland DataFrame to Pandas DataFrame.
 
         Returns:
             Pandas DataFrame
         """
-        return self._operations.to_pandas(self, show_progress)
+        return self._operations.to_pandas(
+            self,
+            show_progress,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+            compact_dtypes=compact_dtypes,
+            preallocate=preallocate,
+        )
 
     # To CSV
     def to_csv(self, **kwargs) -> Optional[str]:
@@ -514,8 +457,123 @@ class QueryCompiler:
         """
         return self._operations.to_csv(self, **kwargs)
 
-    def search_yield_pandas_dataframes(self) -> Generator["pd.DataFrame", None, None]:
-        return self._operations.search_yield_pandas_dataframes(self)
+    def search_yield_pandas_dataframes(
+        self,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        checkpoint: Optional[str] = None,
+    ) -> Generator["pd.DataFrame", None, None]:
+        return self._operations.search_yield_pandas_dataframes(
+            self,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+            checkpoint=checkpoint,
+        )
+
+    # To Arrow
+    def to_arrow(
+        self,
+        index: bool = True,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+    ) -> "pa.Table":
+        return self._operations.to_arrow(
+            self,
+            index=index,
+            schema_overrides=schema_overrides,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+        )
+
+    def to_parquet(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        compression: Optional[str] = "snappy",
+        index: bool = True,
+        row_group_size: Optional[int] = None,
+        max_file_size: Optional[int] = None,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+    ) -> None:
+        return self._operations.to_parquet(
+            self,
+            path,
+            compression=compression,
+            index=index,
+            row_group_size=row_group_size,
+            max_file_size=max_file_size,
+            schema_overrides=schema_overrides,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+        )
+
+    def search_yield_arrow_batches(
+        self,
+        index: bool = True,
+        schema_overrides: Optional[Dict[str, "pa.DataType"]] = None,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        checkpoint: Optional[str] = None,
+    ) -> Generator["pa.RecordBatch", None, None]:
+        return self._operations.search_yield_arrow_batches(
+            self,
+            index=index,
+            schema_overrides=schema_overrides,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+            checkpoint=checkpoint,
+        )
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        as_: str = "pandas",
+        shuffle_seed: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        doc_values: bool = False,
+    ) -> Generator[Any, None, None]:
+        return self._operations.iter_batches(
+            self,
+            batch_size=batch_size,
+            as_=as_,
+            shuffle_seed=shuffle_seed,
+            prefetch=prefetch,
+            doc_values=doc_values,
+        )
 
     # __getitem__ methods
     def getitem_column_array(self, key, numeric=False):
@@ -782,36 +840,214 @@ class QueryCompiler:
         return aggregatable_field_name
 
 
-class FieldMappingCache:
+class HitDecoder:
     """
-    Very simple dict cache for field mappings. This improves performance > 3 times on large datasets as
-    DataFrame access is slower than dict access.
+    Columnar decoder for search hits.
+
+    The flattening plan (which dotted paths are mapped source fields, their pandas
+    dtypes and date formats, renames and column order) is compiled once from
+    FieldMappings. Values are then appended straight into per-column buffers so
+    no intermediate list of row dicts is built before creating the DataFrame.
+
+    Fields in 'doc_value_fields' are read from the hit's 'fields' (as requested
+    by docvalue_fields) rather than '_source'.
     """
 
-    def __init__(self, mappings: "FieldMappings") -> None:
-        self._mappings = mappings
+    def __init__(
+        self,
+        mappings: "FieldMappings",
+        index: "Index",
+        doc_value_fields: Optional[List[str]] = None,
+    ) -> None:
+        capabilities = mappings._mappings_capabilities
+
+        # es_field_name -> (pd_dtype, es_date_format) for mapped (non-scripted) fields
+        self._source_fields: Dict[str, Tuple[str, Optional[str]]] = {}
+        for es_field_name, pd_dtype, es_date_format, is_scripted in zip(
+            capabilities.es_field_name,
+            capabilities.pd_dtype,
+            capabilities.es_date_format,
+            capabilities.is_scripted,
+        ):
+            if not is_scripted:
+                self._source_fields[es_field_name] = (pd_dtype, es_date_format)
+
+        self._field_pd_dtypes: List[Tuple[str, str]] = list(
+            zip(capabilities.es_field_name, capabilities.pd_dtype)
+        )
+        self._renames: Dict[str, str] = mappings.get_renames()
+        self._columns = pd.Index(mappings.display_names)
+        # display_name -> es_field_name
+        self._display_fields: Dict[str, str] = dict(
+            zip(capabilities.index, capabilities.es_field_name)
+        )
+
+        self._index_field = index.es_index_field
+        self._index_is_source_field = index.is_source_field
+
+        # Doc values are already typed, only dates need converting
+        self._doc_value_fields: Set[str] = set(doc_value_fields or ())
+        self._doc_value_dates: Dict[str, Optional[str]] = {
+            es_field_name: self._source_fields[es_field_name][1]
+            for es_field_name in self._doc_value_fields
+            if self._source_fields[es_field_name][0] == "datetime64[ns]"
+        }
+
+    def decode(self, hits: List[Dict[str, Any]]) -> pd.DataFrame:
+        columns, index = self._decode_columns(hits)
+
+        df = pd.DataFrame(data=columns, index=index)
+
+        # _source may not contain all field_names in the mapping
+        # therefore, fill in missing field_names
+        for es_field_name, pd_dtype in self._field_pd_dtypes:
+            if es_field_name not in columns:
+                df[es_field_name] = pd.Series(dtype=pd_dtype)
 
-        self._field_name_pd_dtype: Dict[str, str] = dict()
-        self._date_field_format: Dict[str, str] = dict()
+        # Rename columns
+        if self._renames:
+            df.rename(columns=self._renames, inplace=True)
 
-    def field_name_pd_dtype(self, es_field_name: str) -> str:
-        if es_field_name in self._field_name_pd_dtype:
-            return self._field_name_pd_dtype[es_field_name]
+        # Sort columns in mapping order
+        if len(self._columns) > 1:
+            df = df[self._columns]
 
-        pd_dtype = self._mappings.field_name_pd_dtype(es_field_name)
+        return df
+
+    def decode_arrow(
+        self, hits: List[Dict[str, Any]], schema: "pa.Schema"
+    ) -> "pa.RecordBatch":
+        """
+        Decodes hits straight into a pyarrow.RecordBatch with the given schema
+        (see eland.arrow.arrow_schema) without building a pandas.DataFrame.
+        """
+        from eland.arrow import to_record_batch
+
+        es_columns, index = self._decode_columns(hits)
+        columns = {
+            display_name: es_columns.get(es_field_name)
+            for display_name, es_field_name in self._display_fields.items()
+        }
+        columns.setdefault(self._index_field, index)
+        return to_record_batch(schema, columns, len(hits))
+
+    def _decode_columns(
+        self, hits: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], List[Any]]:
+        """Returns the decoded values per es_field_name and the index values"""
+        num_hits = len(hits)
+
+        # Per-column buffers, pre-filled with NaN for documents missing a value
+        # and the last row written per column to detect multi-valued fields.
+        columns: Dict[str, Any] = {}
+        last_row: Dict[str, int] = {}
+        index: List[Any] = [None] * num_hits
+
+        # Date values are collected raw and converted once per column below
+        date_columns: Dict[str, Optional[str]] = {}
+        multi_valued_columns: Set[str] = set()
+
+        source_fields = self._source_fields
+        doc_value_fields = self._doc_value_fields
+        doc_value_dates = self._doc_value_dates
+
+        def add_value(name: str, value: Any, row: int, multi_value: bool) -> None:
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = [np.nan] * num_hits
+            elif multi_value and last_row[name] == row:
+                # Elasticsearch can have multiple values for a field. These are
+                # represented as lists, so create lists for this pivot.
+                existing = column[row]
+                multi_valued_columns.add(name)
+                if not isinstance(existing, list):
+                    column[row] = existing = [existing]
+                existing.append(value)
+                return
+            column[row] = value
+            last_row[name] = row
+
+        def flatten(x: Any, name: str, row: int) -> None:
+            # We flatten into source fields e.g. if type=geo_point
+            # location: {lat=52.38, lon=4.90}
+            field = source_fields.get(name) if name else None
+            if field is not None:
+                pd_dtype, es_date_format = field
+                # Coerce types - for now just datetime
+                if pd_dtype == "datetime64[ns]":
+                    date_columns[name] = es_date_format
+                add_value(name, x, row, multi_value=True)
+            elif isinstance(x, dict):
+                prefix = f"{name}." if name else ""
+                for key, value in x.items():
+                    flatten(value, prefix + key, row)
+            elif isinstance(x, list):
+                for value in x:
+                    flatten(value, name, row)
+            else:
+                # Script fields end up here
 
-        # cache this
-        self._field_name_pd_dtype[es_field_name] = pd_dtype
+                # Elasticsearch returns 'Infinity' as a string for np.inf values.
+                # Map this to a numeric value to avoid this whole Series being classed as an object
+                add_value(
+                    name, np.inf if x == "Infinity" else x, row, multi_value=False
+                )
 
-        return pd_dtype
+        def add_doc_values(fields: Dict[str, Any], row: int) -> Dict[str, Any]:
+            # Doc values are always lists so they bypass
+            # flattening. Returns the remaining (script) fields.
+            remaining = {}
+            for name, values in fields.items():
+                if name in doc_value_fields:
+                    if name in doc_value_dates:
+                        date_columns[name] = doc_value_dates[name]
+                    column = columns.get(name)
+                    if column is None:
+                        column = columns[name] = [np.nan] * num_hits
+                    column[row] = values[0] if len(values) == 1 else values
+                else:
+                    remaining[name] = values
+            return remaining
 
-    def date_field_format(self, es_field_name: str) -> str:
-        if es_field_name in self._date_field_format:
-            return self._date_field_format[es_field_name]
+        for row, hit in enumerate(hits):
+            source = hit.get("_source", {})
 
-        es_date_field_format = self._mappings.date_field_format(es_field_name)
+            # script_fields and doc values appear in 'fields'
+            if "fields" in hit:
+                fields = hit["fields"]
+                if doc_value_fields:
+                    fields = add_doc_values(fields, row)
+                if fields:
+                    source = {**source, **fields}
 
-        # cache this
-        self._date_field_format[es_field_name] = es_date_field_format
+            # get index value - can be _id or can be field value in source
+            if self._index_is_source_field:
+                index[row] = source[self._index_field]
+            else:
+                index[row] = hit[self._index_field]
+
+            for key, value in source.items():
+                flatten(value, key, row)
+
+        for name, es_date_format in date_columns.items():
+            column = columns[name]
+            if name in multi_valued_columns or any(
+                isinstance(value, list) for value in column
+            ):
+                columns[name] = [
+                    [
+                        elasticsearch_date_to_pandas_date(item, es_date_format)
+                        for item in value
+                    ]
+                    if isinstance(value, list)
+                    else elasticsearch_date_to_pandas_date(value, es_date_format)
+                    if value == value
+                    else value
+                    for value in column
+                ]
+            else:
+                columns[name] = elasticsearch_dates_to_pandas_dates(
+                    column, es_date_format
+                )
 
-        return es_date_field_format
+        return columns, index
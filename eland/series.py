@@ -322,9 +322,6 @@ class Series(NDFrame):
         max_rows = pd.get_option("display.max_rows")
         min_rows = pd.get_option("display.min_rows")
 
-        if max_rows and len(self) > max_rows:
-            max_rows = min_rows
-
         show_dimensions = pd.get_option("display.show_dimensions")
 
         self.to_string(
@@ -364,9 +361,23 @@ class Series(NDFrame):
         :pandas_api_docs:`pandas.Series.to_string`
             for argument details.
         """
+        # Fetch the number of rows and enough rows for any of the limits below
+        repr_rows = self._fetch_repr(
+            max(
+                DEFAULT_NUM_ROWS_DISPLAYED if max_rows is None else max_rows,
+                min_rows or 0,
+                1,
+            )
+            + 1
+        )
+
+        # Like pandas, show min_rows rows if there are more than max_rows
+        num_rows = repr_rows.count
+        if min_rows is not None and max_rows and num_rows > max_rows:
+            max_rows = min_rows
+
         # In pandas calling 'to_string' without max_rows set, will dump ALL rows - we avoid this
         # by limiting rows by default.
-        num_rows = len(self)  # avoid multiple calls
         if num_rows <= DEFAULT_NUM_ROWS_DISPLAYED:
             if max_rows is None:
                 max_rows = num_rows
@@ -388,7 +399,7 @@ class Series(NDFrame):
             max_rows = 1
 
         # Create a slightly bigger dataframe than display
-        temp_series = self._build_repr(max_rows + 1)
+        temp_series = repr_rows.build(max_rows + 1)
 
         if buf is not None:
             _buf = _expand_user(stringify_path(buf))
@@ -428,8 +439,8 @@ class Series(NDFrame):
             footer = []
             if name and self.name is not None:
                 footer.append(f"Name: {self.name}")
-            if length and len(self) > max_rows:
-                footer.append(f"Length: {len(self.index)}")
+            if length and num_rows > max_rows:
+                footer.append(f"Length: {num_rows}")
             if dtype:
                 footer.append(f"dtype: {temp_series.dtype}")
 
@@ -440,8 +451,91 @@ class Series(NDFrame):
             result = _buf.getvalue()
             return result
 
-    def to_pandas(self, show_progress: bool = False) -> pd.Series:
-        return self._query_compiler.to_pandas(show_progress=show_progress)[self.name]
+    def to_pandas(
+        self,
+        show_progress: bool = False,
+        parallel: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        prefetch_max_bytes: Optional[int] = None,
+        target_page_bytes: Optional[int] = None,
+        target_page_latency: Optional[float] = None,
+        doc_values: bool = False,
+        compact_dtypes: bool = False,
+        preallocate: bool = False,
+    ) -> pd.Series:
+        return self._query_compiler.to_pandas(
+            show_progress=show_progress,
+            parallel=parallel,
+            prefetch=prefetch,
+            prefetch_max_bytes=prefetch_max_bytes,
+            target_page_bytes=target_page_bytes,
+            target_page_latency=target_page_latency,
+            doc_values=doc_values,
+            compact_dtypes=compact_dtypes,
+            preallocate=preallocate,
+        )[self.name]
+
+    def to_csv(
+        self,
+        path_or_buf=None,
+        sep=",",
+        na_rep="",
+        float_format=None,
+        header=True,
+        index=True,
+        index_label=None,
+        mode="w",
+        encoding=None,
+        compression="infer",
+        quoting=None,
+        quotechar='"',
+        line_terminator=None,
+        chunksize=None,
+        date_format=None,
+        doublequote=True,
+        escapechar=None,
+        decimal=".",
+        checkpoint=None,
+    ) -> Optional[str]:
+        """
+        Write Elasticsearch data to a comma-separated values (csv) file.
+
+        Results are written one page at a time so the Series is never
+        held in memory as a whole.
+
+        If ``checkpoint`` is the path of a file, the position of the scan
+        is saved to it after every page is written. When the export is
+        interrupted, calling ``to_csv`` again with the same arguments appends
+        the remaining rows to ``path_or_buf``, each row is written once. If
+        the point in time has expired a new one is opened, so documents
+        changed in the meantime may be missed or repeated.
+
+        See Also
+        --------
+        :pandas_api_docs:`pandas.Series.to_csv`
+        """
+        kwargs = {
+            "path_or_buf": path_or_buf,
+            "sep": sep,
+            "na_rep": na_rep,
+            "float_format": float_format,
+            "header": header,
+            "index": index,
+            "index_label": index_label,
+            "mode": mode,
+            "encoding": encoding,
+            "compression": compression,
+            "quoting": quoting,
+            "quotechar": quotechar,
+            "line_terminator": line_terminator,
+            "chunksize": chunksize,
+            "date_format": date_format,
+            "doublequote": doublequote,
+            "escapechar": escapechar,
+            "decimal": decimal,
+            "checkpoint": checkpoint,
+        }
+        return self._query_compiler.to_csv(**kwargs)
 
     @property
     def dtype(self) -> np.dtype:
@@ -15,12 +15,14 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import random
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from eland import SortOrder
 from eland.actions import HeadAction, SortIndexAction, TailAction
 from eland.arithmetics import ArithmeticSeries
+from eland.common import DEFAULT_SAMPLE_MAX_SLICES, DEFAULT_SAMPLE_MIN_CANDIDATES
 
 if TYPE_CHECKING:
     from .actions import PostProcessingAction  # noqa: F401
@@ -67,7 +69,8 @@ class SizeTask(Task):
     def __init__(self, task_type: str, index: "Index", count: int):
         super().__init__(task_type)
         self._sort_field = index.sort_field
-        self._count = min(len(index), count)
+        self._num_docs = len(index)
+        self._count = min(self._num_docs, count)
 
     @abstractmethod
     def size(self) -> int:
@@ -189,6 +192,7 @@ class SampleTask(SizeTask):
     def __init__(self, index: "Index", count: int, random_state: int):
         super().__init__("sample", index, count)
         self._random_state = random_state
+        self._slice = _sample_slice(self._num_docs, self._count, random_state)
 
     def resolve_task(
         self,
@@ -198,7 +202,15 @@ class SampleTask(SizeTask):
     ) -> RESOLVED_TASK_TYPE:
         query_params.query.random_score(self._random_state)
 
-        query_sort_field = self._sort_field
+        # The slice was sized from the number of matching documents, which
+        # is only the population being sampled if nothing limited it yet
+        if (
+            self._slice is not None
+            and query_params.size is None
+            and query_params.slice is None
+        ):
+            query_params.slice = self._slice
+
         query_size = self._count
 
         if query_params.size is not None:
@@ -206,8 +218,10 @@ class SampleTask(SizeTask):
         else:
             query_params.size = query_size
 
+        # Take the top 'n' random scores, unless already sorted by head() etc.
         if query_params.sort_field is None:
-            query_params.sort_field = query_sort_field
+            query_params.sort_field = "_score"
+            query_params.sort_order = SortOrder.DESC
 
         post_processing.append(SortIndexAction())
 
@@ -220,6 +234,31 @@ class SampleTask(SizeTask):
         return f"('{self._task_type}': ('count': {self._count}))"
 
 
+def _sample_slice(
+    num_docs: int, n: int, random_state: Optional[int]
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the search 'slice' a sample of 'n' of 'num_docs' documents is
+    drawn from, or None if the sample should be drawn from all of them.
+
+    Ranking the documents by a random score scores every matching document
+    so on large indices only one partition of the documents, split by the
+    hash of their _id, is scored and ranked. The slice is terms based so
+    Elasticsearch still hashes the _id of every matching document, which
+    reduces the scoring and ranking work but not the per document cost.
+    Partitions hold at least 2 * n plus DEFAULT_SAMPLE_MIN_CANDIDATES
+    documents on average so in practice never fewer than n, and the
+    partition is chosen with 'random_state'.
+    """
+    num_slices = min(
+        num_docs // (2 * n + DEFAULT_SAMPLE_MIN_CANDIDATES), DEFAULT_SAMPLE_MAX_SLICES
+    )
+    if num_slices < 2:
+        return None
+    slice_id = random.Random(random_state).randrange(num_slices)
+    return {"field": "_id", "id": slice_id, "max": num_slices}
+
+
 class QueryIdsTask(Task):
     def __init__(self, must: bool, ids: List[str], sort_index_by_ids: bool = False):
         """
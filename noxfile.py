@@ -29,6 +29,10 @@ SOURCE_FILES = ("setup.py", "noxfile.py", "eland/", "docs/", "utils/", "tests/")
 # by mypy. Errors from other files are ignored.
 TYPED_FILES = (
     "eland/actions.py",
+    "eland/aio.py",
+    "eland/arrow.py",
+    "eland/bulk.py",
+    "eland/cache.py",
     "eland/arithmetics.py",
     "eland/common.py",
     "eland/etl.py",
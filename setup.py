@@ -57,6 +57,8 @@ extras = {
     "xgboost": ["xgboost>=0.90,<2"],
     "scikit-learn": ["scikit-learn>=1.3,<2"],
     "lightgbm": ["lightgbm>=2,<4"],
+    "pyarrow": ["pyarrow>=10"],
+    "async": ["aiohttp>=3,<4"],
     "pytorch": [
         "torch>=1.13.1,<2.0",
         "sentence-transformers>=2.1.0,<=2.2.2",
@@ -0,0 +1,90 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+
+import asyncio
+
+import pandas as pd
+import pytest
+from elasticsearch import AsyncElasticsearch
+
+import eland as ed
+from tests import ELASTICSEARCH_HOST, FLIGHTS_INDEX_NAME
+from tests.common import TestData, assert_frame_equal, assert_series_equal
+
+try:
+    import aiohttp  # noqa: F401
+
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+requires_aiohttp = pytest.mark.skipif(
+    not HAS_AIOHTTP, reason="This test requires 'aiohttp' package to run."
+)
+
+
+class TestDataFrameAio(TestData):
+    def test_aio_accessor(self):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()
+
+        async def run():
+            assert_frame_equal(pd_flights, await ed_flights.aio.to_pandas())
+            assert_series_equal(
+                ed_flights.mean(numeric_only=True),
+                await ed_flights.aio.mean(numeric_only=True),
+            )
+            assert await ed_flights.aio.shape == pd_flights.shape
+
+            pages = [page async for page in ed_flights["Carrier"].aio.iter_pandas()]
+            assert all(isinstance(page, pd.Series) for page in pages)
+            assert sum(len(page) for page in pages) == pd_flights.shape[0]
+
+        asyncio.run(run())
+
+    @requires_aiohttp
+    def test_read_es(self):
+        pd_flights = self.pd_flights()
+
+        async def run():
+            es = AsyncElasticsearch(ELASTICSEARCH_HOST)
+            try:
+                ed_flights = await ed.aio.read_es(es, FLIGHTS_INDEX_NAME)
+
+                assert_frame_equal(pd_flights, await ed_flights.aio.to_pandas())
+                assert_frame_equal(
+                    pd_flights.agg(["min", "max"], numeric_only=True),
+                    await ed_flights.aio.agg(["min", "max"], numeric_only=True),
+                    check_exact=False,
+                )
+                ed_head = await ed_flights.aio.head(10)
+                assert_frame_equal(pd_flights.head(10), await ed_head.aio.to_pandas())
+
+                # Requests can't block the event loop
+                with pytest.raises(RuntimeError):
+                    ed_flights.to_pandas()
+            finally:
+                await es.close()
+
+        asyncio.run(run())
+
+    @requires_aiohttp
+    def test_async_client_requires_read_es(self):
+        with pytest.raises(ValueError):
+            ed.DataFrame(AsyncElasticsearch(ELASTICSEARCH_HOST), FLIGHTS_INDEX_NAME)
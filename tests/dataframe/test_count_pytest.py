@@ -42,3 +42,12 @@ class TestDataFrameCount(TestData):
         ed_count = ed_flights.count()
 
         assert_series_equal(pd_count, ed_count)
+
+    def test_count_multi_search(self, monkeypatch):
+        # Wide DataFrames count their fields over several searches
+        monkeypatch.setattr("eland.operations.DEFAULT_COUNT_FIELDS_PER_SEARCH", 2)
+
+        pd_flights = self.pd_flights().filter(self.filter_data)
+        ed_flights = self.ed_flights().filter(self.filter_data)
+
+        assert_series_equal(pd_flights.count(), ed_flights.count())
@@ -53,6 +53,19 @@ class TestDataFrameHeadTail(TestData):
         pd_tail_20 = pd_tail_10.tail(20)
         assert_pandas_eland_frame_equal(pd_tail_20, ed_tail_20)
 
+    def test_head_tail_pages(self):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()
+
+        # The tail is kept as several pages of search results arrive
+        assert_pandas_eland_frame_equal(
+            pd_flights.head(12000).tail(7), ed_flights.head(12000).tail(7)
+        )
+        assert_pandas_eland_frame_equal(
+            pd_flights.head(12000).tail(6000).head(5),
+            ed_flights.head(12000).tail(6000).head(5),
+        )
+
     def test_head_tail(self):
         ed_flights = self.ed_flights()
         pd_flights = self.pd_flights()
@@ -0,0 +1,99 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.common import TestData, assert_frame_equal
+
+try:
+    import pyarrow as pa
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+requires_pyarrow = pytest.mark.skipif(
+    not HAS_PYARROW, reason="This test requires 'pyarrow' package to run."
+)
+
+
+class TestDataFrameIterBatches(TestData):
+    columns = ["AvgTicketPrice", "DistanceKilometers", "dayOfWeek"]
+
+    @pytest.mark.parametrize("batch_size", [1000, 4999, 20000])
+    def test_iter_batches_pandas(self, batch_size):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()[self.columns]
+
+        batches = list(ed_flights.iter_batches(batch_size, columns=self.columns))
+
+        assert all(len(batch) == batch_size for batch in batches[:-1])
+        assert 0 < len(batches[-1]) <= batch_size
+        assert_frame_equal(pd_flights, pd.concat(batches))
+
+    def test_iter_batches_numpy(self):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()[self.columns]
+
+        batches = list(ed_flights.iter_batches(3000, columns=self.columns, as_="numpy"))
+
+        assert all(batch.shape == (3000, 3) for batch in batches[:-1])
+        assert batches[0].dtype == np.float64
+        np.testing.assert_array_equal(
+            pd_flights.to_numpy(dtype=np.float64), np.concatenate(batches)
+        )
+
+    @requires_pyarrow
+    def test_iter_batches_arrow(self):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()[self.columns]
+
+        batches = list(ed_flights.iter_batches(3000, columns=self.columns, as_="arrow"))
+
+        assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+        assert all(batch.num_rows == 3000 for batch in batches[:-1])
+        assert batches[0].schema.names == self.columns
+        assert sum(batch.num_rows for batch in batches) == len(pd_flights)
+
+    def test_iter_batches_shuffle(self):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()
+
+        def shuffled(seed):
+            return pd.concat(
+                ed_flights.iter_batches(5000, columns=["Carrier"], shuffle_seed=seed)
+            )
+
+        pd_shuffled = shuffled(42)
+        assert_frame_equal(pd_shuffled, shuffled(42))
+        assert not pd_shuffled.index.equals(shuffled(43).index)
+        assert not pd_shuffled.index.equals(pd_flights.index)
+        assert_frame_equal(pd_flights[["Carrier"]], pd_shuffled.loc[pd_flights.index])
+
+    def test_iter_batches_invalid(self):
+        ed_flights = self.ed_flights()
+
+        with pytest.raises(ValueError):
+            next(ed_flights.iter_batches(0))
+        with pytest.raises(ValueError):
+            next(ed_flights.iter_batches(100, as_="torch"))
+        with pytest.raises(ValueError):
+            next(ed_flights.head(100).iter_batches(10, shuffle_seed=0))
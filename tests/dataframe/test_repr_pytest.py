@@ -17,11 +17,14 @@
 
 # File called _pytest for PyCharm compatability
 
+import unittest.mock as mock
+
 import pandas as pd
 import pytest
 
+import eland as ed
 from eland.dataframe import DEFAULT_NUM_ROWS_DISPLAYED
-from tests.common import TestData, assert_pandas_eland_series_equal
+from tests.common import TestData, assert_frame_equal, assert_pandas_eland_series_equal
 
 
 class TestDataFrameRepr(TestData):
@@ -135,6 +138,35 @@ class TestDataFrameRepr(TestData):
             pd.get_option("display.max_rows") + 1, pd.get_option("display.min_rows")
         )
 
+    def test_search_repr(self):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()
+
+        # The count, head and tail come from a single multi search
+        count, head, tail = ed_flights._query_compiler.search_repr(11)
+        assert count == pd_flights.shape[0]
+        assert_frame_equal(pd_flights.head(11), head)
+        assert_frame_equal(pd_flights.tail(5), tail)
+        assert repr(ed_flights) == repr(pd_flights)
+
+        # Already limited results are displayed with head() and tail()
+        assert ed_flights.head(100)._query_compiler.search_repr(11) is None
+        assert repr(ed_flights.head(100)) == repr(pd_flights.head(100))
+
+    def test_search_repr_not_cached(self):
+        ed_flights = self.ed_flights()
+        client = ed_flights._query_compiler._client
+
+        # The displayed rows are always fetched from Elasticsearch
+        ed.cache.enable()
+        try:
+            with mock.patch.object(client, "msearch", wraps=client.msearch) as msearch:
+                ed_flights._query_compiler.search_repr(11)
+                ed_flights._query_compiler.search_repr(11)
+            assert msearch.call_count == 2
+        finally:
+            ed.cache.disable()
+
     def num_rows_repr(self, rows, num_rows_printed):
         ed_flights = self.ed_flights()
         pd_flights = self.pd_flights()
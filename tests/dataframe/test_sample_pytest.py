@@ -108,3 +108,27 @@ class TestDataFrameSample(TestData):
         sample_pd_flights = self.build_from_index(eland_to_pandas(sample_ed_flights))
 
         assert sample_pd_flights.shape == sample_ed_flights.shape
+
+    def test_sample_large(self):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()
+
+        # Large enough relative to the index to rank every document
+        ed_sample = ed_flights.sample(n=8000, random_state=self.SEED)
+        pd_sample = eland_to_pandas(ed_sample)
+        assert len(pd_sample) == 8000
+        assert pd_sample.index.is_unique
+        assert_frame_equal(pd_flights.loc[pd_sample.index], pd_sample)
+
+        # Small enough to only rank part of the index
+        first_sample = eland_to_pandas(ed_flights.sample(n=10, random_state=self.SEED))
+        assert len(first_sample) == 10
+        assert_frame_equal(pd_flights.loc[first_sample.index], first_sample)
+        assert_frame_equal(
+            first_sample,
+            eland_to_pandas(ed_flights.sample(n=10, random_state=self.SEED)),
+        )
+        assert not first_sample.index.equals(
+            eland_to_pandas(ed_flights.sample(n=10, random_state=self.SEED + 1)).index
+        )
+        assert not first_sample.index.equals(pd_flights.head(10).index)
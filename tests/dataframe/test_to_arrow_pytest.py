@@ -0,0 +1,135 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from tests import ES_TEST_CLIENT
+from tests.common import ROOT_DIR, TestData, assert_pandas_eland_frame_equal
+
+try:
+    import pyarrow as pa
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+requires_pyarrow = pytest.mark.skipif(
+    not HAS_PYARROW, reason="This test requires 'pyarrow' package to run."
+)
+
+
+@requires_pyarrow
+class TestDataFrameToArrow(TestData):
+    columns = ["AvgTicketPrice", "Cancelled", "Carrier", "FlightDelayMin", "timestamp"]
+
+    def test_to_arrow_schema(self):
+        ed_flights = self.ed_flights()[self.columns]
+
+        table = ed_flights.head(10).to_arrow()
+
+        assert table.schema == pa.schema(
+            [
+                ("_id", pa.string()),
+                ("AvgTicketPrice", pa.float64()),
+                ("Cancelled", pa.bool_()),
+                ("Carrier", pa.string()),
+                ("FlightDelayMin", pa.int64()),
+                ("timestamp", pa.timestamp("ns")),
+            ]
+        )
+        assert table.num_rows == 10
+        assert ed_flights.head(10).to_arrow(index=False).column_names == self.columns
+
+    def test_to_arrow(self):
+        ed_flights = self.ed_flights()[self.columns]
+        pd_flights = self.pd_flights()[self.columns]
+
+        pd_df = ed_flights.to_arrow().to_pandas().set_index("_id")
+        pd_df.index.name = None
+        assert_pandas_eland_frame_equal(pd_df, ed_flights)
+
+        # head/tail go through post processing
+        for ed_df, pd_df in (
+            (ed_flights.head(100), pd_flights.head(100)),
+            (ed_flights.tail(100), pd_flights.tail(100)),
+        ):
+            table = ed_df.to_arrow(index=False)
+            pd.testing.assert_frame_equal(
+                table.to_pandas(), pd_df.reset_index(drop=True)
+            )
+
+    def test_iter_arrow_batches(self):
+        ed_flights = self.ed_flights()[self.columns]
+
+        batches = list(ed_flights.iter_arrow_batches(prefetch=1))
+
+        assert len({batch.schema for batch in batches}) == 1
+        assert sum(batch.num_rows for batch in batches) == self.pd_flights().shape[0]
+
+    @pytest.mark.parametrize("parallel", [None, 3])
+    @pytest.mark.parametrize("expire_pit", [False, True])
+    def test_iter_arrow_batches_checkpoint(self, parallel, expire_pit):
+        checkpoint = (
+            ROOT_DIR + "/dataframe/results/test_iter_arrow_batches_checkpoint.json"
+        )
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        ed_flights = self.ed_flights()[self.columns]
+
+        def batches():
+            return ed_flights.iter_arrow_batches(
+                checkpoint=checkpoint, parallel=parallel
+            )
+
+        # Closing after the second batch saves the position after it
+        interrupted = batches()
+        seen = [next(interrupted), next(interrupted)]
+        interrupted.close()
+
+        if expire_pit:
+            # A new point in time carries on from the '_shard_doc' values
+            with open(checkpoint) as f:
+                ES_TEST_CLIENT.close_point_in_time(id=json.load(f)["pit_id"])
+
+        seen.extend(batches())
+        ids = [id for batch in seen for id in batch.column("_id").to_pylist()]
+        assert len(ids) == len(set(ids))
+        assert sorted(ids) == sorted(self.pd_flights().index)
+
+        # Nothing is left once the scan completed
+        assert list(batches()) == []
+
+    def test_to_arrow_multi_values(self):
+        ed_ecommerce = self.ed_ecommerce()[["category", "order_date"]]
+
+        with pytest.raises(ValueError, match="schema_overrides"):
+            ed_ecommerce.to_arrow()
+
+        table = ed_ecommerce.to_arrow(
+            schema_overrides={"category": pa.list_(pa.string())}
+        )
+        assert table.schema.field("category").type == pa.list_(pa.string())
+        assert table.column("category").to_pylist() == [
+            value if isinstance(value, list) else [value]
+            for value in self.pd_ecommerce()["category"]
+        ]
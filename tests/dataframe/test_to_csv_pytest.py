@@ -18,10 +18,14 @@
 # File called _pytest for PyCharm compatability
 
 import ast
+import gzip
+import json
+import os
 import time
 from io import StringIO
 
 import pandas as pd
+import pytest
 from pandas.testing import assert_frame_equal
 
 import eland as ed
@@ -120,3 +124,93 @@ class TestDataFrameToCSV(TestData):
         pd_from_csv.timestamp = pd.to_datetime(pd_from_csv.timestamp)
 
         assert_frame_equal(pd_flights, pd_from_csv)
+
+    def test_to_csv_streamed_matches_pandas(self):
+        # Written page by page, the output must match a single pandas write
+        ed_flights = self.ed_flights()
+
+        assert ed_flights.to_csv() == ed_flights.to_pandas().to_csv()
+        ed_tail = ed_flights.tail(7000)
+        assert ed_tail.to_csv() == ed_tail.to_pandas().to_csv()
+
+    def test_to_csv_compression(self):
+        results_file = ROOT_DIR + "/dataframe/results/test_to_csv_compression.csv.gz"
+
+        ed_flights = self.ed_flights()
+        ed_flights.to_csv(results_file)
+
+        with gzip.open(results_file, "rt") as f:
+            assert f.read() == ed_flights.to_pandas().to_csv()
+
+    def test_to_csv_empty(self):
+        ed_flights = self.ed_flights()
+        ed_empty = ed_flights[ed_flights.FlightDelayMin < 0]
+
+        assert ed_empty.to_csv() == ed_empty.to_pandas().to_csv()
+
+    def test_series_to_csv(self):
+        ed_series = self.ed_flights()["Carrier"]
+
+        assert ed_series.to_csv() == ed_series.to_pandas().to_csv()
+        assert ed_series.to_csv(header=False) == ed_series.to_pandas().to_csv(
+            header=False
+        )
+
+    def test_to_csv_checkpoint(self):
+        results_file = ROOT_DIR + "/dataframe/results/test_to_csv_checkpoint.csv"
+        checkpoint = ROOT_DIR + "/dataframe/results/test_to_csv_checkpoint.json"
+        for path in (results_file, checkpoint):
+            if os.path.exists(path):
+                os.remove(path)
+        ed_flights = self.ed_flights()
+
+        ed_flights.to_csv(results_file, checkpoint=checkpoint)
+        # Resuming a completed export appends nothing
+        ed_flights.to_csv(results_file, checkpoint=checkpoint)
+
+        with open(results_file) as f:
+            assert f.read() == ed_flights.to_pandas().to_csv()
+
+        with pytest.raises(ValueError, match="different scan"):
+            ed_flights[["Carrier"]].to_csv(results_file, checkpoint=checkpoint)
+        with pytest.raises(ValueError):
+            ed_flights.to_csv(checkpoint=checkpoint)
+
+    @pytest.mark.parametrize("expire_pit", [False, True])
+    def test_to_csv_checkpoint_resume(self, monkeypatch, expire_pit):
+        results_file = ROOT_DIR + "/dataframe/results/test_to_csv_resume.csv"
+        checkpoint = ROOT_DIR + "/dataframe/results/test_to_csv_resume.json"
+        for path in (results_file, checkpoint):
+            if os.path.exists(path):
+                os.remove(path)
+        ed_flights = self.ed_flights()
+
+        class Interrupted(Exception):
+            pass
+
+        pd_to_csv = pd.DataFrame.to_csv
+        pages = []
+
+        def to_csv(df, *args, **kwargs):
+            # Stop part way through writing the third page
+            if len(pages) == 2:
+                pd_to_csv(df.head(10), *args, **kwargs)
+                raise Interrupted()
+            pages.append(df)
+            return pd_to_csv(df, *args, **kwargs)
+
+        monkeypatch.setattr(pd.DataFrame, "to_csv", to_csv)
+        with pytest.raises(Interrupted):
+            ed_flights.to_csv(results_file, checkpoint=checkpoint)
+        monkeypatch.undo()
+
+        if expire_pit:
+            # A new point in time carries on from the '_shard_doc' values
+            with open(checkpoint) as f:
+                ES_TEST_CLIENT.close_point_in_time(id=json.load(f)["pit_id"])
+
+        ed_flights.to_csv(results_file, checkpoint=checkpoint)
+
+        # Every row is written once, in order
+        with open(results_file) as f:
+            assert f.read() == ed_flights.to_pandas().to_csv()
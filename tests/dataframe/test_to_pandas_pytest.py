@@ -0,0 +1,131 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+
+import pytest
+
+from tests.common import TestData, assert_frame_equal
+
+
+class TestDataFrameToPandas(TestData):
+    @pytest.mark.parametrize("parallel", [2, 5])
+    def test_to_pandas_parallel(self, parallel):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()
+
+        # Slices are yielded unordered when no sort was requested
+        ed_df = ed_flights.to_pandas(parallel=parallel)
+        assert_frame_equal(pd_flights, ed_df.loc[pd_flights.index])
+
+    @pytest.mark.parametrize("parallel", [2, 5])
+    def test_head_tail_parallel_ordered(self, parallel):
+        ed_flights = self.ed_flights()
+
+        for ed_df in (ed_flights.head(7000), ed_flights.tail(7000)):
+            assert_frame_equal(ed_df.to_pandas(), ed_df.to_pandas(parallel=parallel))
+
+    def test_to_pandas_parallel_invalid(self):
+        with pytest.raises(ValueError):
+            self.ed_flights().to_pandas(parallel=0)
+
+    @pytest.mark.parametrize("prefetch", [1, 3])
+    def test_to_pandas_prefetch(self, prefetch):
+        ed_flights = self.ed_flights()
+
+        assert_frame_equal(self.pd_flights(), ed_flights.to_pandas(prefetch=prefetch))
+        for ed_df in (ed_flights.head(7000), ed_flights.tail(7000)):
+            assert_frame_equal(ed_df.to_pandas(), ed_df.to_pandas(prefetch=prefetch))
+
+    def test_to_pandas_prefetch_max_bytes(self):
+        # A page is always buffered even if it is larger than the cap
+        ed_flights = self.ed_flights()
+        assert_frame_equal(
+            self.pd_flights(),
+            ed_flights.to_pandas(prefetch=4, prefetch_max_bytes=1),
+        )
+
+    def test_to_pandas_prefetch_invalid(self):
+        with pytest.raises(ValueError):
+            self.ed_flights().to_pandas(prefetch=-1)
+
+    def test_to_pandas_doc_values(self):
+        ed_flights = self.ed_flights()
+
+        assert_frame_equal(self.pd_flights(), ed_flights.to_pandas(doc_values=True))
+        ed_df = ed_flights.tail(100)
+        assert_frame_equal(ed_df.to_pandas(), ed_df.to_pandas(doc_values=True))
+
+    def test_to_pandas_compact_dtypes(self):
+        ed_flights = self.ed_flights()
+        pd_flights = self.pd_flights()
+
+        pd_compact = ed_flights.to_pandas(compact_dtypes=True)
+
+        assert pd_compact["Carrier"].dtype == "category"
+        assert pd_compact["dayOfWeek"].dtype == "int8"
+        assert pd_compact["FlightDelayMin"].dtype == "int32"
+        assert pd_compact["AvgTicketPrice"].dtype == "float32"
+        # Categories are unioned across pages
+        assert set(pd_compact["Carrier"].cat.categories) == set(pd_flights["Carrier"])
+        assert (
+            pd_compact.memory_usage(deep=True).sum()
+            < pd_flights.memory_usage(deep=True).sum()
+        )
+        assert_frame_equal(
+            pd_flights,
+            pd_compact.astype(pd_flights.dtypes.to_dict()),
+            check_exact=False,
+            rtol=1e-6,
+        )
+
+        assert ed_flights.head(0).to_pandas(compact_dtypes=True)["Carrier"].dtype == (
+            "category"
+        )
+
+    def test_to_pandas_preallocate(self):
+        ed_flights = self.ed_flights()
+        ed_ecommerce = self.ed_ecommerce()
+
+        assert_frame_equal(self.pd_flights(), ed_flights.to_pandas(preallocate=True))
+        for ed_df in (
+            ed_flights.head(7000),
+            ed_flights.tail(7000),
+            ed_flights.head(0),
+            ed_ecommerce,
+        ):
+            assert_frame_equal(ed_df.to_pandas(), ed_df.to_pandas(preallocate=True))
+        assert_frame_equal(
+            ed_flights.to_pandas(compact_dtypes=True),
+            ed_flights.to_pandas(compact_dtypes=True, preallocate=True),
+        )
+
+    @pytest.mark.parametrize(
+        "target", [{"target_page_bytes": 100_000}, {"target_page_latency": 0.1}]
+    )
+    def test_to_pandas_adaptive_page_size(self, target):
+        ed_flights = self.ed_flights()
+
+        assert_frame_equal(self.pd_flights(), ed_flights.to_pandas(**target))
+        for ed_df in (ed_flights.head(1000), ed_flights.tail(1000)):
+            assert_frame_equal(ed_df.to_pandas(), ed_df.to_pandas(**target))
+
+    def test_to_pandas_adaptive_page_size_invalid(self):
+        with pytest.raises(ValueError):
+            self.ed_flights().to_pandas(target_page_bytes=0)
+        with pytest.raises(ValueError):
+            self.ed_flights().to_pandas(target_page_latency=-1)
@@ -0,0 +1,101 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+
+import os
+
+import pandas as pd
+import pytest
+
+from tests.common import TestData
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+requires_pyarrow = pytest.mark.skipif(
+    not HAS_PYARROW, reason="This test requires 'pyarrow' package to run."
+)
+
+
+@requires_pyarrow
+class TestDataFrameToParquet(TestData):
+    columns = ["AvgTicketPrice", "Cancelled", "Carrier", "FlightDelayMin", "timestamp"]
+
+    def test_to_parquet(self, tmp_path):
+        ed_flights = self.ed_flights()[self.columns]
+        path = tmp_path / "flights.parquet"
+
+        ed_flights.to_parquet(path)
+
+        parquet_file = pq.ParquetFile(path)
+        assert parquet_file.schema_arrow == ed_flights.head(0).to_arrow().schema
+        # One row group per page of search results
+        assert parquet_file.metadata.num_row_groups > 1
+        pd.testing.assert_frame_equal(
+            pq.read_table(path).to_pandas(), ed_flights.to_arrow().to_pandas()
+        )
+
+    def test_to_parquet_row_group_size(self, tmp_path):
+        ed_flights = self.ed_flights()[self.columns]
+        path = tmp_path / "flights.parquet"
+
+        ed_flights.to_parquet(path, index=False, row_group_size=3000)
+
+        metadata = pq.ParquetFile(path).metadata
+        num_rows = self.pd_flights().shape[0]
+        assert [
+            metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)
+        ] == [3000] * (num_rows // 3000) + [num_rows % 3000]
+        pd.testing.assert_frame_equal(
+            pq.read_table(path).to_pandas(),
+            self.pd_flights()[self.columns].reset_index(drop=True),
+        )
+
+    def test_to_parquet_max_file_size(self, tmp_path):
+        ed_flights = self.ed_flights()[self.columns]
+
+        ed_flights.to_parquet(tmp_path, row_group_size=1000, max_file_size=10000)
+
+        files = sorted(os.listdir(tmp_path))
+        assert len(files) > 1
+        assert files[0] == "part-00000.parquet"
+        table = pa.concat_tables(pq.read_table(tmp_path / file) for file in files)
+        assert table.equals(ed_flights.to_arrow())
+
+    def test_to_parquet_empty(self, tmp_path):
+        ed_flights = self.ed_flights()[self.columns]
+        path = tmp_path / "flights.parquet"
+
+        ed_flights.head(0).to_parquet(path)
+
+        table = pq.read_table(path)
+        assert table.num_rows == 0
+        assert table.schema == ed_flights.head(0).to_arrow().schema
+
+    def test_to_parquet_invalid(self, tmp_path):
+        ed_flights = self.ed_flights()
+
+        with pytest.raises(ValueError):
+            ed_flights.to_parquet(tmp_path / "flights.parquet", row_group_size=0)
+        with pytest.raises(ValueError):
+            ed_flights.to_parquet(tmp_path, max_file_size=0)
@@ -0,0 +1,176 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+
+import json
+import unittest.mock as mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from elasticsearch import ApiError
+from elasticsearch.helpers import BulkIndexError
+
+from eland.bulk import bulk_index, iter_bulk_chunks, iter_ndjson
+
+pd_df = pd.DataFrame(
+    {
+        "a": [1, 2, 3],
+        "b": [1.5, np.nan, 3.0],
+        "c": ['A,"B"', None, "C"],
+        "d": [
+            pd.Timestamp("2020-01-01 10:00:00.5"),
+            pd.NaT,
+            pd.Timestamp("2020-01-02"),
+        ],
+        "e": [True, False, True],
+    },
+    index=["0", "1", "2"],
+)
+
+
+def parse(docs):
+    lines = b"".join(docs).splitlines()
+    return [
+        (json.loads(action), json.loads(source))
+        for action, source in zip(lines[::2], lines[1::2])
+    ]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 10])
+def test_iter_ndjson(chunksize):
+    assert parse(iter_ndjson(pd_df, False, True, chunksize)) == [
+        (
+            {"index": {"_id": "0"}},
+            {
+                "a": 1,
+                "b": 1.5,
+                "c": 'A,"B"',
+                "d": "2020-01-01T10:00:00.500000",
+                "e": True,
+            },
+        ),
+        (
+            {"index": {"_id": "1"}},
+            {"a": 2, "b": None, "c": None, "d": None, "e": False},
+        ),
+        (
+            {"index": {"_id": "2"}},
+            {"a": 3, "b": 3.0, "c": "C", "d": "2020-01-02T00:00:00.000000", "e": True},
+        ),
+    ]
+
+
+def test_iter_ndjson_dropna():
+    docs = parse(iter_ndjson(pd_df, True, False, 2))
+
+    assert [action for action, _ in docs] == [{"index": {}}] * 3
+    assert docs[1][1] == {"a": 2, "e": False}
+    assert docs[2][1] == {
+        "a": 3,
+        "b": 3.0,
+        "c": "C",
+        "d": "2020-01-02T00:00:00.000000",
+        "e": True,
+    }
+
+
+def test_iter_ndjson_timezone():
+    tz_df = pd.DataFrame(
+        {"t": pd.date_range("2020-01-01", periods=2, tz="Europe/Paris")},
+        index=[10, 20],
+    )
+
+    assert parse(iter_ndjson(tz_df, False, True, 10)) == [
+        ({"index": {"_id": "10"}}, {"t": "2019-12-31T23:00:00.000000Z"}),
+        ({"index": {"_id": "20"}}, {"t": "2020-01-01T23:00:00.000000Z"}),
+    ]
+
+
+def test_iter_bulk_chunks():
+    docs = [b"a" * 10, b"b" * 10, b"c" * 30, b"d" * 5]
+
+    assert list(iter_bulk_chunks(docs, 25)) == [
+        [b"a" * 10, b"b" * 10],
+        [b"c" * 30],
+        [b"d" * 5],
+    ]
+    assert list(iter_bulk_chunks([], 25)) == []
+
+
+def bulk_response(*statuses):
+    items = []
+    for status in statuses:
+        result = {"status": status}
+        if status >= 400:
+            result["error"] = {"type": "error", "reason": f"status {status}"}
+        items.append({"index": result})
+    return {"errors": any(status >= 400 for status in statuses), "items": items}
+
+
+@mock.patch("eland.bulk.time.sleep")
+def test_bulk_index_retries_rejected(sleep):
+    client = mock.Mock(spec=["bulk"])
+    client.bulk.side_effect = [
+        bulk_response(201, 429, 429),
+        bulk_response(201, 429),
+        bulk_response(201),
+    ]
+
+    report = bulk_index(client, "test-index", [[b"a\n", b"b\n", b"c\n"]], 2)
+
+    assert [call.kwargs["operations"] for call in client.bulk.call_args_list] == [
+        b"a\nb\nc\n",
+        b"b\nc\n",
+        b"c\n",
+    ]
+    assert [call.args for call in sleep.call_args_list] == [(2.0,), (4.0,)]
+    assert report.num_docs == 3
+    assert report.num_retries == 3
+    assert report.num_failures == 0
+    assert report.num_bytes == 12
+
+
+@mock.patch("eland.bulk.time.sleep")
+def test_bulk_index_failures(sleep):
+    client = mock.Mock(spec=["bulk"])
+    client.bulk.side_effect = [bulk_response(201, 400, 429), bulk_response(429)]
+
+    with pytest.raises(BulkIndexError) as e:
+        bulk_index(client, "test-index", [[b"a\n", b"b\n", b"c\n"]], 1, max_retries=1)
+
+    assert [item["index"]["status"] for item in e.value.errors] == [400, 429]
+    assert e.value.report.num_docs == 1
+    assert e.value.report.num_retries == 1
+    assert e.value.report.num_failures == 2
+
+
+@mock.patch("eland.bulk.time.sleep")
+def test_bulk_index_rejected_request(sleep):
+    client = mock.Mock(spec=["bulk"])
+    rejected = ApiError(
+        "es_rejected_execution_exception",
+        meta=mock.Mock(status=429),
+        body={},
+    )
+    client.bulk.side_effect = [rejected, bulk_response(201)]
+
+    report = bulk_index(client, "test-index", [[b"a\n"]], 1)
+
+    assert report.num_docs == 1
+    assert report.num_retries == 1
@@ -15,13 +15,16 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import io
 from datetime import datetime, timedelta
 
 import pandas as pd
 import pytest
 from elasticsearch.helpers import BulkIndexError
 
-from eland import DataFrame, pandas_to_eland
+import eland as ed
+from eland import DataFrame, csv_to_eland, pandas_to_eland
+from eland.bulk import iter_ndjson
 from tests.common import (
     ES_TEST_CLIENT,
     assert_frame_equal,
@@ -138,6 +141,30 @@ class TestPandasToEland:
         pd_df3 = pd_df._append(pd_df2)
         assert_pandas_eland_frame_equal(pd_df3, df2)
 
+    def test_es_if_exists_append_clears_cache(self):
+        ed.cache.enable()
+        try:
+            df = pandas_to_eland(
+                pd_df,
+                es_client=ES_TEST_CLIENT,
+                es_dest_index="test-index",
+                es_refresh=True,
+            )
+            assert df.count()["a"] == 3
+
+            pandas_to_eland(
+                pd_df2.rename(columns={"Z": "a", "a": "c"}),
+                es_client=ES_TEST_CLIENT,
+                es_dest_index="test-index",
+                es_if_exists="append",
+                es_refresh=True,
+                use_pandas_index_for_es_ids=False,
+            )
+            # The cached count of the index is out of date
+            assert df.count()["a"] == 6
+        finally:
+            ed.cache.disable()
+
     def test_es_if_exists_append_mapping_mismatch_schema_enforcement(self):
         df1 = pandas_to_eland(
             pd_df,
@@ -292,3 +319,173 @@ class TestPandasToEland:
             "Cannot use 'd' with groupby() because it has "
             "no aggregatable fields in Elasticsearch"
         )
+
+    def test_es_dropna_chunks(self):
+        pd_df_na = pd.DataFrame(
+            {
+                "a": [1, 2, 3, 4, 5],
+                "b": [1.0, None, 3.0, None, 5.0],
+                "c": ["A", "B", None, "D", "E"],
+                "d": [dt, dt, dt, pd.NaT, dt],
+            },
+            index=["0", "1", "2", "3", "4"],
+        )
+        df = pandas_to_eland(
+            pd_df_na,
+            es_client=ES_TEST_CLIENT,
+            es_dest_index="test-index",
+            es_refresh=True,
+            es_dropna=True,
+            chunksize=2,
+            thread_count=1,
+        )
+
+        doc = ES_TEST_CLIENT.get(index="test-index", id="3")
+        assert doc["_source"] == {"a": 4, "c": "D"}
+        assert_pandas_eland_frame_equal(pd_df_na, df)
+
+    def test_max_chunk_bytes(self):
+        pd_df_many = pd.concat([pd_df] * 100, ignore_index=True)
+        pd_df_many.index = pd_df_many.index.astype(str)
+
+        df = pandas_to_eland(
+            pd_df_many,
+            es_client=ES_TEST_CLIENT,
+            es_dest_index="test-index",
+            es_refresh=True,
+            max_chunk_bytes=1024,
+        )
+
+        assert_pandas_eland_frame_equal(pd_df_many, df)
+
+    def test_es_bulk_load(self):
+        ES_TEST_CLIENT.indices.create(
+            index="test-index", settings={"index.refresh_interval": "5s"}
+        )
+
+        df = pandas_to_eland(
+            pd_df,
+            es_client=ES_TEST_CLIENT,
+            es_dest_index="test-index",
+            es_if_exists="append",
+            es_verify_mapping_compatibility=False,
+            es_bulk_load=True,
+            es_translog_async=True,
+            es_force_merge=1,
+        )
+
+        # Refreshed when loaded
+        assert_pandas_eland_frame_equal(pd_df, df)
+
+        # The previous settings are restored
+        settings = ES_TEST_CLIENT.indices.get_settings(
+            index="test-index", flat_settings=True
+        )["test-index"]["settings"]
+        assert settings["index.refresh_interval"] == "5s"
+        assert "index.translog.durability" not in settings
+        assert settings["index.number_of_replicas"] != "0"
+
+    def test_es_bulk_load_restores_on_failure(self):
+        pandas_to_eland(
+            pd_df,
+            es_client=ES_TEST_CLIENT,
+            es_dest_index="test-index",
+            es_type_overrides={"a": "byte"},
+        )
+
+        with pytest.raises(BulkIndexError) as e:
+            pandas_to_eland(
+                pd.DataFrame({"a": [127, 128]}, index=["3", "4"]),
+                es_client=ES_TEST_CLIENT,
+                es_dest_index="test-index",
+                es_if_exists="append",
+                es_verify_mapping_compatibility=False,
+                es_bulk_load=True,
+            )
+        assert e.value.report.num_docs == 1
+        assert e.value.report.num_failures == 1
+
+        settings = ES_TEST_CLIENT.indices.get_settings(
+            index="test-index", flat_settings=True
+        )["test-index"]["settings"]
+        assert "index.refresh_interval" not in settings
+
+    def test_show_progress(self, capsys):
+        pandas_to_eland(
+            pd_df,
+            es_client=ES_TEST_CLIENT,
+            es_dest_index="test-index",
+            show_progress=True,
+        )
+
+        out = capsys.readouterr().out
+        assert "indexed 3 docs" in out
+        assert "0 retries, 0 failures" in out
+
+    def test_ingest_report(self):
+        pd_df_many = pd.concat([pd_df] * 100, ignore_index=True)
+        pd_df_many.index = pd_df_many.index.astype(str)
+
+        df = pandas_to_eland(
+            pd_df_many,
+            es_client=ES_TEST_CLIENT,
+            es_dest_index="test-index",
+            max_chunk_bytes=1024,
+        )
+
+        report = df.ingest_report
+        assert report.num_docs == 300
+        assert report.num_bytes == sum(
+            len(doc) for doc in iter_ndjson(pd_df_many, False, True, 300)
+        )
+        assert report.num_retries == 0
+        assert report.num_failures == 0
+        # Only set on the DataFrame returned by the load
+        assert DataFrame(ES_TEST_CLIENT, "test-index").ingest_report is None
+
+    def test_csv_to_eland_ingest_report(self, monkeypatch):
+        requests = []
+        bulk = ES_TEST_CLIENT.bulk
+        monkeypatch.setattr(
+            ES_TEST_CLIENT,
+            "bulk",
+            lambda **kwargs: requests.append(kwargs["operations"]) or bulk(**kwargs),
+        )
+        pd_df_csv = pd.DataFrame({"a": range(25), "b": [x / 2 for x in range(25)]})
+
+        df = csv_to_eland(
+            io.StringIO(pd_df_csv.to_csv(index=False)),
+            es_client=ES_TEST_CLIENT,
+            es_dest_index="test-index",
+            max_chunk_bytes=100,
+            max_retries=0,
+        )
+
+        # Each request holds at most 100 bytes of documents
+        assert len(requests) > 1
+        assert all(len(request) <= 100 for request in requests)
+        assert df.ingest_report.num_docs == 25
+        assert df.ingest_report.num_bytes == sum(len(request) for request in requests)
+
+    def test_csv_to_eland_chunks(self, monkeypatch):
+        created = []
+        create = ES_TEST_CLIENT.indices.create
+        monkeypatch.setattr(
+            ES_TEST_CLIENT.indices,
+            "create",
+            lambda **kwargs: created.append(kwargs["index"]) or create(**kwargs),
+        )
+        pd_df_csv = pd.DataFrame({"a": range(25), "b": [x / 2 for x in range(25)]})
+
+        df = csv_to_eland(
+            io.StringIO(pd_df_csv.to_csv(index=False)),
+            es_client=ES_TEST_CLIENT,
+            es_dest_index="test-index",
+            es_refresh=True,
+            chunksize=10,
+        )
+
+        # The index is created once for all chunks
+        assert created == ["test-index"]
+        pd_df_csv.index = pd_df_csv.index.astype(str)
+        assert_frame_equal(pd_df_csv, df.to_pandas().sort_values("a"))
@@ -0,0 +1,67 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+
+from eland.operations import _PageSizer
+
+
+class TestPageSizer:
+    def test_grows_for_small_pages(self):
+        sizer = _PageSizer(max_size=10000, target_bytes=1_000_000)
+        assert sizer.size == _PageSizer.INITIAL_SIZE
+
+        # 100 bytes per hit wants 10000 hits but grows at most 2x per page
+        sizer.update(num_hits=100, num_bytes=10_000, latency=0.01)
+        assert sizer.size == 200
+        for _ in range(10):
+            sizer.update(num_hits=sizer.size, num_bytes=sizer.size * 100, latency=0.01)
+        assert sizer.size == 10000
+
+    def test_shrinks_for_large_pages(self):
+        sizer = _PageSizer(max_size=10000, target_bytes=1_000_000)
+
+        # 100KB per hit
+        sizer.update(num_hits=100, num_bytes=10_000_000, latency=0.01)
+        assert sizer.size == 10
+        sizer.update(num_hits=10, num_bytes=100_000_000, latency=0.01)
+        assert sizer.size == 1
+
+    def test_latency(self):
+        sizer = _PageSizer(max_size=10000, target_latency=0.5)
+
+        sizer.update(num_hits=100, num_bytes=0, latency=1.0)
+        assert sizer.size == 50
+
+        # The smaller of the two targets wins
+        sizer = _PageSizer(max_size=10000, target_bytes=1_000_000, target_latency=0.5)
+        sizer.update(num_hits=100, num_bytes=10_000, latency=1.0)
+        assert sizer.size == 50
+
+    def test_max_size(self):
+        sizer = _PageSizer(max_size=50, target_bytes=1_000_000)
+        assert sizer.size == 50
+
+        sizer.update(num_hits=50, num_bytes=50, latency=0.01)
+        assert sizer.size == 50
+
+    def test_unknown_response_size(self):
+        sizer = _PageSizer(max_size=10000, target_bytes=1_000_000)
+
+        # Without a Content-Length only the growth limit applies
+        sizer.update(num_hits=100, num_bytes=0, latency=0.01)
+        assert sizer.size == 200
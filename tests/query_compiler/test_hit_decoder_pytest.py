@@ -0,0 +1,86 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+import numpy as np
+import pandas as pd
+
+from tests.common import TestData
+
+
+class TestHitDecoder(TestData):
+    def test_decode_missing_and_multi_values(self):
+        query_compiler = self.ed_flights()[
+            ["Carrier", "FlightDelayMin", "timestamp"]
+        ]._query_compiler
+
+        hits = [
+            {"_id": "0", "_source": {"Carrier": "A", "FlightDelayMin": 10}},
+            {"_id": "1", "_source": {"Carrier": ["B", "C"]}},
+            {"_id": "2", "_source": {"timestamp": "2018-01-01T10:33:28"}},
+        ]
+        df = query_compiler._es_results_to_pandas(hits)
+
+        assert list(df.columns) == ["Carrier", "FlightDelayMin", "timestamp"]
+        assert list(df.index) == ["0", "1", "2"]
+        assert df["Carrier"].tolist()[:2] == ["A", ["B", "C"]]
+        assert np.isnan(df["Carrier"].iloc[2])
+        assert df["FlightDelayMin"].iloc[0] == 10
+        assert np.isnan(df["FlightDelayMin"].iloc[1])
+        assert df["timestamp"].iloc[2] == pd.Timestamp("2018-01-01T10:33:28")
+        assert pd.isna(df["timestamp"].iloc[0])
+
+    def test_decoder_reused_across_pages(self):
+        query_compiler = self.ed_flights()[["Carrier", "dayOfWeek"]]._query_compiler
+        decoder = query_compiler._hit_decoder()
+
+        page1 = [{"_id": "0", "_source": {"Carrier": "A", "dayOfWeek": 1}}]
+        page2 = [{"_id": "1", "_source": {"Carrier": "B"}}]
+
+        df1 = query_compiler._es_results_to_pandas(page1, decoder=decoder)
+        df2 = query_compiler._es_results_to_pandas(page2, decoder=decoder)
+
+        assert list(df1.columns) == list(df2.columns) == ["Carrier", "dayOfWeek"]
+        assert df1["dayOfWeek"].iloc[0] == 1
+        assert np.isnan(df2["dayOfWeek"].iloc[0])
+
+    def test_decode_doc_values(self):
+        query_compiler = self.ed_flights()[
+            ["AvgTicketPrice", "Carrier", "timestamp"]
+        ]._query_compiler
+        doc_value_fields = query_compiler._mappings.doc_value_field_names()
+
+        # float fields are read from _source as their doc values lose precision
+        assert doc_value_fields == ["Carrier", "timestamp"]
+
+        hits = [
+            {
+                "_id": "0",
+                "_source": {"AvgTicketPrice": 841.26},
+                "fields": {"Carrier": ["A"], "timestamp": ["2018-01-01T10:33:28"]},
+            },
+            {"_id": "1", "_source": {}, "fields": {"Carrier": ["B", "C"]}},
+        ]
+        df = query_compiler._es_results_to_pandas(
+            hits, decoder=query_compiler._hit_decoder(doc_value_fields)
+        )
+
+        assert list(df.columns) == ["AvgTicketPrice", "Carrier", "timestamp"]
+        assert df["AvgTicketPrice"].iloc[0] == 841.26
+        assert df["Carrier"].tolist() == ["A", ["B", "C"]]
+        assert df["timestamp"].iloc[0] == pd.Timestamp("2018-01-01T10:33:28")
+        assert pd.isna(df["timestamp"].iloc[1])
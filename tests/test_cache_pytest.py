@@ -0,0 +1,116 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+# File called _pytest for PyCharm compatability
+
+import unittest.mock as mock
+
+import pytest
+
+import eland as ed
+from eland.cache import cached_request
+
+
+@pytest.fixture(autouse=True)
+def result_cache():
+    ed.cache.enable()
+    yield
+    ed.cache.disable()
+
+
+def search_client():
+    client = mock.Mock(spec=["search", "msearch"])
+    client.search.side_effect = lambda **kwargs: {"hits": {"total": {"value": 1}}}
+    client.msearch.side_effect = lambda **kwargs: {
+        "responses": [{"status": 200}, {"status": 500, "error": {}}]
+    }
+    return client
+
+
+def test_cache_hit():
+    client = search_client()
+
+    response = cached_request(client, "search", index="flights", size=0)
+    assert cached_request(client, "search", size=0, index="flights") is response
+    assert client.search.call_count == 1
+
+    cached_request(client, "search", index="flights", size=1)
+    cached_request(search_client(), "search", index="flights", size=0)
+    assert client.search.call_count == 2
+
+
+def test_cache_disabled():
+    client = search_client()
+    ed.cache.disable()
+
+    cached_request(client, "search", index="flights")
+    cached_request(client, "search", index="flights")
+    assert client.search.call_count == 2
+
+
+def test_cache_ttl():
+    client = search_client()
+    ed.cache.enable(ttl=10)
+
+    with mock.patch("eland.cache.time.monotonic", return_value=100.0):
+        cached_request(client, "search", index="flights")
+    with mock.patch("eland.cache.time.monotonic", return_value=109.0):
+        cached_request(client, "search", index="flights")
+    assert client.search.call_count == 1
+    with mock.patch("eland.cache.time.monotonic", return_value=110.0):
+        cached_request(client, "search", index="flights")
+    assert client.search.call_count == 2
+
+
+def test_cache_evicts_least_recently_used():
+    client = search_client()
+    # Room for two of the responses
+    ed.cache.enable(max_bytes=80)
+
+    cached_request(client, "search", index="a")
+    cached_request(client, "search", index="b")
+    cached_request(client, "search", index="a")
+    cached_request(client, "search", index="c")
+    assert client.search.call_count == 3
+
+    cached_request(client, "search", index="a")
+    assert client.search.call_count == 3
+    cached_request(client, "search", index="b")
+    assert client.search.call_count == 4
+
+
+def test_cache_clear():
+    client = search_client()
+
+    cached_request(client, "search", index="flights")
+    ed.cache.clear()
+    cached_request(client, "search", index="flights")
+    assert client.search.call_count == 2
+
+
+def test_cache_skips_failed_multi_search():
+    client = search_client()
+
+    cached_request(client, "msearch", searches=[])
+    cached_request(client, "msearch", searches=[])
+    assert client.msearch.call_count == 2
+
+
+@pytest.mark.parametrize(["ttl", "max_bytes"], [(0, 1024), (60, 0)])
+def test_cache_invalid(ttl, max_bytes):
+    with pytest.raises(ValueError):
+        ed.cache.enable(ttl=ttl, max_bytes=max_bytes)
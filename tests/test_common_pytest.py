@@ -18,10 +18,17 @@
 import unittest.mock as mock
 import warnings
 
+import numpy as np
+import pandas as pd
 import pytest
 
 import eland
-from eland.common import es_version
+from eland.common import (
+    elasticsearch_date_to_pandas_date,
+    elasticsearch_dates_to_pandas_dates,
+    ensure_es_client,
+    es_version,
+)
 
 
 @pytest.mark.parametrize(
@@ -38,3 +45,67 @@ def test_major_version_mismatch(version_number, version_tuple):
         f"Eland major version ({eland.__version__}) doesn't match the major version of the Elasticsearch server ({version_number}) "
         "which can lead to compatibility issues. Your Eland major version should be the same as your cluster major version."
     )
+
+
+@pytest.mark.parametrize(
+    ["values", "date_format"],
+    [
+        (["2018-01-01T00:00:00", np.nan, "2018-01-01T18:27:00"], None),
+        (
+            ["2018-01-01T00:00:00", "2018-01-01T18:27:00"],
+            "strict_date_hour_minute_second",
+        ),
+        ([1514764800000, np.nan], "epoch_millis"),
+        ([1514764800, 1514831220], "epoch_second"),
+        ([1514764800000, "2018-01-01T18:27:00"], None),
+        (["2018-01-01T00:00:00Z", "2018-01-01T03:00:00+02:00", np.nan], None),
+        (
+            ["2018-01-01T00:00:00.000Z", "2018-01-01T03:00:00.000+02:00"],
+            "strict_date_optional_time",
+        ),
+    ],
+)
+def test_elasticsearch_dates_to_pandas_dates(values, date_format):
+    expected = [
+        elasticsearch_date_to_pandas_date(value, date_format)
+        if value == value
+        else pd.NaT
+        for value in values
+    ]
+    dates = list(elasticsearch_dates_to_pandas_dates(values, date_format))
+    assert dates == expected
+    # Equal instants aren't enough, the types and time zones must match too
+    assert [(type(date), str(getattr(date, "tzinfo", None))) for date in dates] == [
+        (type(date), str(getattr(date, "tzinfo", None))) for date in expected
+    ]
+
+
+def test_elasticsearch_dates_to_pandas_dates_warns_once():
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        elasticsearch_dates_to_pandas_dates(
+            ["2018-01-01T00:00:00", "2018-01-02T00:00:00"], "custom||format"
+        )
+    assert len(w) == 1
+
+
+def test_ensure_es_client_reuses_clients():
+    client = ensure_es_client("http://localhost:9200")
+
+    assert ensure_es_client(client) is client
+    assert ensure_es_client(["http://localhost:9200"]) is client
+    assert ensure_es_client(("http://localhost:9200",)) is client
+    assert ensure_es_client("http://localhost:9201") is not client
+
+
+def test_ensure_es_client_throughput_profile():
+    client = ensure_es_client("http://localhost:9200", profile="throughput")
+
+    assert client is not ensure_es_client("http://localhost:9200")
+    assert client is ensure_es_client("http://localhost:9200", profile="throughput")
+    node_config = client.transport.node_pool.all()[0].config
+    assert node_config.http_compress
+    assert node_config.connections_per_node == 32
+
+    with pytest.raises(ValueError):
+        ensure_es_client("http://localhost:9200", profile="fastest")